@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Scaling benchmark for the OR-Tools model build and result extraction.
+
+Builds CapacityPlannerModel on synthetic portfolios of growing size and
+times model construction and solution extraction. With the per-project and
+per-(person, role) task indexes both should grow roughly linearly with the
+number of task variables, so the time per task should stay flat.
+
+Usage: python benchmark_ortools_model.py [--sizes 50 100 200 300] [--people-ratio 0.5]
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import time
+from datetime import date
+
+from ortools.sat.python import cp_model
+
+from capacity_tracker.engine import _build_month_sequence
+from capacity_tracker.io_utils import parse_config
+from capacity_tracker.models import Person, Project
+from capacity_tracker.solver_ortools import CapacityPlannerModel, _build_resource_timeline, _extract_solution
+
+ROLES = ("BA", "Planner", "Dev")
+SKILLS = ("billing", "data", "front-end", "back-end", "security", "mobile")
+CONFIG = {
+    "planning_start": "2025-01-01",
+    "planning_end": "2026-12-31",
+    "ktlo_pct_by_role": {"BA": 0.1, "Planner": 0.1, "Dev": 0.2},
+}
+
+
+def synthetic_portfolio(project_count, person_count, seed=0):
+    rng = random.Random(seed)
+    projects = [
+        Project(
+            id=f"P{idx:04d}",
+            name=f"Project {idx}",
+            effort_ba_pm=round(rng.uniform(0.5, 4.0), 1),
+            effort_planner_pm=round(rng.uniform(0.5, 3.0), 1),
+            effort_dev_pm=round(rng.uniform(1.0, 8.0), 1),
+            parent_summary=f"Stream {idx % 8}",
+            priority=str(rng.randint(1, 20)),
+            input_row=idx + 1,
+            required_skillsets={"Dev": (rng.choice(SKILLS),)} if rng.random() < 0.5 else {},
+        )
+        for idx in range(project_count)
+    ]
+    people = [
+        Person(
+            name=f"Person {idx:04d}",
+            roles=(ROLES[idx % len(ROLES)],),
+            active=True,
+            start_date=date(2025, 1 + rng.randint(0, 5), 1) if rng.random() < 0.2 else None,
+            end_date=None,
+            skillsets=tuple(rng.sample(SKILLS, 2)),
+            preferred_parent_summaries=(),
+            notes="",
+        )
+        for idx in range(person_count)
+    ]
+    return projects, people
+
+
+def first_solution(model):
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = 60
+    solver.parameters.num_workers = 1
+    solver.parameters.stop_after_first_solution = True
+    status = solver.Solve(model.model)
+    return solver if status in (cp_model.OPTIMAL, cp_model.FEASIBLE) else None
+
+
+def run_size(project_count, person_count, config, month_starts):
+    projects, people = synthetic_portfolio(project_count, person_count)
+
+    start = time.perf_counter()
+    strict = CapacityPlannerModel(projects, people, config, month_starts)
+    strict.build_strict_model()
+    strict_build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    relaxed = CapacityPlannerModel(projects, people, config, month_starts)
+    relaxed.build_relaxed_model()
+    relaxed_build = time.perf_counter() - start
+
+    solver = first_solution(relaxed)
+    extract = None
+    if solver is not None:
+        start = time.perf_counter()
+        _extract_solution(solver, relaxed, projects, people, month_starts)
+        _build_resource_timeline(solver, relaxed, people, month_starts)
+        extract = time.perf_counter() - start
+    return len(relaxed.task_vars), strict_build, relaxed_build, extract
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 200, 300], help="Project counts")
+    parser.add_argument("--people-ratio", type=float, default=0.5, help="People per project (default: 0.5)")
+    args = parser.parse_args()
+
+    config = parse_config(dict(CONFIG))
+    month_starts = _build_month_sequence(config)
+
+    print("=== OR-Tools Model Scaling ===")
+    print(f"{'projects':>8} {'people':>6} {'tasks':>7} {'strict build':>13} {'relaxed build':>14} "
+          f"{'extraction':>11} {'us/task (build, extract)':>26}")
+    for project_count in args.sizes:
+        person_count = max(len(ROLES), int(project_count * args.people_ratio))
+        # CP-SAT validation messages are not part of the measurement.
+        with contextlib.redirect_stdout(io.StringIO()):
+            tasks, strict_build, relaxed_build, extract = run_size(
+                project_count, person_count, config, month_starts
+            )
+        extract_label = f"{extract:10.3f}s" if extract is not None else "  no sol."
+        per_task = f"{relaxed_build / tasks * 1e6:.1f}"
+        if extract is not None:
+            per_task += f", {extract / tasks * 1e6:.1f}"
+        print(f"{project_count:>8} {person_count:>6} {tasks:>7} {strict_build:>12.3f}s {relaxed_build:>13.3f}s "
+              f"{extract_label} {per_task:>26}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Startup-time benchmark for the capacity planner CLI.
+
+Runs ``python -X importtime`` on the CLI imports and on a full dry run,
+reports total and heaviest import times, and checks that pandas and dateutil
+stay off the CLI path.
+
+Usage: python benchmark_startup.py [portfolio_dir] [--runs N]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+HEAVY_MODULES = ("pandas", "dateutil", "ortools", "pyarrow")
+REPO_ROOT = Path(__file__).resolve().parent
+
+
+def parse_importtime(stderr):
+    """(module, self_us, cumulative_us) for each line of ``-X importtime`` output."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        # One space follows the separator; nested imports add two more per level.
+        entries.append((name.rstrip()[1:], int(self_us), int(cumulative_us)))
+    return entries
+
+
+def run_importtime(args):
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        cwd=REPO_ROOT,
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        print(result.stdout)
+        print(result.stderr[-2000:])
+        raise SystemExit(f"command failed: {' '.join(args)}")
+    return elapsed, parse_importtime(result.stderr)
+
+
+def report_imports(label, entries):
+    # Top-level imports are not indented, so their cumulative times add up to the total.
+    total_us = sum(cumulative for name, _, cumulative in entries if not name.startswith(" "))
+    print(f"Total import time ({label}): {total_us / 1000:.1f} ms")
+    print("Heaviest top-level imports:")
+    top_level = [entry for entry in entries if not entry[0].startswith(" ")]
+    for name, _, cumulative in sorted(top_level, key=lambda entry: entry[2], reverse=True)[:8]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name.strip()}")
+    loaded = {name.strip().split(".")[0] for name, _, _ in entries}
+    for module in HEAVY_MODULES:
+        mark = "⚠ imported" if module in loaded else "✓ not imported"
+        print(f"  {mark}: {module}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "portfolio",
+        nargs="?",
+        default=str(REPO_ROOT / "portfolios" / "sample"),
+        help="Portfolio directory for the end-to-end dry run (default: portfolios/sample)",
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Dry runs to time (default: 5)")
+    args = parser.parse_args()
+
+    print("=== Python Environment ===")
+    print(f"Python version: {sys.version}")
+    print()
+
+    print("=== CLI Imports (-X importtime) ===")
+    _, entries = run_importtime(["-c", "import capacity_tracker.main"])
+    report_imports("import capacity_tracker.main", entries)
+
+    print("=== End-to-End Dry Run ===")
+    command = ["-m", "capacity_tracker.main", "--project-dir", args.portfolio, "--dry-run"]
+    _, entries = run_importtime(command)
+    report_imports("dry run", entries)
+    timings = [run_importtime(command)[0] for _ in range(max(1, args.runs))]
+    print(f"Wall time over {len(timings)} run(s): "
+          f"median {statistics.median(timings) * 1000:.0f} ms, "
+          f"min {min(timings) * 1000:.0f} ms, max {max(timings) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
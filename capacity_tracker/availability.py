@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import math
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, Sequence
+
+from .models import Person
+
+WEEKS_PER_MONTH = 4.33  # Average weeks per month
+
+
+def _first_of_month(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _first_week_of_month(month_idx: int, weeks_per_month: float) -> int:
+    """Smallest week index whose ``int(week / weeks_per_month)`` reaches ``month_idx``."""
+    week = max(0, math.ceil(month_idx * weeks_per_month) - 1)
+    while int(week / weeks_per_month) < month_idx:
+        week += 1
+    return week
+
+
+@dataclass(frozen=True)
+class PersonAvailability:
+    """Half-open month and week index ranges a person can work within the horizon.
+
+    Availability is a single window (start to end date), so two ranges
+    describe it exactly whatever the horizon length; the masks set bit ``i``
+    for each available month or week.
+    """
+
+    first_month: int
+    end_month: int
+    first_week: int
+    end_week: int
+
+    def month_indices(self) -> range:
+        return range(self.first_month, self.end_month)
+
+    def week_indices(self) -> range:
+        return range(self.first_week, self.end_week)
+
+    def in_month(self, month_idx: int) -> bool:
+        return self.first_month <= month_idx < self.end_month
+
+    def in_week(self, week_idx: int) -> bool:
+        return self.first_week <= week_idx < self.end_week
+
+    @property
+    def month_mask(self) -> int:
+        return (1 << self.end_month) - (1 << self.first_month) if self.end_month > self.first_month else 0
+
+    @property
+    def week_mask(self) -> int:
+        return (1 << self.end_week) - (1 << self.first_week) if self.end_week > self.first_week else 0
+
+
+def person_availability(
+    person: Person,
+    month_starts: Sequence[date],
+    week_horizon: int = 0,
+    weeks_per_month: float = WEEKS_PER_MONTH,
+) -> PersonAvailability:
+    """Months from the one holding ``start_date`` through the one holding ``end_date``.
+
+    Week ``w`` of ``week_horizon`` falls in month ``int(w / weeks_per_month)``.
+    """
+    first_month = bisect_left(month_starts, _first_of_month(person.start_date)) if person.start_date else 0
+    end_month = (
+        bisect_right(month_starts, _first_of_month(person.end_date)) if person.end_date else len(month_starts)
+    )
+    if end_month <= first_month:
+        return PersonAvailability(0, 0, 0, 0)
+    first_week = min(_first_week_of_month(first_month, weeks_per_month), week_horizon)
+    end_week = min(_first_week_of_month(end_month, weeks_per_month), week_horizon)
+    return PersonAvailability(first_month, end_month, first_week, end_week)
+
+
+def build_availability(
+    people: Iterable[Person],
+    month_starts: Sequence[date],
+    week_horizon: int = 0,
+    weeks_per_month: float = WEEKS_PER_MONTH,
+) -> Dict[str, PersonAvailability]:
+    """Availability of every person, computed once per run and shared by both solvers."""
+    return {
+        person.name: person_availability(person, month_starts, week_horizon, weeks_per_month)
+        for person in people
+    }
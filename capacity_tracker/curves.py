@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 import math
-from typing import Iterable, List, Sequence
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 def normalize_curve(seq: Iterable[float]) -> List[float]:
@@ -73,3 +77,130 @@ def resolve_curve(spec: object, buckets: int) -> List[float]:
     if isinstance(spec, Sequence):
         return _resample_curve(list(spec), buckets)
     raise TypeError("curve spec must be a sequence of floats or 'uniform'")
+
+
+def _resample_rows(bases: Sequence[Sequence[float]], bucket_counts: Sequence[int]) -> "np.ndarray":
+    """Resample ``bases[i]`` to ``bucket_counts[i]`` buckets for every row at once.
+
+    Mirrors ``_resample_curve`` step for step (same CDF interpolation and
+    renormalisation) on zero-padded arrays; rows are padded with zeros to the
+    largest bucket count.
+    """
+    import numpy as np
+
+    if len(bases) != len(bucket_counts):
+        raise ValueError("expected one bucket count per curve")
+    counts = np.asarray(bucket_counts, dtype=np.int64)
+    if counts.size == 0:
+        return np.zeros((0, 0))
+    if (counts <= 0).any():
+        raise ValueError("requested bucket count must be positive")
+    normalized = [normalize_curve(base) for base in bases]
+    lengths = np.array([len(base) for base in normalized], dtype=np.int64)
+    rows, width = len(normalized), int(counts.max())
+    weights = np.zeros((rows, int(lengths.max()) + 1))
+    for row, base in enumerate(normalized):
+        weights[row, : len(base)] = base
+    prefix = np.zeros_like(weights)
+    np.cumsum(weights[:, :-1], axis=1, out=prefix[:, 1:])
+
+    edges = np.arange(width + 1) / counts[:, None]
+    scaled = edges * lengths[:, None]
+    idx = np.minimum(np.floor(scaled).astype(np.int64), lengths[:, None])
+    frac = scaled - idx
+    cdf = np.take_along_axis(prefix, idx, axis=1) + np.take_along_axis(weights, idx, axis=1) * frac
+    cdf = np.where(edges >= 1, 1.0, np.where(edges <= 0, 0.0, cdf))
+    inside = np.arange(width)[None, :] < counts[:, None]
+    shares = np.where(inside, np.diff(cdf, axis=1), 0.0)
+    resampled = (counts != lengths) & (counts != 1)
+    if (shares[resampled] < 0).any():
+        raise ValueError("curve values must be non-negative")
+    if (shares[resampled].sum(axis=1) <= 0).any():
+        raise ValueError("curve values must sum to a positive number")
+    for _ in range(2):
+        shares /= shares.sum(axis=1, keepdims=True)
+    # Match the scalar shortcuts: an unchanged length keeps the normalised base.
+    for row in np.flatnonzero(counts == lengths):
+        shares[row, : lengths[row]] = normalized[row]
+    shares[counts == 1, 0] = 1.0
+    return shares
+
+
+def resample_curve_batch(base: Sequence[float], bucket_counts: Sequence[int]) -> "np.ndarray":
+    """One curve resampled to each of ``bucket_counts``.
+
+    Returns a ``len(bucket_counts) × max(bucket_counts)`` array whose row ``i``
+    holds ``resolve_curve(base, bucket_counts[i])`` followed by zero padding.
+    """
+    if len(base) == 0:
+        raise ValueError("base curve cannot be empty")
+    return _resample_rows([base] * len(bucket_counts), bucket_counts)
+
+
+def resample_curves(specs: Sequence[object], buckets: int) -> "np.ndarray":
+    """Many curve specs (sequences or ``"uniform"``) resampled to ``buckets``; one row each."""
+    bases: List[Sequence[float]] = []
+    for spec in specs:
+        if isinstance(spec, str):
+            if spec.lower() != "uniform":
+                raise ValueError(f"unsupported curve keyword '{spec}'")
+            bases.append([1.0])
+        elif isinstance(spec, Sequence):
+            if len(spec) == 0:
+                raise ValueError("base curve cannot be empty")
+            bases.append(list(spec))
+        else:
+            raise TypeError("curve spec must be a sequence of floats or 'uniform'")
+    return _resample_rows(bases, [buckets] * len(bases))
+
+
+UNIFORM_CURVE_KEY = "uniform"
+# Config curve keys tried in order for each role; roles without one use a uniform curve.
+ROLE_CURVE_KEYS: Dict[str, Tuple[str, ...]] = {
+    "Planner": ("planner_curve",),
+    "BA": ("ba_curve", "dev_curve"),
+    "Dev": ("dev_curve", "ba_curve"),
+}
+DEFAULT_CURVE_TABLE_SIZE = 1024
+
+
+class CurveTable:
+    """Resampled curves from one configuration, keyed by ``(curve key, buckets)``.
+
+    Weights are computed on first use and returned as shared tuples. The table
+    keeps at most ``maxsize`` entries, evicting the least recently used, so
+    long open-ended horizons do not grow it without bound.
+    """
+
+    def __init__(self, curves: Mapping[str, object], maxsize: int = DEFAULT_CURVE_TABLE_SIZE) -> None:
+        if maxsize <= 0:
+            raise ValueError("curve table size must be positive")
+        self._curves = dict(curves)
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[float, ...]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key_for_role(self, role: str) -> str:
+        """First configured curve key for ``role``, or ``"uniform"``."""
+        for key in ROLE_CURVE_KEYS.get(role, ()):
+            if key in self._curves:
+                return key
+        return UNIFORM_CURVE_KEY
+
+    def curve(self, key: str, buckets: int) -> Tuple[float, ...]:
+        entry = (key, buckets)
+        weights = self._entries.get(entry)
+        if weights is not None:
+            self._entries.move_to_end(entry)
+            return weights
+        spec = UNIFORM_CURVE_KEY if key == UNIFORM_CURVE_KEY else self._curves[key]
+        weights = tuple(resolve_curve(spec, buckets))
+        self._entries[entry] = weights
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+        return weights
+
+    def for_role(self, role: str, buckets: int) -> Tuple[float, ...]:
+        return self.curve(self.key_for_role(role), buckets)
@@ -2,24 +2,32 @@ from __future__ import annotations
 
 import math
 import random
+from bisect import bisect_right
 from collections import defaultdict
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from datetime import date
-from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from operator import itemgetter
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
-import pandas as pd
-from dateutil.relativedelta import relativedelta
-
-from .curves import resolve_curve
-from .io_utils import MONTH_FMT
+from .availability import PersonAvailability, _first_of_month, build_availability
+from .curves import UNIFORM_CURVE_KEY
+from .io_utils import MONTH_FMT, people_from_rows, projects_from_rows
+from .ledger import EPSILON, CapacityLedger, MonthlyState, create_ledger
 from .models import (
     PlanningConfig,
     Project,
     Person,
 )
+from .replan import ReplanCheckpoints, fingerprint
+from .skills import SkillRegistry, iter_bits
+
+if TYPE_CHECKING:
+    import pandas as pd
 
-EPSILON = 1e-6
 SMALL_PROJECT_EFFORT_THRESHOLD = 2.0
+# Role order of Project.role_efforts and of PortfolioDemand's role axis.
+EFFORT_ROLES: Tuple[str, ...] = ("BA", "Planner", "Dev")
+BACKJUMP_REASONS = frozenset({"no_available_people", "skillset_unavailable", "concurrency_limit_zero"})
 
 
 class UnschedulableProjectError(RuntimeError):
@@ -30,46 +38,23 @@ class UnschedulableProjectError(RuntimeError):
 
 
 @dataclass
-class MonthlyState:
-    ktlo_pct: float
-    capacity_limit: float
-    project_alloc_pct: float = 0.0
-    allocations: Dict[str, Dict[str, float]] = field(default_factory=dict)
-
-    def remaining_capacity(self) -> float:
-        return self.capacity_limit - self.project_alloc_pct
-
-    def assign(self, project_id: str, role: str, share: float, *, allow_overallocation: bool = False) -> None:
-        if share <= 0:
-            return
-        remaining = self.remaining_capacity()
-        if share > remaining + EPSILON and not allow_overallocation:
-            raise ValueError("allocation exceeds remaining capacity")
-        role_allocations = self.allocations.setdefault(project_id, {})
-        role_allocations[role] = role_allocations.get(role, 0.0) + share
-        self.project_alloc_pct += share
-
-    def remove(self, project_id: str, role: str, share: float) -> None:
-        if share <= 0:
-            return
-        role_allocations = self.allocations.get(project_id, {})
-        current = role_allocations.get(role, 0.0)
-        new_value = current - share
-        if new_value <= EPSILON:
-            role_allocations.pop(role, None)
-            if not role_allocations:
-                self.allocations.pop(project_id, None)
-        else:
-            role_allocations[role] = new_value
-        self.project_alloc_pct = max(0.0, self.project_alloc_pct - share)
+class RunStats:
+    """Search counters for one greedy planning run."""
 
-    @property
-    def total_pct(self) -> float:
-        return self.ktlo_pct + self.project_alloc_pct
+    start_indices_attempted: int = 0
+    start_indices_pruned: int = 0
+    start_indices_backjumped: int = 0
+    start_indices_replayed: int = 0
+    projects_reused: int = 0
 
+    def to_dict(self) -> Dict[str, int]:
+        return asdict(self)
 
-def _first_of_month(value: date) -> date:
-    return date(value.year, value.month, 1)
+
+def _add_months(value: date, months: int) -> date:
+    """First-of-month ``value`` moved by ``months`` calendar months."""
+    year, month = divmod(value.year * 12 + value.month - 1 + months, 12)
+    return date(year, month + 1, 1)
 
 
 def _build_month_sequence(config: PlanningConfig) -> List[date]:
@@ -80,117 +65,65 @@ def _build_month_sequence(config: PlanningConfig) -> List[date]:
         current = start
         while current <= end_month:
             months.append(current)
-            current += relativedelta(months=1)
+            current = _add_months(current, 1)
     else:
         for offset in range(config.max_months_if_open_ended):
-            months.append(start + relativedelta(months=offset))
+            months.append(_add_months(start, offset))
     return months
 
 
 def _projects_from_df(df: pd.DataFrame) -> List[Project]:
-    projects: List[Project] = []
-    for row in df.itertuples(index=False):
-        priority_value = getattr(row, "priority", None)
-        if isinstance(priority_value, float) and math.isnan(priority_value):
-            priority_value = None
-        required_skillsets = {
-            "BA": tuple(getattr(row, "required_skillsets_ba", ()) or ()),
-            "Planner": tuple(getattr(row, "required_skillsets_planner", ()) or ()),
-            "Dev": tuple(getattr(row, "required_skillsets_dev", ()) or ()),
-        }
-        project = Project(
-            id=str(row.id),
-            name=str(row.name),
-            effort_ba_pm=float(row.effort_ba_pm),
-            effort_planner_pm=float(row.effort_planner_pm),
-            effort_dev_pm=float(row.effort_dev_pm),
-            parent_summary="" if pd.isna(row.parent_summary) else str(row.parent_summary),
-            priority=str(priority_value) if priority_value is not None else None,
-            input_row=int(row.input_row),
-            required_skillsets=required_skillsets,
-        )
-        projects.append(project)
-    projects.sort(key=lambda p: p.input_row)
-    return projects
+    return projects_from_rows(df.to_dict("records"))
 
 
 def _people_from_df(df: pd.DataFrame) -> List[Person]:
-    people: List[Person] = []
-    for row in df.itertuples(index=False):
-        start_date = row.start_date if isinstance(row.start_date, date) else None
-        end_date = row.end_date if isinstance(row.end_date, date) else None
-        if not row.active:
-            continue
-        roles = tuple(row.roles) if isinstance(row.roles, (list, tuple)) else (str(row.roles),)
-        skillsets = tuple(row.skillsets) if isinstance(row.skillsets, (list, tuple)) else ()
-        preferred = (
-            tuple(row.preferred_parent_summaries)
-            if isinstance(row.preferred_parent_summaries, (list, tuple))
-            else ()
-        )
-        person = Person(
-            name=str(row.person),
-            roles=tuple(str(role) for role in roles),
-            active=bool(row.active),
-            start_date=start_date,
-            end_date=end_date,
-            skillsets=tuple(str(skill) for skill in skillsets),
-            preferred_parent_summaries=tuple(str(pref) for pref in preferred),
-            notes="" if pd.isna(row.notes) else str(row.notes),
-        )
-        people.append(person)
-    return people
-
-
-def _is_person_available(person: Person, month_start: date) -> bool:
-    if person.start_date and month_start < _first_of_month(person.start_date):
-        return False
-    if person.end_date and month_start > _first_of_month(person.end_date):
-        return False
-    return True
+    return people_from_rows(df.to_dict("records"))
 
 
 def _build_person_states(
     people: Sequence[Person],
     month_starts: Sequence[date],
     config: PlanningConfig,
+    skills: SkillRegistry,
+    availability: Dict[str, PersonAvailability],
 ) -> Tuple[
-    Dict[str, Dict[int, MonthlyState]],
+    CapacityLedger,
     Dict[str, Dict[int, List[str]]],
     Dict[str, List[float]],
-    Dict[str, Set[str]],
+    Dict[str, int],
     Dict[str, Set[str]],
     Dict[str, Set[str]],
     Dict[str, List[float]],
 ]:
-    person_states: Dict[str, Dict[int, MonthlyState]] = {}
+    person_states = create_ledger(
+        config.ledger_backend, [person.name for person in people], len(month_starts)
+    )
     available_by_role_month: Dict[str, Dict[int, List[str]]] = defaultdict(dict)
     role_month_capacity: Dict[str, List[float]] = {}
-    person_skillsets: Dict[str, Set[str]] = {}
+    person_skillsets: Dict[str, int] = {}
     person_preferences: Dict[str, Set[str]] = {}
     person_roles_map: Dict[str, Set[str]] = {}
     role_capacity_samples: Dict[str, List[float]] = defaultdict(list)
     for person in people:
-        states: Dict[int, MonthlyState] = {}
+        available_months: List[int] = []
         ktlo_pct = max(config.ktlo_for_role(role) for role in person.roles)
         base_capacity = max(0.0, 1.0 - ktlo_pct)
         per_role_capacity = base_capacity
-        for idx, month_start in enumerate(month_starts):
-            if not _is_person_available(person, month_start):
-                continue
+        for idx in availability[person.name].month_indices():
             project_capacity = per_role_capacity
             if project_capacity <= EPSILON:
                 continue
-            state = MonthlyState(ktlo_pct=ktlo_pct, capacity_limit=project_capacity)
-            states[idx] = state
+            available_months.append(idx)
             for role in person.roles:
                 available_by_role_month.setdefault(role, {}).setdefault(idx, []).append(person.name)
                 if role not in role_month_capacity:
                     role_month_capacity[role] = [0.0] * len(month_starts)
                 role_month_capacity[role][idx] += project_capacity
-        if states:
-            person_states[person.name] = states
-            person_skillsets[person.name] = set(person.skillsets)
+        if available_months:
+            person_states.add_person(
+                person.name, available_months, ktlo_pct, per_role_capacity, person.roles
+            )
+            person_skillsets[person.name] = skills.mask(person.skillsets)
             person_preferences[person.name] = set(person.preferred_parent_summaries)
             person_roles_map[person.name] = set(person.roles)
             for role in person.roles:
@@ -206,6 +139,60 @@ def _build_person_states(
     )
 
 
+class CandidateIndex:
+    """Inverted lookups from (role, month, skill) and parent stream to people.
+
+    Built once per run so each allocation starts from the people who can take
+    the work instead of rescanning every person available for the role.
+    """
+
+    def __init__(
+        self,
+        available_by_role_month: Dict[str, Dict[int, List[str]]],
+        person_skillsets: Dict[str, int],
+        person_preferences: Dict[str, Set[str]],
+    ) -> None:
+        self.by_role_month_skill: Dict[Tuple[str, int, int], List[str]] = defaultdict(list)
+        self._available_sets: Dict[Tuple[str, int], Set[str]] = {}
+        for role, months in available_by_role_month.items():
+            for month_idx, names in months.items():
+                self._available_sets[(role, month_idx)] = set(names)
+                for name in names:
+                    for skill_id in iter_bits(person_skillsets.get(name, 0)):
+                        self.by_role_month_skill[(role, month_idx, skill_id)].append(name)
+        self.preferred_by_parent: Dict[str, Set[str]] = defaultdict(set)
+        for name, parents in person_preferences.items():
+            for parent in parents:
+                self.preferred_by_parent[parent].add(name)
+        self._available_by_role_month = available_by_role_month
+
+    def is_available(self, name: str, role: str, month_idx: int) -> bool:
+        """Whether ``name`` can work as ``role`` in ``month_idx``."""
+        return name in self._available_sets.get((role, month_idx), ())
+
+    def skilled(self, role: str, month_idx: int, skillsets: int) -> Set[str]:
+        """People available for ``role`` in ``month_idx`` holding any skill in the ``skillsets`` mask."""
+        names: Set[str] = set()
+        for skill_id in iter_bits(skillsets):
+            names.update(self.by_role_month_skill.get((role, month_idx, skill_id), ()))
+        return names
+
+    def eligible(self, role: str, month_idx: int, required_skillsets: int) -> Sequence[str]:
+        """People available for ``role`` in ``month_idx`` who satisfy the ``required_skillsets`` mask."""
+        if not required_skillsets:
+            return self._available_by_role_month.get(role, {}).get(month_idx, [])
+        if not required_skillsets & (required_skillsets - 1):
+            skill_id = required_skillsets.bit_length() - 1
+            return self.by_role_month_skill.get((role, month_idx, skill_id), [])
+        return sorted(self.skilled(role, month_idx, required_skillsets))
+
+    def preferred(self, parent_summary: str) -> Set[str]:
+        """People who prefer work from ``parent_summary``."""
+        if not parent_summary:
+            return set()
+        return self.preferred_by_parent.get(parent_summary, set())
+
+
 def _effective_role_limits(
     role_month_capacity: Dict[str, List[float]],
     role_capacity_samples: Dict[str, List[float]],
@@ -230,51 +217,149 @@ def _effective_role_limits(
     return limits
 
 
-def _resolve_curve_for_role(config: PlanningConfig, role: str, duration: int) -> List[float]:
+def _resolve_curve_for_role(config: PlanningConfig, role: str, duration: int) -> Sequence[float]:
     if duration <= 0:
-        return []
-    curve_keys = {
-        "Planner": ["planner_curve"],
-        "BA": ["ba_curve", "dev_curve"],
-        "Dev": ["dev_curve", "ba_curve"],
-    }
-    spec: object = "uniform"
-    for key in curve_keys.get(role, []):
-        try:
-            spec = config.get_curve_spec(key)
-            break
-        except KeyError:
-            continue
-    return resolve_curve(spec, duration)
+        return ()
+    return config.curve_table.for_role(role, duration)
 
 
-def _compute_monthly_demands(
-    project: Project,
-    duration: int,
-    config: PlanningConfig,
-    *,
-    force_uniform: bool = False,
-) -> Dict[str, List[float]]:
-    demands: Dict[str, List[float]] = {}
-    for role, effort in project.role_efforts().items():
-        if effort <= EPSILON or duration <= 0:
-            demands[role] = [0.0] * max(duration, 0)
-            continue
-        curve = resolve_curve("uniform", duration) if force_uniform else _resolve_curve_for_role(config, role, duration)
-        demands[role] = [share * effort for share in curve]
-    return demands
+class PeakShareTable:
+    """Largest normalised monthly share of each role curve, per duration.
+
+    A project fits role limits at a duration exactly when ``effort * peak`` is
+    within every limit, so the minimum duration is found by table lookups
+    instead of resampling full demand curves. Entries are filled on first use
+    and shared by every project in a run.
+    """
+
+    def __init__(self, config: PlanningConfig) -> None:
+        self._config = config
+        self._peaks: Dict[Tuple[str, bool, int], float] = {}
+
+    def peak(self, role: str, duration: int, uniform: bool = False) -> float:
+        key = (role, uniform, duration)
+        value = self._peaks.get(key)
+        if value is None:
+            curve = (
+                self._config.curve_table.curve(UNIFORM_CURVE_KEY, duration)
+                if uniform
+                else _resolve_curve_for_role(self._config, role, duration)
+            )
+            value = self._peaks[key] = max(curve)
+        return value
 
 
-def _monthly_demands_within_limits(
-    demands: Dict[str, List[float]],
+def _min_feasible_duration(
+    efforts: Dict[str, float],
+    limits: Dict[str, float],
+    peaks: PeakShareTable,
+    base_duration: int,
+    horizon: int,
+    uniform: bool,
+) -> Optional[int]:
+    """Shortest duration from ``base_duration`` whose monthly demands stay within ``limits``.
+
+    Scaling by a positive effort preserves the curve maximum under rounding, so
+    this agrees with checking every month of the demands ``PortfolioDemand`` builds.
+    """
+    active = [(role, effort) for role, effort in efforts.items() if effort > EPSILON]
+    for duration in range(base_duration, horizon + 1):
+        if all(
+            effort * peaks.peak(role, duration, uniform) <= limits.get(role, 0.0) + EPSILON
+            for role, effort in active
+        ):
+            return duration
+    return None
+
+
+def _resolve_duration(
+    efforts: Dict[str, float],
     limits: Dict[str, float],
-) -> bool:
-    for role, monthly_values in demands.items():
-        limit = limits.get(role, 0.0)
-        for value in monthly_values:
-            if value > limit + EPSILON:
-                return False
-    return True
+    peaks: PeakShareTable,
+    horizon: int,
+    uniform: bool,
+) -> Tuple[Optional[int], int, Optional[str]]:
+    """``(duration, base_duration, blocked_role)`` for one project.
+
+    Depends only on the effort and the roster-wide role limits, never on the
+    ledger, so every project's duration is known before placement starts.
+    ``blocked_role`` is the first role with demand but no capacity; ``duration``
+    is ``None`` when that happens or nothing fits within ``horizon``.
+    """
+    role_min_durations: Dict[str, int] = {}
+    for role, effort in efforts.items():
+        if effort <= EPSILON:
+            role_min_durations[role] = 0
+            continue
+        effective_limit = limits.get(role, 0.0)
+        if effective_limit <= EPSILON:
+            return None, 0, role
+        role_min_durations[role] = max(1, math.ceil(effort / max(effective_limit, EPSILON)))
+    base_duration = max(1, max(role_min_durations.values(), default=1))
+    duration = _min_feasible_duration(efforts, limits, peaks, base_duration, horizon, uniform)
+    return duration, base_duration, None
+
+
+class PortfolioDemand:
+    """Effort and monthly demand for every project in a run, as dense arrays.
+
+    ``efforts`` is a projects × roles matrix in ``EFFORT_ROLES`` order.
+    ``set_durations`` fills ``demands``, a projects × roles × month-offset
+    tensor holding each project's curve-shaped demand from its first month,
+    zero past its duration. Projects sharing a curve and a duration are
+    filled by one broadcast multiply. NumPy is imported on first use so the
+    CLI does not load it at import time.
+    """
+
+    def __init__(self, projects: Sequence[Project]) -> None:
+        import numpy as np
+
+        self._effort_rows = [
+            (project.effort_ba_pm, project.effort_planner_pm, project.effort_dev_pm) for project in projects
+        ]
+        self.efforts = np.array(self._effort_rows, dtype=float).reshape(len(projects), len(EFFORT_ROLES))
+        self.durations: List[Optional[int]] = [None] * len(projects)
+        self.demands = np.zeros((len(projects), len(EFFORT_ROLES), 0))
+
+    def role_efforts(self, position: int) -> Dict[str, float]:
+        return dict(zip(EFFORT_ROLES, self._effort_rows[position]))
+
+    def has_demand(self, position: int) -> bool:
+        return any(value > 0 for value in self._effort_rows[position])
+
+    def total_effort(self, position: int) -> float:
+        return sum(self._effort_rows[position])
+
+    def uses_uniform_curve(self, position: int) -> bool:
+        return self.total_effort(position) <= SMALL_PROJECT_EFFORT_THRESHOLD + EPSILON
+
+    def set_durations(self, durations: Sequence[Optional[int]], config: PlanningConfig) -> None:
+        """Build the demand tensor; projects with no duration keep all-zero rows."""
+        import numpy as np
+
+        self.durations = list(durations)
+        width = max((duration for duration in self.durations if duration), default=0)
+        self.demands = np.zeros((len(self.durations), len(EFFORT_ROLES), width))
+        groups: Dict[Tuple[str, int], List[Tuple[int, int]]] = defaultdict(list)
+        for position, duration in enumerate(self.durations):
+            if not duration:
+                continue
+            uniform = self.uses_uniform_curve(position)
+            for role_idx, role in enumerate(EFFORT_ROLES):
+                if self._effort_rows[position][role_idx] <= EPSILON:
+                    continue
+                key = UNIFORM_CURVE_KEY if uniform else config.curve_table.key_for_role(role)
+                groups[(key, duration)].append((position, role_idx))
+        for (key, duration), cells in groups.items():
+            curve = np.array(config.curve_table.curve(key, duration))
+            positions, role_indices = (np.array(axis) for axis in zip(*cells))
+            self.demands[positions, role_indices, :duration] = (
+                self.efforts[positions, role_indices][:, None] * curve
+            )
+
+    def monthly_demands(self, position: int) -> Dict[str, List[float]]:
+        duration = self.durations[position] or 0
+        return dict(zip(EFFORT_ROLES, self.demands[position, :, :duration].tolist()))
 
 
 def _format_available(detail_available: List[Dict[str, object]]) -> str:
@@ -293,19 +378,21 @@ def _format_available(detail_available: List[Dict[str, object]]) -> str:
     return ", ".join(formatted)
 
 
+def _failure_rank(context: Dict[str, object]) -> Tuple[float, int]:
+    """Order failure contexts so the largest, earliest shortfall is reported."""
+    return (
+        float(context.get("shortfall") or context.get("demand") or 0.0),
+        -context.get("month_idx", 0),
+    )
+
+
 def _describe_failure(
     contexts: List[Dict[str, object]],
     month_keys: Sequence[str],
 ) -> Tuple[str, Optional[Dict[str, object]]]:
     if not contexts:
         return "insufficient capacity within planning window", None
-    selected = max(
-        contexts,
-        key=lambda ctx: (
-            float(ctx.get("shortfall") or ctx.get("demand") or 0.0),
-            -ctx.get("month_idx", 0),
-        ),
-    )
+    selected = max(contexts, key=_failure_rank)
     selected = dict(selected)
     month_idx = selected.get("month_idx")
     if isinstance(month_idx, int) and 0 <= month_idx < len(month_keys):
@@ -314,12 +401,15 @@ def _describe_failure(
         month_label = selected.get("month_label", "n/a")
     role = selected.get("role", "Unknown")
     reason_code = selected.get("reason", "insufficient_capacity")
-    available = selected.get("available", [])
+    # Lean contexts (diagnostics "off") carry no candidate roster to list.
+    available = selected.get("available")
     shortfall = float(selected.get("shortfall") or selected.get("demand") or 0.0)
     if reason_code == "no_available_people":
         reason = f"{role} unavailable in {month_label} (no active resources)"
     elif reason_code == "no_capacity_remaining":
-        reason = f"{role} has no remaining capacity in {month_label}; available roster: {_format_available(available)}"
+        reason = f"{role} has no remaining capacity in {month_label}"
+        if available is not None:
+            reason += f"; available roster: {_format_available(available)}"
     elif reason_code == "skillset_unavailable":
         needed = selected.get("needed_skillsets", [])
         needed_label = ", ".join(needed) if needed else "unspecified"
@@ -336,17 +426,15 @@ def _describe_failure(
             missing_label = "unspecified"
         reason = f"{role} skillset coverage incomplete ({missing_label})"
     elif reason_code == "concurrency_limit":
-        reason = (
-            f"{role} concurrency limit reached in {month_label}; "
-            f"available roster: {_format_available(available)}"
-        )
+        reason = f"{role} concurrency limit reached in {month_label}"
+        if available is not None:
+            reason += f"; available roster: {_format_available(available)}"
     elif reason_code == "concurrency_limit_zero":
         reason = f"{role} concurrency limit is zero; adjust configuration or roster"
     else:
-        reason = (
-            f"{role} shortfall {shortfall:.2f} PM in {month_label}; "
-            f"available capacity: {_format_available(available)}"
-        )
+        reason = f"{role} shortfall {shortfall:.2f} PM in {month_label}"
+        if available is not None:
+            reason += f"; available capacity: {_format_available(available)}"
     selected["reason_code"] = reason_code
     selected["month_label"] = month_label
     selected["shortfall"] = shortfall
@@ -380,6 +468,80 @@ def _candidate_sort_key(
     )
 
 
+def _describe_candidates(
+    candidates: Sequence[str],
+    month_idx: int,
+    person_states: CapacityLedger,
+    person_skillsets: Dict[str, int],
+    required_skillsets: int,
+    skills: SkillRegistry,
+    capacity_before: Optional[Dict[str, float]] = None,
+) -> List[Dict[str, object]]:
+    """Diagnostic view of every candidate, as it stood before this month's assignments."""
+    detail_available: List[Dict[str, object]] = []
+    for name in candidates:
+        state = person_states.cell(name, month_idx)
+        if state is None:
+            continue
+        if capacity_before and name in capacity_before:
+            remaining_capacity = capacity_before[name]
+        else:
+            remaining_capacity = state.remaining_capacity()
+        held = person_skillsets.get(name, 0)
+        detail_available.append(
+            {
+                "name": name,
+                "capacity": round(remaining_capacity, 4),
+                "skills": skills.names(held),
+                "matches_required": not required_skillsets or bool(held & required_skillsets),
+            }
+        )
+    return detail_available
+
+
+def _candidates_by_load(
+    role: str,
+    month_idx: int,
+    person_states: CapacityLedger,
+    candidate_index: CandidateIndex,
+    role_people: Dict[str, set],
+    preferred: Set[str],
+    random_order: Dict[str, float],
+) -> Iterator[Tuple[str, MonthlyState]]:
+    """Yield unconstrained strict-mode candidates in ``_candidate_sort_key`` order.
+
+    People already on the project or preferring its parent stream are few and
+    sorted explicitly. Everyone else is read lazily from the ledger's
+    load-ordered roster; the walk resumes after the last key it yielded, so
+    ``assign`` moving that person further down the roster does not disturb it.
+    """
+    special_names = role_people[role] | preferred
+    special = []
+    for name in special_names:
+        if not candidate_index.is_available(name, role, month_idx):
+            continue
+        state = person_states.cell(name, month_idx)
+        if state.remaining_capacity() <= EPSILON:
+            continue
+        key = _candidate_sort_key(name, role, state, role_people, random_order, True, name in preferred)
+        special.append((key, name, state))
+    special.sort(key=itemgetter(0))
+    for _, name, state in special:
+        yield name, state
+    roster = person_states.by_load(role, month_idx)
+    seen = set(special_names)
+    idx = 0
+    while idx < len(roster):
+        entry = roster[idx]
+        name = entry[1]
+        if name not in seen:
+            seen.add(name)
+            state = person_states.cell(name, month_idx)
+            if state.remaining_capacity() > EPSILON:
+                yield name, state
+        idx = bisect_right(roster, entry)
+
+
 def _allocate_month(
     project_id: str,
     role: str,
@@ -387,11 +549,13 @@ def _allocate_month(
     demand: float,
     role_people: Dict[str, set],
     available_by_role_month: Dict[str, Dict[int, List[str]]],
-    person_states: Dict[str, Dict[int, MonthlyState]],
+    candidate_index: CandidateIndex,
+    person_states: CapacityLedger,
     random_order: Dict[str, float],
-    required_skillsets: Set[str],
-    needed_skillsets: Set[str],
-    person_skillsets: Dict[str, Set[str]],
+    required_skillsets: int,
+    needed_skillsets: int,
+    person_skillsets: Dict[str, int],
+    skills: SkillRegistry,
     person_preferences: Dict[str, Set[str]],
     parent_summary: str,
     max_assignments: int,
@@ -399,8 +563,11 @@ def _allocate_month(
     is_high_priority: bool = False,
     overbooking_tolerance: float = 0.0,
     aggressive_mode: bool = False,
+    diagnostics: str = "full",
 ) -> Tuple[bool, List[Tuple[str, int, str, float]], Optional[Dict[str, object]]]:
     assignments: List[Tuple[str, int, str, float]] = []
+    # Candidate rosters and allocation breakdowns are only built at the full level.
+    full_detail = diagnostics == "full"
     if max_assignments <= 0:
         detail = {
             "role": role,
@@ -409,7 +576,7 @@ def _allocate_month(
             "available": [],
             "allocations": [],
             "reason": "concurrency_limit_zero",
-            "needed_skillsets": sorted(needed_skillsets),
+            "needed_skillsets": skills.names(needed_skillsets),
         }
         # In aggressive mode, track the issue but don't fail
         if aggressive_mode:
@@ -425,7 +592,7 @@ def _allocate_month(
             "available": [],
             "allocations": [],
             "reason": "no_available_people",
-            "needed_skillsets": sorted(needed_skillsets),
+            "needed_skillsets": skills.names(needed_skillsets),
         }
         # In aggressive mode, track the issue but don't fail
         if aggressive_mode:
@@ -433,115 +600,116 @@ def _allocate_month(
             return True, assignments, detail
         return False, assignments, detail
     candidate_entries: List[Dict[str, object]] = []
-    detail_available: List[Dict[str, object]] = []
-    for name in candidates:
-        state = person_states.get(name, {}).get(month_idx)
-        if state is None:
-            continue
-        remaining_capacity = state.remaining_capacity()
-        skills = person_skillsets.get(name, set())
-        matches_required = not required_skillsets or bool(skills & required_skillsets)
-        covers_needed = bool(needed_skillsets and (skills & needed_skillsets))
-        pref_match = parent_summary and parent_summary in person_preferences.get(name, set())
-        detail_available.append(
-            {
-                "name": name,
-                "capacity": round(remaining_capacity, 4),
-                "skills": sorted(skills),
-                "matches_required": matches_required,
-            }
-        )
-        # In aggressive mode, include candidates even without skill match or capacity
-        if aggressive_mode:
-            if remaining_capacity > EPSILON or not matches_required:
+    ordered_candidates: Optional[Iterable[Tuple[str, MonthlyState]]] = None
+    detail_available: Optional[List[Dict[str, object]]] = None
+    if aggressive_mode:
+        if full_detail:
+            detail_available = _describe_candidates(
+                candidates, month_idx, person_states, person_skillsets, required_skillsets, skills
+            )
+        for name in candidates:
+            state = person_states.cell(name, month_idx)
+            if state is None:
+                continue
+            held = person_skillsets.get(name, 0)
+            matches_required = not required_skillsets or bool(held & required_skillsets)
+            # In aggressive mode, include candidates even without skill match or capacity
+            if state.remaining_capacity() > EPSILON or not matches_required:
                 candidate_entries.append(
                     {
                         "name": name,
                         "state": state,
-                        "covers_needed": covers_needed or not needed_skillsets,
-                        "pref_match": pref_match,
-                        "skills": skills,
+                        "covers_needed": bool(held & needed_skillsets) or not needed_skillsets,
+                        "pref_match": parent_summary and parent_summary in person_preferences.get(name, set()),
                         "skill_mismatch": not matches_required,
                     }
                 )
-        else:
-            if remaining_capacity <= EPSILON or not matches_required:
-                continue
-            candidate_entries.append(
-                {
-                    "name": name,
-                    "state": state,
-                    "covers_needed": covers_needed or not needed_skillsets,
-                    "pref_match": pref_match,
-                    "skills": skills,
-                }
-            )
-    if not candidate_entries:
-        # In aggressive mode, if we have no candidates with capacity/skills, add everyone anyway
-        if aggressive_mode and candidates:
+        # If we have no candidates with capacity/skills, add everyone anyway
+        if not candidate_entries:
             for name in candidates:
-                state = person_states.get(name, {}).get(month_idx)
+                state = person_states.cell(name, month_idx)
                 if state is None:
                     continue
-                skills = person_skillsets.get(name, set())
-                matches_required = not required_skillsets or bool(skills & required_skillsets)
-                covers_needed = bool(needed_skillsets and (skills & needed_skillsets))
-                pref_match = parent_summary and parent_summary in person_preferences.get(name, set())
+                held = person_skillsets.get(name, 0)
+                matches_required = not required_skillsets or bool(held & required_skillsets)
                 candidate_entries.append(
                     {
                         "name": name,
                         "state": state,
-                        "covers_needed": covers_needed or not needed_skillsets,
-                        "pref_match": pref_match,
-                        "skills": skills,
+                        "covers_needed": bool(held & needed_skillsets) or not needed_skillsets,
+                        "pref_match": parent_summary and parent_summary in person_preferences.get(name, set()),
                         "skill_mismatch": not matches_required,
                     }
                 )
-
-        if not candidate_entries:
-            if required_skillsets and not any(item.get("matches_required") for item in detail_available):
-                reason_code = "skillset_unavailable"
-            else:
-                reason_code = "no_capacity_remaining"
-            detail = {
-                "role": role,
-                "month_idx": month_idx,
-                "demand": demand,
-                "available": detail_available,
-                "allocations": [],
-                "reason": reason_code,
-                "needed_skillsets": sorted(needed_skillsets),
-            }
-            # In aggressive mode, don't fail - just track the issue
-            if aggressive_mode:
-                detail["aggressive_override"] = True
-            else:
-                return False, assignments, detail
-    candidate_entries.sort(
-        key=lambda item: _candidate_sort_key(
-            item["name"],
-            role,
-            item["state"],
-            role_people,
-            random_order,
-            bool(item["covers_needed"]),
-            bool(item["pref_match"]),
+    else:
+        eligible = candidate_index.eligible(role, month_idx, required_skillsets)
+        preferred = candidate_index.preferred(parent_summary)
+        if required_skillsets:
+            # The index has already narrowed these to the skilled few; sort them directly.
+            coverers = candidate_index.skilled(role, month_idx, needed_skillsets) if needed_skillsets else None
+            for name in eligible:
+                state = person_states.cell(name, month_idx)
+                if state is None or state.remaining_capacity() <= EPSILON:
+                    continue
+                candidate_entries.append(
+                    {
+                        "name": name,
+                        "state": state,
+                        "covers_needed": coverers is None or name in coverers,
+                        "pref_match": name in preferred,
+                    }
+                )
+        else:
+            ordered_candidates = _candidates_by_load(
+                role, month_idx, person_states, candidate_index, role_people, preferred, random_order
+            )
+    if ordered_candidates is None:
+        candidate_entries.sort(
+            key=lambda item: _candidate_sort_key(
+                item["name"],
+                role,
+                item["state"],
+                role_people,
+                random_order,
+                bool(item["covers_needed"]),
+                bool(item["pref_match"]),
+            )
         )
-    )
+        ordered_candidates = ((item["name"], item["state"]) for item in candidate_entries)
+    if aggressive_mode and not candidate_entries:
+        # Aggressive mode only: don't fail - just track the issue
+        if required_skillsets and not candidate_index.eligible(role, month_idx, required_skillsets):
+            reason_code = "skillset_unavailable"
+        else:
+            reason_code = "no_capacity_remaining"
+        detail = {
+            "role": role,
+            "month_idx": month_idx,
+            "demand": demand,
+            "reason": reason_code,
+            "needed_skillsets": skills.names(needed_skillsets),
+            "aggressive_override": True,
+        }
+        if full_detail:
+            detail["available"] = detail_available
+            detail["allocations"] = []
     remaining = demand
     allocation_details: List[Dict[str, object]] = []
     assigned_names: Set[str] = set()
+    capacity_before: Dict[str, float] = {}
     limit_blocked = False
-    for item in candidate_entries:
-        name = item["name"]
-        state = item["state"]
+    considered = 0
+    for name, state in ordered_candidates:
+        considered += 1
         if remaining <= EPSILON:
             break
         already_assigned = name in assigned_names
         if not already_assigned and len(assigned_names) >= max_assignments:
+            # Candidates are unique, so nobody later can be taken either.
             limit_blocked = True
-            continue
+            break
         available = state.remaining_capacity()
+        capacity_before.setdefault(name, available)
         # In aggressive mode, assign even if no capacity, use demand instead
         if aggressive_mode and available <= EPSILON:
             share = min(remaining, 0.1)  # Assign at least 10% or remaining demand
@@ -555,21 +723,39 @@ def _allocate_month(
                 share = min(share, planner_month_cap)
             if share <= EPSILON:
                 continue
-        state.assign(project_id, role, share, allow_overallocation=aggressive_mode)
+        person_states.assign(
+            name, month_idx, project_id, role, share, allow_overallocation=aggressive_mode
+        )
         assignments.append((name, month_idx, role, share))
         role_people[role].add(name)
         if not already_assigned and share > EPSILON:
             assigned_names.add(name)
-        allocation_details.append(
-            {
-                "name": name,
-                "share": round(share, 4),
-                "capacity_used": round(available, 4),
-                "skills": sorted(person_skillsets.get(name, set())),
-            }
-        )
+        if full_detail:
+            allocation_details.append(
+                {
+                    "name": name,
+                    "share": round(share, 4),
+                    "capacity_used": round(available, 4),
+                    "skills": skills.names(person_skillsets.get(name, 0)),
+                }
+            )
         remaining -= share
 
+    if not considered and not aggressive_mode:
+        detail = {
+            "role": role,
+            "month_idx": month_idx,
+            "demand": demand,
+            "reason": "no_capacity_remaining" if eligible else "skillset_unavailable",
+            "needed_skillsets": skills.names(needed_skillsets),
+        }
+        if full_detail:
+            detail["available"] = _describe_candidates(
+                candidates, month_idx, person_states, person_skillsets, required_skillsets, skills
+            )
+            detail["allocations"] = []
+        return False, assignments, detail
+
     # Check if remaining shortfall is acceptable
     # For high-priority projects, allow overbooking up to tolerance threshold
     acceptable_shortfall = demand * overbooking_tolerance if is_high_priority else EPSILON
@@ -579,12 +765,23 @@ def _allocate_month(
             "role": role,
             "month_idx": month_idx,
             "demand": demand,
-            "available": detail_available,
-            "allocations": allocation_details,
             "reason": "concurrency_limit" if limit_blocked else "insufficient_capacity",
             "shortfall": remaining,
-            "needed_skillsets": sorted(needed_skillsets),
+            "needed_skillsets": skills.names(needed_skillsets),
         }
+        if full_detail:
+            if detail_available is None:
+                detail_available = _describe_candidates(
+                    candidates,
+                    month_idx,
+                    person_states,
+                    person_skillsets,
+                    required_skillsets,
+                    skills,
+                    capacity_before,
+                )
+            detail["available"] = detail_available
+            detail["allocations"] = allocation_details
         # In aggressive mode, always succeed but track the issue
         if aggressive_mode:
             detail["aggressive_override"] = True
@@ -593,14 +790,275 @@ def _allocate_month(
     return True, assignments, None
 
 
-def _rollback_assignments(
-    project_id: str,
-    assignments: Iterable[Tuple[str, int, str, float]],
-    person_states: Dict[str, Dict[int, MonthlyState]],
-) -> None:
-    for name, month_idx, role, share in reversed(list(assignments)):
-        state = person_states[name][month_idx]
-        state.remove(project_id, role, share)
+def _window_capacity_thresholds(
+    monthly_demands: Dict[str, List[float]],
+    is_high_priority: bool,
+    overbooking_tolerance: float,
+) -> Dict[str, List[Tuple[int, float]]]:
+    """Minimum free role capacity each month offset needs for a window to be placeable."""
+    thresholds: Dict[str, List[Tuple[int, float]]] = {}
+    for role, monthly_values in monthly_demands.items():
+        checks: List[Tuple[int, float]] = []
+        for offset, demand in enumerate(monthly_values):
+            if demand <= EPSILON:
+                continue
+            acceptable_shortfall = demand * overbooking_tolerance if is_high_priority else EPSILON
+            checks.append((offset, demand - acceptable_shortfall - EPSILON))
+        if checks:
+            thresholds[role] = checks
+    return thresholds
+
+
+def _window_shortfall(
+    person_states: CapacityLedger,
+    thresholds: Dict[str, List[Tuple[int, float]]],
+    start_idx: int,
+) -> Optional[Dict[str, object]]:
+    """Failure context for the first month the window cannot cover, or None if it might fit.
+
+    The shortfall is taken from the free-capacity envelope, so it is only an
+    estimate of what allocating the window would report.
+    """
+    for role, checks in thresholds.items():
+        free = person_states.free_capacity(role)
+        for offset, threshold in checks:
+            month_free = free[start_idx + offset]
+            if month_free < threshold:
+                return {
+                    "role": role,
+                    "month_idx": start_idx + offset,
+                    "reason": "insufficient_capacity",
+                    "shortfall": threshold - month_free,
+                    "start_idx": start_idx,
+                }
+    return None
+
+
+def _next_unblocked_start(
+    failure_context: Optional[Dict[str, object]],
+    start_idx: int,
+    latest_start_idx: int,
+    monthly_demands: Dict[str, List[float]],
+) -> int:
+    """First start index after ``start_idx`` not doomed by the same static failure.
+
+    ``no_available_people``, ``skillset_unavailable`` and ``concurrency_limit_zero``
+    depend only on the roster and the project, never on what has been allocated,
+    so any later window that still needs the failing role in the blocking month
+    fails the same way.
+    """
+    if not failure_context or failure_context.get("reason") not in BACKJUMP_REASONS:
+        return start_idx + 1
+    role = failure_context.get("role")
+    monthly_values = monthly_demands.get(role, [])
+    if failure_context.get("reason") == "concurrency_limit_zero":
+        # Every month with demand for the role fails, whatever the start.
+        return latest_start_idx + 1
+    blocked_month = failure_context.get("month_idx")
+    if not isinstance(blocked_month, int):
+        return start_idx + 1
+    for candidate in range(start_idx + 1, blocked_month + 1):
+        offset = blocked_month - candidate
+        if offset >= len(monthly_values) or monthly_values[offset] <= EPSILON:
+            return candidate
+    return max(start_idx + 1, blocked_month + 1)
+
+
+def _attempt_start(
+    project: Project,
+    start_idx: int,
+    duration: int,
+    monthly_demands: Dict[str, List[float]],
+    efforts: Dict[str, float],
+    required_skillsets_map: Dict[str, int],
+    roles: Sequence[str],
+    person_states: CapacityLedger,
+    available_by_role_month: Dict[str, Dict[int, List[str]]],
+    candidate_index: CandidateIndex,
+    random_order: Dict[str, float],
+    person_skillsets: Dict[str, int],
+    skills: SkillRegistry,
+    person_preferences: Dict[str, Set[str]],
+    cfg: PlanningConfig,
+    is_high_priority: bool,
+    aggressive_mode: bool,
+    allocation_issues: List[Dict[str, object]],
+    month_keys: Sequence[str],
+    diagnostics: str = "full",
+) -> Tuple[Optional[Dict[str, object]], Optional[Dict[str, object]]]:
+    """Try to place ``project`` starting at ``start_idx``.
+
+    Allocations run inside a ledger scope: it is committed on success and rolled
+    back on failure, in which case the failure context (if any) is returned.
+    """
+    person_states.begin()
+    role_people = _role_set(roles)
+    role_totals = _role_totals(roles)
+    role_skillset_coverage: Dict[str, int] = {role_key: 0 for role_key in roles}
+    for offset in range(duration):
+        month_idx = start_idx + offset
+        for role, monthly_values in monthly_demands.items():
+            demand = monthly_values[offset] if offset < len(monthly_values) else 0.0
+            if demand <= EPSILON:
+                continue
+            required_skillsets = required_skillsets_map.get(role, 0)
+            needed_skillsets = required_skillsets & ~role_skillset_coverage[role]
+            # For high-priority projects, increase concurrency limit to be more aggressive
+            max_concurrent = cfg.max_concurrent_for_role(role)
+            if is_high_priority:
+                max_concurrent = max(max_concurrent * 2, max_concurrent + 1)
+            success, assignments, failure_detail = _allocate_month(
+                project.id,
+                role,
+                month_idx,
+                demand,
+                role_people,
+                available_by_role_month,
+                candidate_index,
+                person_states,
+                random_order,
+                required_skillsets,
+                needed_skillsets,
+                person_skillsets,
+                skills,
+                person_preferences,
+                project.parent_summary,
+                max_concurrent,
+                cfg.planner_project_month_cap_pct,
+                is_high_priority,
+                cfg.overbooking_tolerance_pct,
+                aggressive_mode,
+                diagnostics,
+            )
+            # Track issues in aggressive mode
+            if aggressive_mode and failure_detail and failure_detail.get("aggressive_override"):
+                allocation_issues.append({
+                    "project_id": project.id,
+                    "project_name": project.name,
+                    "role": role,
+                    "month_idx": month_idx,
+                    "month_label": month_keys[month_idx],
+                    **failure_detail,
+                })
+            if not success:
+                person_states.rollback()
+                if failure_detail:
+                    return None, {
+                        **failure_detail,
+                        "project_id": project.id,
+                        "start_idx": start_idx,
+                    }
+                return None, None
+            for name, _, assignment_role, share in assignments:
+                role_totals[assignment_role] += share
+                if required_skillsets and assignment_role == role:
+                    role_skillset_coverage[role] |= person_skillsets.get(name, 0) & required_skillsets
+    for role, effort in efforts.items():
+        if effort <= EPSILON:
+            continue
+        if abs(role_totals[role] - effort) > 1e-3:
+            person_states.rollback()
+            return None, None
+    missing_coverage = {
+        role_key: skills.names(required_skillsets_map[role_key] & ~role_skillset_coverage[role_key])
+        for role_key in roles
+        if required_skillsets_map[role_key] & ~role_skillset_coverage[role_key]
+    }
+    if missing_coverage:
+        person_states.rollback()
+        return None, {
+            "project_id": project.id,
+            "role": ";".join(sorted(missing_coverage)),
+            "reason": "skillset_uncovered",
+            "missing_skillsets": missing_coverage,
+        }
+    person_states.commit()
+    return {
+        "project": project,
+        "start_idx": start_idx,
+        "duration": duration,
+        "role_people": role_people,
+        "role_totals": role_totals,
+    }, None
+
+
+def _overallocation_issues(
+    person_states: CapacityLedger,
+    month_keys: Sequence[str],
+    person_roles_map: Dict[str, Set[str]],
+    *,
+    allow: bool,
+) -> List[Dict[str, object]]:
+    """One issue per role of every over-allocated person-month; raises unless ``allow``."""
+    issues: List[Dict[str, object]] = []
+    for name in sorted(person_states):
+        for month_idx, state in sorted(person_states[name].items()):
+            total_pct = state.total_pct
+            if total_pct <= 1.0 + EPSILON:
+                continue
+            if not allow:
+                raise ValueError(f"allocation exceeds capacity for {name} in {month_keys[month_idx]}")
+            for role_name in person_roles_map.get(name, set()):
+                issues.append({
+                    "type": "overallocation",
+                    "person": name,
+                    "role": role_name,
+                    "month_idx": month_idx,
+                    "month_label": month_keys[month_idx],
+                    "allocated_pct": total_pct,
+                    "overallocation_pct": total_pct - 1.0,
+                })
+    return issues
+
+
+class CapacityRows:
+    """``resource_capacity.csv`` rows generated from the ledger on each iteration.
+
+    Rows are never held as a list: ``write_rows`` streams them to the file and
+    ``PlanResult.capacity_df()`` builds a DataFrame only when asked. Each
+    person-month gives a KTLO row followed by one row per project and role.
+    """
+
+    def __init__(
+        self,
+        person_states: CapacityLedger,
+        month_keys: Sequence[str],
+        project_names: Dict[str, str],
+    ) -> None:
+        self._person_states = person_states
+        self._month_keys = month_keys
+        self._project_names = project_names
+
+    def __iter__(self) -> Iterator[Dict[str, object]]:
+        month_keys = self._month_keys
+        project_names = self._project_names
+        for name in sorted(self._person_states):
+            for month_idx, state in sorted(self._person_states[name].items()):
+                month_label = month_keys[month_idx]
+                total_value = round(state.total_pct, 4)
+                # Record KTLO load as a dedicated row.
+                yield {
+                    "person": name,
+                    "role": "",
+                    "project_id": "",
+                    "project_name": "KTLO",
+                    "month": month_label,
+                    "project_alloc_pct": round(state.ktlo_pct, 4),
+                    "total_pct": total_value,
+                }
+                allocations_map = state.allocations
+                for project_id in sorted(allocations_map):
+                    project_name = project_names.get(project_id, project_id)
+                    for assignment_role, alloc in sorted(allocations_map[project_id].items()):
+                        yield {
+                            "person": name,
+                            "role": assignment_role,
+                            "project_id": project_id,
+                            "project_name": project_name,
+                            "month": month_label,
+                            "project_alloc_pct": round(alloc, 4),
+                            "total_pct": total_value,
+                        }
 
 
 def _format_people(names: Iterable[str]) -> str:
@@ -611,7 +1069,7 @@ def _format_people(names: Iterable[str]) -> str:
 def analyze_hiring_needs(
     allocation_issues: List[Dict[str, object]],
     role_month_capacity: Dict[str, List[float]],
-    person_states: Dict[str, Dict[int, MonthlyState]],
+    person_states: CapacityLedger,
     month_keys: Sequence[str],
     cfg: PlanningConfig,
 ) -> Dict[str, object]:
@@ -732,69 +1190,174 @@ def analyze_hiring_needs(
     }
 
 
+TIMELINE_COLUMNS: Tuple[str, ...] = (
+    "id",
+    "name",
+    "parent_summary",
+    "start_month",
+    "end_month",
+    "duration_months",
+    "ba_persons",
+    "planner_persons",
+    "dev_persons",
+    "effort_ba_pm",
+    "effort_planner_pm",
+    "effort_dev_pm",
+    "priority",
+    "input_row",
+)
+ORTOOLS_TIMELINE_COLUMNS: Tuple[str, ...] = ("id", "name", "start_month", "end_month", "duration_months")
+CAPACITY_COLUMNS: Tuple[str, ...] = (
+    "person",
+    "role",
+    "project_id",
+    "project_name",
+    "month",
+    "project_alloc_pct",
+    "total_pct",
+)
+
+
+@dataclass
+class PlanResult:
+    """A planning run as plain rows; DataFrames are built only when asked for.
+
+    ``timeline_df()`` and ``capacity_df()`` give what ``plan()`` returns, with
+    the skip, issue and statistics details on the capacity frame's attrs.
+    ``capacity_rows`` may be a ``CapacityRows`` view of the ledger, which can
+    be iterated any number of times without materialising the rows.
+    """
+
+    timeline_columns: Sequence[str]
+    timeline_rows: List[Dict[str, object]]
+    capacity_columns: Sequence[str]
+    capacity_rows: Iterable[Dict[str, object]]
+    skipped_projects: List[Dict[str, object]] = field(default_factory=list)
+    allocation_issues: Optional[List[Dict[str, object]]] = None
+    run_stats: Optional[Dict[str, int]] = None
+    hiring_analysis: Optional[Dict[str, object]] = None
+    month_keys: Sequence[str] = ()
+
+    def timeline_df(self) -> pd.DataFrame:
+        import pandas as pd
+
+        return pd.DataFrame(self.timeline_rows, columns=list(self.timeline_columns))
+
+    def capacity_df(self) -> pd.DataFrame:
+        import pandas as pd
+
+        df = pd.DataFrame(self.capacity_rows, columns=list(self.capacity_columns))
+        df.attrs["skipped_projects"] = self.skipped_projects
+        if self.allocation_issues is not None:
+            df.attrs["allocation_issues"] = self.allocation_issues
+        if self.run_stats is not None:
+            df.attrs["run_stats"] = self.run_stats
+        return df
+
+
 def plan(
     projects_df: pd.DataFrame,
     people_df: pd.DataFrame,
     cfg: PlanningConfig,
     *,
     strict: bool = False,
+    checkpoints: Optional[ReplanCheckpoints] = None,
+    peak_shares: Optional[PeakShareTable] = None,
+    skill_catalog: Sequence[str] = (),
 ) -> Tuple[pd.DataFrame, pd.DataFrame, Optional[Dict[str, object]]]:
-    # Check if OR-Tools solver is selected
-    if hasattr(cfg, 'solver') and cfg.solver == 'ortools':
-        from .solver_ortools import solve_with_ortools
-
-        # Call OR-Tools solver
-        result = solve_with_ortools(projects_df, people_df, cfg)
-
-        # Convert OR-Tools result to expected format
-        # Build project_timeline dataframe
-        timeline_records = []
-        for proj in result.scheduled_projects:
-            timeline_records.append({
-                'id': proj['id'],
-                'name': proj['name'],
-                'start_month': proj['start_month'],
-                'end_month': proj['end_month'],
-                'duration_months': proj['duration_months'],
-            })
-        project_timeline_df = pd.DataFrame(timeline_records)
-
-        # Use the resource_timeline from OR-Tools result as resource_capacity
-        resource_capacity_df = result.resource_timeline
-
-        # Add skipped projects to attrs
-        resource_capacity_df.attrs["skipped_projects"] = result.unscheduled_projects
-
-        # Convert recommendations to hiring_analysis format
-        hiring_analysis = None
-        if result.recommendations:
-            hiring_analysis = {
-                "summary": result.recommendations.get("summary", {}),
-                "recommendations": [],
-                "capacity_vs_demand": {},
-                "skill_bottlenecks": [],
-            }
+    """DataFrame front end of ``plan_records``."""
+    result = plan_records(
+        _projects_from_df(projects_df),
+        _people_from_df(people_df),
+        cfg,
+        strict=strict,
+        checkpoints=checkpoints,
+        peak_shares=peak_shares,
+        skill_catalog=skill_catalog,
+    )
+    return result.timeline_df(), result.capacity_df(), result.hiring_analysis
+
+
+def _plan_with_ortools(
+    projects: List[Project],
+    people: List[Person],
+    cfg: PlanningConfig,
+    skill_catalog: Sequence[str],
+) -> PlanResult:
+    from .solver_ortools import solve_portfolio
+
+    # Call OR-Tools solver
+    result = solve_portfolio(projects, people, cfg, skill_catalog)
+
+    # Convert OR-Tools result to expected format
+    # Build project_timeline rows
+    timeline_rows = []
+    for proj in result.scheduled_projects:
+        timeline_rows.append({
+            'id': proj['id'],
+            'name': proj['name'],
+            'start_month': proj['start_month'],
+            'end_month': proj['end_month'],
+            'duration_months': proj['duration_months'],
+        })
+
+    # Use the resource_timeline from OR-Tools result as resource_capacity
+    resource_timeline = result.resource_timeline
+
+    # Convert recommendations to hiring_analysis format
+    hiring_analysis = None
+    if result.recommendations:
+        hiring_analysis = {
+            "summary": result.recommendations.get("summary", {}),
+            "recommendations": [],
+            "capacity_vs_demand": {},
+            "skill_bottlenecks": [],
+        }
+
+        # Add hiring recommendations if OR-Tools generated them
+        if "hiring" in result.recommendations:
+            for hire in result.recommendations["hiring"]:
+                hiring_analysis["recommendations"].append({
+                    "role": hire.get("role", "Unknown"),
+                    "hires_needed": hire.get("count", 1),
+                    "peak_month": hire.get("by_month", "ASAP"),
+                    "needed_skills": list(hire.get("required_skills", [])),
+                    "reason": hire.get("reason", ""),
+                })
+
+    return PlanResult(
+        timeline_columns=ORTOOLS_TIMELINE_COLUMNS,
+        timeline_rows=timeline_rows,
+        capacity_columns=list(resource_timeline.columns),
+        capacity_rows=resource_timeline.to_dict("records"),
+        skipped_projects=result.unscheduled_projects,
+        hiring_analysis=hiring_analysis,
+        month_keys=[month.strftime(MONTH_FMT) for month in _build_month_sequence(cfg)],
+    )
 
-            # Add hiring recommendations if OR-Tools generated them
-            if "hiring" in result.recommendations:
-                for hire in result.recommendations["hiring"]:
-                    hiring_analysis["recommendations"].append({
-                        "role": hire.get("role", "Unknown"),
-                        "hires_needed": hire.get("count", 1),
-                        "peak_month": hire.get("by_month", "ASAP"),
-                        "needed_skills": list(hire.get("required_skills", [])),
-                        "reason": hire.get("reason", ""),
-                    })
 
-        return project_timeline_df, resource_capacity_df, hiring_analysis
+def plan_records(
+    projects: List[Project],
+    people: List[Person],
+    cfg: PlanningConfig,
+    *,
+    strict: bool = False,
+    checkpoints: Optional[ReplanCheckpoints] = None,
+    peak_shares: Optional[PeakShareTable] = None,
+    skill_catalog: Sequence[str] = (),
+) -> PlanResult:
+    """Plan ``projects`` (in input order) with the active ``people``; no pandas involved."""
+    # Check if OR-Tools solver is selected
+    if hasattr(cfg, 'solver') and cfg.solver == 'ortools':
+        return _plan_with_ortools(projects, people, cfg, skill_catalog)
 
     # Otherwise use greedy solver (existing logic)
     roles = tuple(cfg.iter_roles())
-    projects = _projects_from_df(projects_df)
-    people = _people_from_df(people_df)
+    skills = SkillRegistry.from_inputs(people, projects, skill_catalog)
     month_starts = _build_month_sequence(cfg)
     if not month_starts:
         raise ValueError("planning window does not span any months")
+    availability = build_availability(people, month_starts)
     (
         person_states,
         available_by_role_month,
@@ -803,8 +1366,11 @@ def plan(
         person_preferences,
         person_roles_map,
         role_capacity_samples,
-    ) = _build_person_states(people, month_starts, cfg)
+    ) = _build_person_states(people, month_starts, cfg, skills, availability)
+    candidate_index = CandidateIndex(available_by_role_month, person_skillsets, person_preferences)
     effective_limits = _effective_role_limits(role_month_capacity, role_capacity_samples, cfg)
+    if peak_shares is None:
+        peak_shares = PeakShareTable(cfg)
     month_keys = [month.strftime(MONTH_FMT) for month in month_starts]
     rng_seed = cfg.random_seed if cfg.random_seed is not None else 0
     rng = random.Random(rng_seed)
@@ -813,6 +1379,7 @@ def plan(
     scheduled_records: List[Dict[str, object]] = []
     skipped_projects: List[Dict[str, object]] = []
     allocation_issues: List[Dict[str, object]] = []  # Track issues for aggressive mode
+    stats = RunStats()
 
     aggressive_mode = cfg.allocation_mode == "aggressive"
 
@@ -828,12 +1395,53 @@ def plan(
                 return (float('inf'), p.input_row)
         projects = sorted(projects, key=priority_key)
 
-    for project in projects:
-        efforts = project.role_efforts()
-        total_effort = project.total_effort()
-        use_uniform_curve = total_effort <= SMALL_PROJECT_EFFORT_THRESHOLD + EPSILON
+    # Durations depend only on efforts and roster-wide limits, so the whole
+    # portfolio's demand is laid out before any placement.
+    demand = PortfolioDemand(projects)
+    duration_plans = [
+        _resolve_duration(
+            demand.role_efforts(position),
+            effective_limits,
+            peak_shares,
+            len(month_starts),
+            demand.uses_uniform_curve(position),
+        )
+        if demand.has_demand(position)
+        else (None, 0, None)
+        for position in range(len(projects))
+    ]
+    demand.set_durations([entry[0] for entry in duration_plans], cfg)
+
+    start_position = 0
+    if checkpoints is not None:
+        restored = checkpoints.resume(
+            fingerprint((cfg, people, strict)), [fingerprint(project) for project in projects]
+        )
+        if restored is not None:
+            start_position, state = restored
+            person_states = state["person_states"]
+            scheduled_records = state["scheduled_records"]
+            skipped_projects = state["skipped_projects"]
+            allocation_issues = state["allocation_issues"]
+            stats = state["stats"]
+            stats.projects_reused = start_position
+
+    def snapshot() -> Dict[str, object]:
+        return {
+            "person_states": person_states,
+            "scheduled_records": scheduled_records,
+            "skipped_projects": skipped_projects,
+            "allocation_issues": allocation_issues,
+            "stats": stats,
+        }
+
+    for position in range(start_position, len(projects)):
+        if checkpoints is not None and checkpoints.due(position):
+            checkpoints.record(position, snapshot())
+        project = projects[position]
+        efforts = demand.role_efforts(position)
         required_skillsets_map = {
-            role: set(project.skillsets_for_role(role)) for role in roles
+            role: skills.mask(project.skillsets_for_role(role)) for role in roles
         }
         # Determine if this is a high-priority project eligible for overbooking
         is_high_priority = False
@@ -843,7 +1451,7 @@ def plan(
                 is_high_priority = priority_val <= cfg.high_priority_threshold
             except (ValueError, TypeError):
                 pass
-        if not project.has_demand():
+        if not demand.has_demand(position):
             scheduled_records.append(
                 {
                     "project": project,
@@ -854,15 +1462,27 @@ def plan(
                 }
             )
             continue
-        role_min_durations: Dict[str, int] = {}
-        failure_contexts: List[Dict[str, object]] = []
-        for role, effort in efforts.items():
-            if effort <= EPSILON:
-                role_min_durations[role] = 0
-                continue
-            effective_limit = effective_limits.get(role, 0.0)
-            if effective_limit <= EPSILON:
-                reason = f"no available capacity for role {role}"
+        worst_failure: Optional[Tuple[int, Dict[str, object]]] = None
+        duration, base_duration, blocked_role = duration_plans[position]
+        if blocked_role is not None:
+            reason = f"no available capacity for role {blocked_role}"
+            if strict:
+                raise UnschedulableProjectError(project, reason)
+            skipped_projects.append(
+                {
+                    "id": project.id,
+                    "name": project.name,
+                    "reason": reason,
+                    "detail": {
+                        "reason_code": "no_role_capacity",
+                        "role": blocked_role,
+                        "required_skillsets": skills.names(required_skillsets_map.get(blocked_role, 0)),
+                    },
+                }
+            )
+        else:
+            if duration is None:
+                reason = "duration exceeds planning window"
                 if strict:
                     raise UnschedulableProjectError(project, reason)
                 skipped_projects.append(
@@ -871,45 +1491,13 @@ def plan(
                         "name": project.name,
                         "reason": reason,
                         "detail": {
-                            "reason_code": "no_role_capacity",
-                            "role": role,
-                            "required_skillsets": sorted(required_skillsets_map.get(role, set())),
+                            "reason_code": "duration_too_long",
+                            "duration": max(base_duration, len(month_starts) + 1),
                         },
                     }
                 )
-                break
-            min_duration = max(1, math.ceil(effort / max(effective_limit, EPSILON)))
-            role_min_durations[role] = min_duration
-        else:
-            base_duration = max(role_min_durations.values(), default=1)
-            duration = max(1, base_duration)
-            while True:
-                if duration > len(month_starts):
-                    reason = "duration exceeds planning window"
-                    if strict:
-                        raise UnschedulableProjectError(project, reason)
-                    skipped_projects.append(
-                        {
-                            "id": project.id,
-                            "name": project.name,
-                            "reason": reason,
-                            "detail": {"reason_code": "duration_too_long", "duration": duration},
-                        }
-                    )
-                    break
-                monthly_demands = _compute_monthly_demands(
-                    project,
-                    duration,
-                    cfg,
-                    force_uniform=use_uniform_curve,
-                )
-                if _monthly_demands_within_limits(monthly_demands, effective_limits):
-                    break
-                duration += 1
-            else:
-                continue
-            if skipped_projects and skipped_projects[-1].get("id") == project.id:
                 continue
+            monthly_demands = demand.monthly_demands(position)
             latest_start_idx = len(month_starts) - duration
             if latest_start_idx < 0:
                 reason = "project does not fit within planning horizon"
@@ -925,127 +1513,115 @@ def plan(
                 )
                 continue
             placed = False
-            for start_idx in range(latest_start_idx + 1):
-                assignments_record: List[Tuple[str, int, str, float]] = []
-                role_people = _role_set(roles)
-                role_totals = _role_totals(roles)
-                role_skillset_coverage = {role_key: set() for role_key in roles}
-                for offset in range(duration):
-                    month_idx = start_idx + offset
-                    for role, monthly_values in monthly_demands.items():
-                        demand = monthly_values[offset] if offset < len(monthly_values) else 0.0
-                        if demand <= EPSILON:
-                            continue
-                        required_skillsets = required_skillsets_map.get(role, set())
-                        needed_skillsets = required_skillsets - role_skillset_coverage[role]
-                        # For high-priority projects, increase concurrency limit to be more aggressive
-                        max_concurrent = cfg.max_concurrent_for_role(role)
-                        if is_high_priority:
-                            max_concurrent = max(max_concurrent * 2, max_concurrent + 1)
-                        success, assignments, failure_detail = _allocate_month(
-                            project.id,
-                            role,
-                            month_idx,
-                            demand,
-                            role_people,
-                            available_by_role_month,
-                            person_states,
-                            random_order,
-                            required_skillsets,
-                            needed_skillsets,
-                            person_skillsets,
-                            person_preferences,
-                            project.parent_summary,
-                            max_concurrent,
-                            cfg.planner_project_month_cap_pct,
-                            is_high_priority,
-                            cfg.overbooking_tolerance_pct,
-                            aggressive_mode,
-                        )
-                        # Track issues in aggressive mode
-                        if aggressive_mode and failure_detail and failure_detail.get("aggressive_override"):
-                            allocation_issues.append({
-                                "project_id": project.id,
-                                "project_name": project.name,
-                                "role": role,
-                                "month_idx": month_idx,
-                                "month_label": month_keys[month_idx],
-                                **failure_detail,
-                            })
-                        assignments_record.extend(assignments)
-                        if not success:
-                            _rollback_assignments(project.id, assignments_record, person_states)
-                            assignments_record.clear()
-                            role_people = _role_set(roles)
-                            role_totals = _role_totals(roles)
-                            role_skillset_coverage = {role_key: set() for role_key in roles}
-                            if failure_detail:
-                                failure_contexts.append(
-                                    {
-                                        **failure_detail,
-                                        "project_id": project.id,
-                                        "start_idx": start_idx,
-                                    }
-                                )
-                            break
-                        for name, _, assignment_role, share in assignments:
-                            role_totals[assignment_role] += share
-                            if required_skillsets and assignment_role == role:
-                                role_skillset_coverage[role].update(
-                                    person_skillsets.get(name, set()) & required_skillsets
-                                )
-                    else:
-                        continue
-                    break
-                else:
-                    totals_ok = True
-                    for role, effort in efforts.items():
-                        if effort <= EPSILON:
-                            continue
-                        if abs(role_totals[role] - effort) > 1e-3:
-                            totals_ok = False
-                            break
-                    if not totals_ok:
-                        _rollback_assignments(project.id, assignments_record, person_states)
-                        assignments_record.clear()
-                        continue
-                    missing_coverage = {
-                        role_key: sorted(
-                            required_skillsets_map[role_key] - role_skillset_coverage[role_key]
-                        )
-                        for role_key in roles
-                        if required_skillsets_map[role_key]
-                        and not required_skillsets_map[role_key].issubset(
-                            role_skillset_coverage[role_key]
-                        )
-                    }
-                    if missing_coverage:
-                        _rollback_assignments(project.id, assignments_record, person_states)
-                        assignments_record.clear()
-                        failure_contexts.append(
-                            {
-                                "project_id": project.id,
-                                "role": ";".join(sorted(missing_coverage)),
-                                "reason": "skillset_uncovered",
-                                "missing_skillsets": missing_coverage,
-                            }
-                        )
-                        continue
-                    scheduled_records.append(
-                        {
-                            "project": project,
-                            "start_idx": start_idx,
-                            "duration": duration,
-                            "role_people": role_people,
-                            "role_totals": role_totals,
-                        }
+            worst_is_pruned = False
+            capacity_thresholds = (
+                None
+                if aggressive_mode
+                else _window_capacity_thresholds(
+                    monthly_demands, is_high_priority, cfg.overbooking_tolerance_pct
+                )
+            )
+
+            def note_failure(start_idx: int, failure_context: Dict[str, object], pruned: bool) -> None:
+                # Keep only the context _describe_failure would select, preferring the
+                # earliest start on ties, so failed windows do not accumulate detail.
+                nonlocal worst_failure, worst_is_pruned
+                if (
+                    worst_failure is None
+                    or _failure_rank(failure_context) > _failure_rank(worst_failure[1])
+                    or (
+                        _failure_rank(failure_context) == _failure_rank(worst_failure[1])
+                        and start_idx < worst_failure[0]
                     )
+                ):
+                    worst_failure = (start_idx, failure_context)
+                    worst_is_pruned = pruned
+
+            def attempt(start_idx: int) -> Tuple[Optional[Dict[str, object]], Optional[Dict[str, object]]]:
+                record, failure_context = _attempt_start(
+                    project,
+                    start_idx,
+                    duration,
+                    monthly_demands,
+                    efforts,
+                    required_skillsets_map,
+                    roles,
+                    person_states,
+                    available_by_role_month,
+                    candidate_index,
+                    random_order,
+                    person_skillsets,
+                    skills,
+                    person_preferences,
+                    cfg,
+                    is_high_priority,
+                    aggressive_mode,
+                    allocation_issues,
+                    month_keys,
+                    cfg.diagnostics,
+                )
+                if failure_context:
+                    note_failure(start_idx, failure_context, False)
+                return record, failure_context
+
+            start_idx = 0
+            while start_idx <= latest_start_idx:
+                if capacity_thresholds is not None:
+                    envelope_failure = _window_shortfall(person_states, capacity_thresholds, start_idx)
+                    if envelope_failure is not None:
+                        stats.start_indices_pruned += 1
+                        note_failure(start_idx, envelope_failure, True)
+                        start_idx += 1
+                        continue
+                stats.start_indices_attempted += 1
+                record, failure_context = attempt(start_idx)
+                if record is not None:
+                    scheduled_records.append(record)
                     placed = True
                     break
-                if placed:
-                    break
+                resume_idx = min(
+                    _next_unblocked_start(failure_context, start_idx, latest_start_idx, monthly_demands),
+                    latest_start_idx + 1,
+                )
+                stats.start_indices_backjumped += resume_idx - start_idx - 1
+                start_idx = resume_idx
             if not placed:
-                detail_reason, detail = _describe_failure(failure_contexts, month_keys)
+                if worst_failure is not None and (
+                    worst_is_pruned or (cfg.diagnostics == "summary" and "month_idx" in worst_failure[1])
+                ):
+                    # The ledger is back where it was before this project, so re-running
+                    # the reported window gives its actual failure (with the candidate
+                    # roster unless diagnostics are off). A pruned window cannot fit:
+                    # the envelope only rejects windows some month can never cover.
+                    stats.start_indices_replayed += 1
+                    replayed, full_context = _attempt_start(
+                        project,
+                        worst_failure[0],
+                        duration,
+                        monthly_demands,
+                        efforts,
+                        required_skillsets_map,
+                        roles,
+                        person_states,
+                        available_by_role_month,
+                        candidate_index,
+                        random_order,
+                        person_skillsets,
+                        skills,
+                        person_preferences,
+                        cfg,
+                        is_high_priority,
+                        aggressive_mode,
+                        [],
+                        month_keys,
+                        "off" if cfg.diagnostics == "off" else "full",
+                    )
+                    assert replayed is None, f"window {worst_failure[0]} of {project.id} passed on replay"
+                    if full_context:
+                        worst_failure = (worst_failure[0], full_context)
+                detail_reason, detail = _describe_failure(
+                    [worst_failure[1]] if worst_failure else [], month_keys
+                )
                 if strict:
                     raise UnschedulableProjectError(project, detail_reason)
                 skipped_projects.append(
@@ -1057,6 +1633,11 @@ def plan(
                     }
                 )
 
+    if checkpoints is not None:
+        if checkpoints.due(len(projects)):
+            checkpoints.record(len(projects), snapshot())
+        checkpoints.save()
+
     timeline_rows: List[Dict[str, object]] = []
     for record in scheduled_records:
         project: Project = record["project"]  # type: ignore[assignment]
@@ -1085,95 +1666,16 @@ def plan(
             }
         )
 
-    project_timeline_df = pd.DataFrame(timeline_rows, columns=[
-        "id",
-        "name",
-        "parent_summary",
-        "start_month",
-        "end_month",
-        "duration_months",
-        "ba_persons",
-        "planner_persons",
-        "dev_persons",
-        "effort_ba_pm",
-        "effort_planner_pm",
-        "effort_dev_pm",
-        "priority",
-        "input_row",
-    ])
-
     project_name_lookup: Dict[str, str] = {}
     for record in scheduled_records:
         project: Project = record["project"]  # type: ignore[assignment]
         project_name_lookup[project.id] = project.name
 
-    capacity_rows: List[Dict[str, object]] = []
-    for name in sorted(person_states):
-        states = person_states[name]
-        for month_idx, state in sorted(states.items()):
-            total_pct = state.total_pct
-            # In aggressive mode, allow over-allocation and track it
-            if total_pct > 1.0 + EPSILON:
-                if aggressive_mode:
-                    person_roles = person_roles_map.get(name, set())
-                    for role_name in person_roles:
-                        allocation_issues.append({
-                            "type": "overallocation",
-                            "person": name,
-                            "role": role_name,
-                            "month_idx": month_idx,
-                            "month_label": month_keys[month_idx],
-                            "allocated_pct": total_pct,
-                            "overallocation_pct": total_pct - 1.0,
-                        })
-                else:
-                    raise ValueError(f"allocation exceeds capacity for {name} in {month_keys[month_idx]}")
-            allocations_map = state.allocations
-            month_label = month_keys[month_idx]
-            ktlo_value = round(state.ktlo_pct, 4)
-            total_value = round(total_pct, 4)
-            # Record KTLO load as a dedicated row.
-            capacity_rows.append(
-                {
-                    "person": name,
-                    "role": "",
-                    "project_id": "",
-                    "project_name": "KTLO",
-                    "month": month_label,
-                    "project_alloc_pct": ktlo_value,
-                    "total_pct": total_value,
-                }
-            )
-            if allocations_map:
-                for project_id in sorted(allocations_map):
-                    role_shares = allocations_map[project_id]
-                    for assignment_role, alloc in sorted(role_shares.items()):
-                        capacity_rows.append(
-                            {
-                                "person": name,
-                                "role": assignment_role,
-                                "project_id": project_id,
-                                "project_name": project_name_lookup.get(project_id, project_id),
-                                "month": month_label,
-                                "project_alloc_pct": round(alloc, 4),
-                                "total_pct": total_value,
-                            }
-                        )
-
-    resource_capacity_df = pd.DataFrame(
-        capacity_rows,
-        columns=[
-            "person",
-            "role",
-            "project_id",
-            "project_name",
-            "month",
-            "project_alloc_pct",
-            "total_pct",
-        ],
+    # In aggressive mode, allow over-allocation and track it
+    allocation_issues.extend(
+        _overallocation_issues(person_states, month_keys, person_roles_map, allow=aggressive_mode)
     )
-    resource_capacity_df.attrs["skipped_projects"] = skipped_projects
-    resource_capacity_df.attrs["allocation_issues"] = allocation_issues
+    capacity_rows = CapacityRows(person_states, month_keys, project_name_lookup)
 
     # Analyze hiring needs if in aggressive mode
     hiring_analysis: Optional[Dict[str, object]] = None
@@ -1186,4 +1688,14 @@ def plan(
             cfg,
         )
 
-    return project_timeline_df, resource_capacity_df, hiring_analysis
+    return PlanResult(
+        timeline_columns=TIMELINE_COLUMNS,
+        timeline_rows=timeline_rows,
+        capacity_columns=CAPACITY_COLUMNS,
+        capacity_rows=capacity_rows,
+        skipped_projects=skipped_projects,
+        allocation_issues=allocation_issues,
+        run_stats=stats.to_dict(),
+        hiring_analysis=hiring_analysis,
+        month_keys=month_keys,
+    )
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import pickle
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .io_utils import (
+    load_config,
+    load_skills,
+    people_from_rows,
+    projects_from_rows,
+    read_people_rows,
+    read_pickle,
+    read_project_rows,
+    write_pickle,
+)
+from .models import Person, PlanningConfig, Project
+
+LOGGER = logging.getLogger(__name__)
+
+# Bump when parsing or validation changes what the same input files produce.
+INPUT_CACHE_VERSION = 1
+CACHE_DIRNAME = ".cache"
+CACHE_FILENAME = "parsed_inputs.pkl"
+
+
+@dataclass
+class ParsedInputs:
+    """Validated run inputs: projects in input order, active people, configuration and skill catalogue."""
+
+    projects: List[Project]
+    people: List[Person]
+    config: PlanningConfig
+    skill_catalog: Tuple[str, ...]
+
+
+def inputs_key(projects_path: Path, people_path: Path, config_path: Path, skills_path: Path) -> str:
+    """Digest of the input file contents, the cache version and the model field layout."""
+    digest = hashlib.sha256()
+    schema = [(model.__name__, [field.name for field in fields(model)]) for model in (Project, Person, PlanningConfig)]
+    digest.update(repr((INPUT_CACHE_VERSION, schema)).encode("utf-8"))
+    for path in (projects_path, people_path, config_path, skills_path):
+        content = Path(path).read_bytes() if Path(path).exists() else b""
+        # Length-prefix each file so content cannot shift between them.
+        digest.update(len(content).to_bytes(8, "little"))
+        digest.update(content)
+    return digest.hexdigest()
+
+
+def parse_inputs(projects_path: Path, people_path: Path, config_path: Path, skills_path: Path) -> ParsedInputs:
+    return ParsedInputs(
+        projects=projects_from_rows(read_project_rows(projects_path)),
+        people=people_from_rows(read_people_rows(people_path)),
+        skill_catalog=load_skills(skills_path),
+        config=load_config(config_path),
+    )
+
+
+class InputCache:
+    """Parsed inputs of the last run, stored under the portfolio directory.
+
+    The cache file holds one entry keyed by ``inputs_key``; any edit to an
+    input file, a version bump or a change to the model fields gives a new
+    key, so a stale entry is never used and is replaced on the next store.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+        self.path = self.directory / CACHE_FILENAME
+
+    def load(self, key: str) -> Optional[ParsedInputs]:
+        if not self.path.exists():
+            return None
+        try:
+            entry = read_pickle(self.path)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError, ValueError) as exc:
+            LOGGER.warning("Ignoring unreadable input cache at %s: %s", self.path, exc)
+            return None
+        if not isinstance(entry, dict) or entry.get("version") != INPUT_CACHE_VERSION or entry.get("key") != key:
+            return None
+        inputs = entry.get("inputs")
+        return inputs if isinstance(inputs, ParsedInputs) else None
+
+    def store(self, key: str, inputs: ParsedInputs) -> bool:
+        """Write the entry; a portfolio directory that cannot be written just goes uncached."""
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            write_pickle(self.path, {"version": INPUT_CACHE_VERSION, "key": key, "inputs": inputs})
+        except OSError as exc:
+            LOGGER.warning("Could not write input cache at %s: %s", self.path, exc)
+            return False
+        return True
+
+
+def load_inputs(
+    projects_path: Path,
+    people_path: Path,
+    config_path: Path,
+    skills_path: Path,
+    cache: Optional[InputCache] = None,
+) -> Tuple[ParsedInputs, str]:
+    """Parsed inputs and the cache outcome: ``"hit"``, ``"miss"`` or ``"off"``."""
+    if cache is None:
+        return parse_inputs(projects_path, people_path, config_path, skills_path), "off"
+    key = inputs_key(projects_path, people_path, config_path, skills_path)
+    inputs = cache.load(key)
+    if inputs is not None:
+        return inputs, "hit"
+    inputs = parse_inputs(projects_path, people_path, config_path, skills_path)
+    cache.store(key, inputs)
+    return inputs, "miss"
@@ -1,16 +1,28 @@
 from __future__ import annotations
 
+import csv
 import json
-from datetime import date
+import math
+import numbers
+import os
+import pickle
+import re
+from datetime import date, datetime
 from pathlib import Path
-from typing import Dict, Iterable, Optional, Sequence
+from typing import TYPE_CHECKING, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
-import pandas as pd
-from dateutil import parser as dateparser
+from .ledger import LEDGER_BACKENDS
+from .models import DIAGNOSTICS_LEVELS, Person, PlanningConfig, Project, ROLE_CONCURRENCY_LIMITS
 
-from .models import PlanningConfig, ROLE_CONCURRENCY_LIMITS
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
 
 MONTH_FMT = "%Y-%m"
+OUTPUT_FORMATS = ("csv", "parquet", "arrow")
+OUTPUT_SUFFIXES = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}
+# Month label columns; columnar outputs pair each with a ``<name>_idx`` planning-month index.
+_MONTH_COLUMNS = frozenset({"month", "start_month", "end_month"})
 
 _PROJECT_REQUIRED_COLUMNS = {
     "id",
@@ -20,46 +32,133 @@ _PROJECT_REQUIRED_COLUMNS = {
     "effort_dev_pm",
     "parent_summary",
 }
+_EFFORT_COLUMNS = ("effort_ba_pm", "effort_planner_pm", "effort_dev_pm")
+_SKILLSET_COLUMNS = (
+    ("required_skillsets_ba", "BA"),
+    ("required_skillsets_planner", "Planner"),
+    ("required_skillsets_dev", "Dev"),
+)
 
+# Cells ``pandas.read_csv`` reads as missing by default.
+_CSV_NA_VALUES = frozenset(
+    {
+        "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+        "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+    }
+)
+_CSV_BOOL_VALUES = {"True": True, "TRUE": True, "true": True, "False": False, "FALSE": False, "false": False}
+_INT_RE = re.compile(r"\s*[+-]?\d+\s*\Z")
+_FLOAT_RE = re.compile(
+    r"\s*[+-]?(?:(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?|inf(?:inity)?|nan)\s*\Z", re.IGNORECASE
+)
 
-def _require_columns(df: pd.DataFrame, required: Iterable[str], source: str) -> None:
-    missing = [col for col in required if col not in df.columns]
+
+def _is_missing(value: object) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _parse_iso_date(text: str) -> date:
+    """ISO 8601 date; the stdlib parser covers the usual forms, dateutil the rest."""
+    try:
+        return datetime.fromisoformat(text).date()
+    except ValueError:
+        from dateutil import parser as dateparser
+
+        return dateparser.isoparse(text).date()
+
+
+def _require_columns(columns: Iterable[str], required: Iterable[str], source: str) -> None:
+    present = set(columns)
+    missing = [col for col in required if col not in present]
     if missing:
         raise ValueError(f"{source} missing required columns: {', '.join(missing)}")
 
 
-def load_projects(path: str | Path) -> pd.DataFrame:
-    df = pd.read_csv(path)
-    if df.empty:
+def _infer_column(cells: Sequence[str]) -> List[object]:
+    """Type one CSV column the way ``pandas.read_csv`` does.
+
+    A column of integers (or of booleans) without blanks stays ``int`` (or
+    ``bool``); integers with blanks, or any decimals, become ``float``;
+    anything else stays ``str``. Missing cells read as NaN.
+    """
+    present = [cell for cell in cells if cell not in _CSV_NA_VALUES]
+    if present and len(present) == len(cells):
+        if all(_INT_RE.match(cell) for cell in present):
+            return [int(cell) for cell in cells]
+        if all(cell in _CSV_BOOL_VALUES for cell in present):
+            return [_CSV_BOOL_VALUES[cell] for cell in cells]
+    if all(_INT_RE.match(cell) or _FLOAT_RE.match(cell) for cell in present):
+        return [math.nan if cell in _CSV_NA_VALUES else float(cell) for cell in cells]
+    return [math.nan if cell in _CSV_NA_VALUES else cell for cell in cells]
+
+
+def read_project_rows(path: str | Path) -> List[Dict[str, object]]:
+    """Validated ``projects.csv`` rows as plain dicts, typed as ``load_projects`` types its columns."""
+    with Path(path).open(newline="", encoding="utf-8-sig") as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        records = [record for record in reader if record]
+    if not header or not records:
         raise ValueError("projects file is empty")
-    _require_columns(df, _PROJECT_REQUIRED_COLUMNS, "projects.csv")
-    for col in ["effort_ba_pm", "effort_planner_pm", "effort_dev_pm"]:
-        try:
-            df[col] = pd.to_numeric(df[col])
-        except ValueError as exc:
-            raise ValueError(f"invalid numeric value in column '{col}'") from exc
-        if (df[col] < 0).any():
+    for line_no, record in enumerate(records, start=2):
+        if len(record) > len(header):
+            raise ValueError(f"projects.csv line {line_no}: expected {len(header)} fields, saw {len(record)}")
+    _require_columns(header, _PROJECT_REQUIRED_COLUMNS, "projects.csv")
+    columns: Dict[str, List[object]] = {}
+    for idx, name in enumerate(header):
+        columns[name] = _infer_column([record[idx] if idx < len(record) else "" for record in records])
+    for col in _EFFORT_COLUMNS:
+        if any(isinstance(value, str) for value in columns[col]):
+            raise ValueError(f"invalid numeric value in column '{col}'")
+        if any(value < 0 for value in columns[col]):  # type: ignore[operator]
             raise ValueError(f"column '{col}' contains negative values")
-    df["priority"] = df.get("priority")
-    skillset_columns = [
-        ("required_skillsets_ba", "BA"),
-        ("required_skillsets_planner", "Planner"),
-        ("required_skillsets_dev", "Dev"),
-    ]
-    for column_name, _ in skillset_columns:
-        if column_name not in df.columns:
-            df[column_name] = ""
-        df[column_name] = df[column_name].map(
-            lambda value, field=column_name: _parse_skillset_field(value, field)
+    columns.setdefault("priority", [None] * len(records))
+    for column_name, _ in _SKILLSET_COLUMNS:
+        values = columns.get(column_name, [""] * len(records))
+        columns[column_name] = [_parse_skillset_field(value, column_name) for value in values]
+    columns["input_row"] = list(range(1, len(records) + 1))
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+
+def load_projects(path: str | Path) -> pd.DataFrame:
+    import pandas as pd
+
+    return pd.DataFrame(read_project_rows(path))
+
+
+def projects_from_rows(rows: Iterable[Mapping[str, object]]) -> List[Project]:
+    """Projects in input order from ``read_project_rows`` rows or DataFrame records."""
+    projects: List[Project] = []
+    for row in rows:
+        priority_value = row.get("priority")
+        if _is_missing(priority_value):
+            priority_value = None
+        required_skillsets = {
+            "BA": tuple(row.get("required_skillsets_ba", ()) or ()),
+            "Planner": tuple(row.get("required_skillsets_planner", ()) or ()),
+            "Dev": tuple(row.get("required_skillsets_dev", ()) or ()),
+        }
+        project = Project(
+            id=str(row["id"]),
+            name=str(row["name"]),
+            effort_ba_pm=float(row["effort_ba_pm"]),  # type: ignore[arg-type]
+            effort_planner_pm=float(row["effort_planner_pm"]),  # type: ignore[arg-type]
+            effort_dev_pm=float(row["effort_dev_pm"]),  # type: ignore[arg-type]
+            parent_summary="" if _is_missing(row["parent_summary"]) else str(row["parent_summary"]),
+            priority=str(priority_value) if priority_value is not None else None,
+            input_row=int(row["input_row"]),  # type: ignore[arg-type]
+            required_skillsets=required_skillsets,
         )
-    df["input_row"] = df.index + 1
-    return df
+        projects.append(project)
+    projects.sort(key=lambda p: p.input_row)
+    return projects
 
 
 def _parse_bool(value: object) -> bool:
     if isinstance(value, bool):
         return value
-    if value is None or (isinstance(value, float) and pd.isna(value)):
+    if _is_missing(value):
         raise ValueError("active column contains missing values")
     if isinstance(value, (int, float)):
         return bool(value)
@@ -73,18 +172,18 @@ def _parse_bool(value: object) -> bool:
 
 
 def _parse_optional_date(value: object, field_name: str) -> Optional[date]:
-    if value is None or (isinstance(value, float) and pd.isna(value)):
+    if _is_missing(value):
         return None
     if isinstance(value, str) and value.strip() == "":
         return None
     try:
-        return dateparser.isoparse(str(value)).date()
+        return _parse_iso_date(str(value))
     except (ValueError, TypeError) as exc:
         raise ValueError(f"invalid date in '{field_name}': {value}") from exc
 
 
 def _parse_skillset_field(value: object, field_name: str) -> Tuple[str, ...]:
-    if value is None or (isinstance(value, float) and pd.isna(value)):
+    if _is_missing(value):
         return ()
     if isinstance(value, str):
         stripped = value.strip()
@@ -104,7 +203,8 @@ def _parse_skillset_field(value: object, field_name: str) -> Tuple[str, ...]:
     raise ValueError(f"unsupported value for '{field_name}': {value!r}")
 
 
-def load_people(path: str | Path) -> pd.DataFrame:
+def read_people_rows(path: str | Path) -> List[Dict[str, object]]:
+    """Validated ``people.json`` entries as plain dicts, one per person (inactive included)."""
     data = json.loads(Path(path).read_text())
     if not isinstance(data, list):
         raise ValueError("people file must be a JSON array")
@@ -146,7 +246,57 @@ def load_people(path: str | Path) -> pd.DataFrame:
         )
     if not rows:
         raise ValueError("people file is empty")
-    return pd.DataFrame(rows)
+    return rows
+
+
+def load_people(path: str | Path) -> pd.DataFrame:
+    import pandas as pd
+
+    return pd.DataFrame(read_people_rows(path))
+
+
+def people_from_rows(rows: Iterable[Mapping[str, object]]) -> List[Person]:
+    """Active people from ``read_people_rows`` rows or DataFrame records."""
+    people: List[Person] = []
+    for row in rows:
+        start_date = row["start_date"] if isinstance(row["start_date"], date) else None
+        end_date = row["end_date"] if isinstance(row["end_date"], date) else None
+        if not row["active"]:
+            continue
+        roles = tuple(row["roles"]) if isinstance(row["roles"], (list, tuple)) else (str(row["roles"]),)
+        skillsets = tuple(row["skillsets"]) if isinstance(row["skillsets"], (list, tuple)) else ()
+        preferred = (
+            tuple(row["preferred_parent_summaries"])  # type: ignore[arg-type]
+            if isinstance(row["preferred_parent_summaries"], (list, tuple))
+            else ()
+        )
+        person = Person(
+            name=str(row["person"]),
+            roles=tuple(str(role) for role in roles),
+            active=bool(row["active"]),
+            start_date=start_date,
+            end_date=end_date,
+            skillsets=tuple(str(skill) for skill in skillsets),
+            preferred_parent_summaries=tuple(str(pref) for pref in preferred),
+            notes="" if _is_missing(row["notes"]) else str(row["notes"]),
+        )
+        people.append(person)
+    return people
+
+
+def load_skills(path: str | Path) -> Tuple[str, ...]:
+    """Skill ids listed in an optional ``skills.csv``; empty when the file is absent."""
+    path = Path(path)
+    if not path.exists():
+        return ()
+    with path.open(newline="") as handle:
+        reader = csv.DictReader(handle)
+        if reader.fieldnames is None:
+            return ()
+        if "skill_id" not in reader.fieldnames:
+            raise ValueError("skills.csv missing required columns: skill_id")
+        skill_ids = (str(row.get("skill_id") or "").strip() for row in reader)
+        return tuple(skill_id for skill_id in skill_ids if skill_id)
 
 
 def _validate_ktlo(ktlo: dict) -> dict:
@@ -162,9 +312,13 @@ def _validate_ktlo(ktlo: dict) -> dict:
 
 
 def load_config(path: str | Path) -> PlanningConfig:
-    data = json.loads(Path(path).read_text())
+    return parse_config(json.loads(Path(path).read_text()))
+
+
+def parse_config(data: Dict[str, object]) -> PlanningConfig:
+    """Validate a decoded ``config.json`` mapping into a PlanningConfig."""
     try:
-        planning_start = dateparser.isoparse(data["planning_start"]).date()
+        planning_start = _parse_iso_date(data["planning_start"])
     except (KeyError, ValueError, TypeError) as exc:
         raise ValueError("planning_start must be a valid ISO date string") from exc
     planning_end_raw = data.get("planning_end")
@@ -173,7 +327,7 @@ def load_config(path: str | Path) -> PlanningConfig:
         planning_end = None
     else:
         try:
-            planning_end = dateparser.isoparse(planning_end_raw).date()
+            planning_end = _parse_iso_date(planning_end_raw)
         except (ValueError, TypeError) as exc:
             raise ValueError("planning_end must be null or an ISO date string") from exc
         if planning_end < planning_start:
@@ -244,6 +398,14 @@ def load_config(path: str | Path) -> PlanningConfig:
     if allocation_mode not in ("strict", "aggressive"):
         raise ValueError("allocation_mode must be either 'strict' or 'aggressive'")
 
+    ledger_backend = data.get("ledger_backend", "dict")
+    if ledger_backend not in LEDGER_BACKENDS:
+        raise ValueError(f"ledger_backend must be one of: {', '.join(LEDGER_BACKENDS)}")
+
+    diagnostics = data.get("diagnostics", "summary")
+    if diagnostics not in DIAGNOSTICS_LEVELS:
+        raise ValueError(f"diagnostics must be one of: {', '.join(DIAGNOSTICS_LEVELS)}")
+
     return PlanningConfig(
         planning_start=planning_start,
         planning_end=planning_end,
@@ -258,6 +420,8 @@ def load_config(path: str | Path) -> PlanningConfig:
         high_priority_threshold=high_priority_threshold,
         overbooking_tolerance_pct=overbooking_tolerance_pct,
         allocation_mode=allocation_mode,
+        ledger_backend=ledger_backend,
+        diagnostics=diagnostics,
     )
 
 
@@ -267,6 +431,140 @@ def ensure_directory(path: str | Path) -> Path:
     return target
 
 
+def read_pickle(path: Path) -> object:
+    with path.open("rb") as handle:
+        return pickle.load(handle)
+
+
+def write_pickle(path: Path, value: object) -> None:
+    """Pickle ``value`` to a temporary file and rename it over ``path``, so readers never see half a file."""
+    tmp_path = path.with_suffix(".tmp")
+    with tmp_path.open("wb") as handle:
+        pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_path.replace(path)
+
+
 def write_csv(df: pd.DataFrame, path: str | Path) -> None:
     Path(path).parent.mkdir(parents=True, exist_ok=True)
     df.to_csv(path, index=False)
+
+
+def write_rows(rows: Iterable[Mapping[str, object]], columns: Sequence[str], path: str | Path) -> None:
+    """Write dict rows as ``write_csv`` would write their DataFrame, without building one."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with Path(path).open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle, lineterminator=os.linesep)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(["" if _is_missing(value) else value for value in (row.get(col) for col in columns)])
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+    except ImportError as exc:
+        raise ImportError("parquet and arrow outputs need the optional pyarrow package (pip install pyarrow)") from exc
+    return pa
+
+
+def check_output_format(output_format: str) -> None:
+    """Fail before planning if ``output_format`` is unknown or its writer is not installed."""
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"output format must be one of: {', '.join(OUTPUT_FORMATS)}")
+    if output_format != "csv":
+        _import_pyarrow()
+
+
+def _column_array(pa, values: Sequence[object]):
+    """Typed Arrow array: int64, float64 or bool when every present value is one, else dictionary strings."""
+    present = [value for value in values if not _is_missing(value)]
+    cells = [None if _is_missing(value) else value for value in values]
+    if present and all(isinstance(value, bool) for value in present):
+        return pa.array(cells, type=pa.bool_())
+    if present and all(isinstance(value, numbers.Integral) and not isinstance(value, bool) for value in present):
+        return pa.array([None if cell is None else int(cell) for cell in cells], type=pa.int64())
+    if present and all(isinstance(value, numbers.Real) and not isinstance(value, bool) for value in present):
+        return pa.array([None if cell is None else float(cell) for cell in cells], type=pa.float64())
+    return pa.array([None if cell is None else str(cell) for cell in cells], type=pa.string()).dictionary_encode()
+
+
+def plan_table(
+    rows: Iterable[Mapping[str, object]], columns: Sequence[str], month_keys: Sequence[str] = ()
+) -> pa.Table:
+    """Output rows as an Arrow table with dictionary-encoded text and typed numeric columns.
+
+    Each month label column is followed by ``<name>_idx``, its position in
+    ``month_keys``; the labels themselves are kept in the schema metadata.
+    """
+    pa = _import_pyarrow()
+    values: Dict[str, List[object]] = {col: [] for col in columns}
+    for row in rows:
+        for col in columns:
+            values[col].append(row.get(col))
+    month_index = {label: idx for idx, label in enumerate(month_keys)}
+    names: List[str] = []
+    arrays = []
+    for col in columns:
+        names.append(col)
+        arrays.append(_column_array(pa, values[col]))
+        if col in _MONTH_COLUMNS and month_index:
+            names.append(f"{col}_idx")
+            arrays.append(pa.array([month_index.get(label) for label in values[col]], type=pa.int32()))
+    metadata = {"month_keys": json.dumps(list(month_keys))}
+    return pa.Table.from_arrays(arrays, names=names, metadata=metadata)
+
+
+def write_table(
+    rows: Iterable[Mapping[str, object]],
+    columns: Sequence[str],
+    path: str | Path,
+    output_format: str = "csv",
+    month_keys: Sequence[str] = (),
+) -> None:
+    """Write output rows as CSV (streamed), Parquet or an Arrow IPC file."""
+    if output_format == "csv":
+        write_rows(rows, columns, path)
+        return
+    check_output_format(output_format)
+    table = plan_table(rows, columns, month_keys)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    if output_format == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, str(path))
+    else:
+        import pyarrow as pa
+
+        with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def read_table(path: str | Path, columns: Optional[Sequence[str]] = None) -> pa.Table:
+    """Memory-map a ``.parquet`` or ``.arrow`` output; text columns stay dictionary-encoded."""
+    path = Path(path)
+    pa = _import_pyarrow()
+    if path.suffix == OUTPUT_SUFFIXES["arrow"]:
+        with pa.memory_map(str(path), "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+        return table.select(list(columns)) if columns is not None else table
+    if path.suffix == OUTPUT_SUFFIXES["parquet"]:
+        import pyarrow.parquet as pq
+
+        return pq.read_table(str(path), columns=list(columns) if columns is not None else None, memory_map=True)
+    raise ValueError(f"unsupported columnar output: {path.name}")
+
+
+def table_month_keys(table: pa.Table) -> List[str]:
+    """Month labels that the ``<name>_idx`` columns of ``table`` index into."""
+    metadata = table.schema.metadata or {}
+    return json.loads(metadata.get(b"month_keys", b"[]"))
+
+
+def read_output(path: str | Path) -> pd.DataFrame:
+    """A plan output in any ``OUTPUT_FORMATS`` as a DataFrame."""
+    path = Path(path)
+    if path.suffix == OUTPUT_SUFFIXES["csv"]:
+        import pandas as pd
+
+        return pd.read_csv(path)
+    return read_table(path).to_pandas()
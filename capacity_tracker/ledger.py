@@ -0,0 +1,410 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+EPSILON = 1e-6
+
+LEDGER_BACKENDS = ("dict", "numpy")
+
+
+@dataclass
+class MonthlyState:
+    ktlo_pct: float
+    capacity_limit: float
+    project_alloc_pct: float = 0.0
+    allocations: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+    def remaining_capacity(self) -> float:
+        return self.capacity_limit - self.project_alloc_pct
+
+    def assign(self, project_id: str, role: str, share: float, *, allow_overallocation: bool = False) -> None:
+        if share <= 0:
+            return
+        remaining = self.remaining_capacity()
+        if share > remaining + EPSILON and not allow_overallocation:
+            raise ValueError("allocation exceeds remaining capacity")
+        role_allocations = self.allocations.setdefault(project_id, {})
+        role_allocations[role] = role_allocations.get(role, 0.0) + share
+        self.project_alloc_pct += share
+
+    def remove(self, project_id: str, role: str, share: float) -> None:
+        if share <= 0:
+            return
+        role_allocations = self.allocations.get(project_id, {})
+        current = role_allocations.get(role, 0.0)
+        new_value = current - share
+        if new_value <= EPSILON:
+            role_allocations.pop(role, None)
+            if not role_allocations:
+                self.allocations.pop(project_id, None)
+        else:
+            role_allocations[role] = new_value
+        self.project_alloc_pct = max(0.0, self.project_alloc_pct - share)
+
+    def restore(
+        self, project_id: str, role: str, role_value: Optional[float], project_alloc_pct: float
+    ) -> None:
+        """Reset one project/role share and the cell total to previously recorded values."""
+        _restore_role_share(self.allocations, project_id, role, role_value)
+        self.project_alloc_pct = project_alloc_pct
+
+    @property
+    def total_pct(self) -> float:
+        return self.ktlo_pct + self.project_alloc_pct
+
+
+def _restore_role_share(
+    allocations: Dict[str, Dict[str, float]], project_id: str, role: str, role_value: Optional[float]
+) -> None:
+    if role_value is None:
+        role_allocations = allocations.get(project_id)
+        if role_allocations is not None:
+            role_allocations.pop(role, None)
+            if not role_allocations:
+                allocations.pop(project_id, None)
+    else:
+        allocations.setdefault(project_id, {})[role] = role_value
+
+
+class _LedgerBase:
+    """Backend-independent ledger bookkeeping.
+
+    Keeps a per-role, per-month total of unallocated project capacity and a
+    per-role, per-month roster ordered by load in step with every
+    ``assign``/``remove``, so the planner can reject a placement window without
+    touching individual person-months and pick the least-loaded people without
+    sorting. Changes are journaled so speculative allocations can be undone
+    exactly with ``rollback``.
+    """
+
+    month_count: int
+
+    def _init_indexes(self) -> None:
+        self.free_by_role: Dict[str, List[float]] = {}
+        self.load_by_role_month: Dict[Tuple[str, int], List[Tuple[float, str]]] = {}
+        self._person_roles: Dict[str, Tuple[str, ...]] = {}
+        self._undo_log: List[Tuple[str, int, str, str, Optional[float], float]] = []
+        self._scope_marks: List[int] = []
+
+    def _register_person(self, name: str, roles: Sequence[str], months: Sequence[int]) -> None:
+        self._person_roles[name] = tuple(roles)
+        for role in roles:
+            self.free_by_role.setdefault(role, [0.0] * self.month_count)
+        for idx in months:
+            state = self.cell(name, idx)
+            self._shift_free(name, idx, max(0.0, state.remaining_capacity()))
+            for role in roles:
+                insort(self.load_by_role_month.setdefault((role, idx), []), (state.total_pct, name))
+
+    def _unregister_person(self, name: str) -> None:
+        if name not in self._person_roles:
+            return
+        for idx in list(self[name]):
+            state = self.cell(name, idx)
+            self._shift_free(name, idx, -max(0.0, state.remaining_capacity()))
+            for role in self._person_roles[name]:
+                entries = self.load_by_role_month[(role, idx)]
+                del entries[bisect_left(entries, (state.total_pct, name))]
+        del self._person_roles[name]
+
+    def _shift_free(self, name: str, month_idx: int, delta: float) -> None:
+        if delta == 0.0:
+            return
+        for role in self._person_roles.get(name, ()):
+            self.free_by_role[role][month_idx] += delta
+
+    def _move_load(self, name: str, month_idx: int, before: float, after: float) -> None:
+        if before == after:
+            return
+        for role in self._person_roles.get(name, ()):
+            entries = self.load_by_role_month[(role, month_idx)]
+            del entries[bisect_left(entries, (before, name))]
+            insort(entries, (after, name))
+
+    def _reindex(self, name: str, month_idx: int, state, free_before: float, load_before: float) -> None:
+        self._shift_free(name, month_idx, max(0.0, state.remaining_capacity()) - free_before)
+        self._move_load(name, month_idx, load_before, state.total_pct)
+
+    def by_load(self, role: str, month_idx: int) -> Sequence[Tuple[float, str]]:
+        """``(total_pct, name)`` for everyone holding ``role`` in ``month_idx``, least loaded first.
+
+        The list is live: it is reordered in place as allocations change.
+        """
+        return self.load_by_role_month.get((role, month_idx), [])
+
+    def free_capacity(self, role: str) -> Sequence[float]:
+        """Unallocated project capacity per month summed over everyone holding ``role``."""
+        free = self.free_by_role.get(role)
+        if free is None:
+            return [0.0] * self.month_count
+        return free
+
+    def begin(self) -> None:
+        """Open a (possibly nested) speculative scope."""
+        self._scope_marks.append(len(self._undo_log))
+
+    def commit(self) -> None:
+        """Keep the changes of the innermost scope; they fold into the enclosing one."""
+        self._scope_marks.pop()
+        if not self._scope_marks:
+            self._undo_log.clear()
+
+    def rollback(self) -> None:
+        """Restore every cell touched since the matching ``begin`` to its exact prior value."""
+        mark = self._scope_marks.pop()
+        undo_log = self._undo_log
+        while len(undo_log) > mark:
+            name, month_idx, project_id, role, role_value, project_alloc_pct = undo_log.pop()
+            state = self.cell(name, month_idx)
+            free_before, load_before = max(0.0, state.remaining_capacity()), state.total_pct
+            state.restore(project_id, role, role_value, project_alloc_pct)
+            self._reindex(name, month_idx, state, free_before, load_before)
+
+    @property
+    def in_scope(self) -> bool:
+        return bool(self._scope_marks)
+
+    def _journal(self, name: str, month_idx: int, state, project_id: str, role: str) -> None:
+        if self._scope_marks:
+            role_value = state.allocations.get(project_id, {}).get(role)
+            self._undo_log.append((name, month_idx, project_id, role, role_value, state.project_alloc_pct))
+
+    def assign(
+        self,
+        name: str,
+        month_idx: int,
+        project_id: str,
+        role: str,
+        share: float,
+        *,
+        allow_overallocation: bool = False,
+    ) -> None:
+        state = self.cell(name, month_idx)
+        free_before, load_before = max(0.0, state.remaining_capacity()), state.total_pct
+        self._journal(name, month_idx, state, project_id, role)
+        state.assign(project_id, role, share, allow_overallocation=allow_overallocation)
+        self._reindex(name, month_idx, state, free_before, load_before)
+
+    def remove(self, name: str, month_idx: int, project_id: str, role: str, share: float) -> None:
+        state = self.cell(name, month_idx)
+        free_before, load_before = max(0.0, state.remaining_capacity()), state.total_pct
+        self._journal(name, month_idx, state, project_id, role)
+        state.remove(project_id, role, share)
+        self._reindex(name, month_idx, state, free_before, load_before)
+
+
+class DictLedger(_LedgerBase, Dict[str, Dict[int, MonthlyState]]):
+    """Person → month → MonthlyState ledger, one Python object per available cell."""
+
+    def __init__(self, names: Sequence[str], month_count: int) -> None:
+        super().__init__()
+        self.month_count = month_count
+        self._init_indexes()
+
+    def add_person(
+        self,
+        name: str,
+        months: Sequence[int],
+        ktlo_pct: float,
+        capacity_limit: float,
+        roles: Sequence[str] = (),
+    ) -> None:
+        self._unregister_person(name)
+        self[name] = {
+            idx: MonthlyState(ktlo_pct=ktlo_pct, capacity_limit=capacity_limit) for idx in months
+        }
+        self._register_person(name, roles, months)
+
+    def cell(self, name: str, month_idx: int) -> Optional[MonthlyState]:
+        states = self.get(name)
+        if states is None:
+            return None
+        return states.get(month_idx)
+
+
+class LedgerCell:
+    """View onto one (person, month) cell of an ArrayLedger with MonthlyState semantics."""
+
+    __slots__ = ("_ledger", "_row", "_col")
+
+    def __init__(self, ledger: "ArrayLedger", row: int, col: int) -> None:
+        self._ledger = ledger
+        self._row = row
+        self._col = col
+
+    @property
+    def ktlo_pct(self) -> float:
+        return self._ledger.ktlo_pct.item(self._row, self._col)
+
+    @property
+    def capacity_limit(self) -> float:
+        return self._ledger.capacity_limit.item(self._row, self._col)
+
+    @property
+    def project_alloc_pct(self) -> float:
+        return self._ledger.project_alloc_pct.item(self._row, self._col)
+
+    @property
+    def allocations(self) -> Dict[str, Dict[str, float]]:
+        return self._ledger.allocations.get((self._row, self._col), {})
+
+    def remaining_capacity(self) -> float:
+        # Read the arrays directly; going through the properties doubles the cost of this hot call.
+        ledger = self._ledger
+        return ledger.capacity_limit.item(self._row, self._col) - ledger.project_alloc_pct.item(self._row, self._col)
+
+    def assign(self, project_id: str, role: str, share: float, *, allow_overallocation: bool = False) -> None:
+        if share <= 0:
+            return
+        remaining = self.remaining_capacity()
+        if share > remaining + EPSILON and not allow_overallocation:
+            raise ValueError("allocation exceeds remaining capacity")
+        ledger = self._ledger
+        cell_allocations = ledger.allocations.setdefault((self._row, self._col), {})
+        role_allocations = cell_allocations.setdefault(project_id, {})
+        role_allocations[role] = role_allocations.get(role, 0.0) + share
+        ledger.project_alloc_pct[self._row, self._col] = self.project_alloc_pct + share
+
+    def remove(self, project_id: str, role: str, share: float) -> None:
+        if share <= 0:
+            return
+        ledger = self._ledger
+        key = (self._row, self._col)
+        cell_allocations = ledger.allocations.get(key, {})
+        role_allocations = cell_allocations.get(project_id, {})
+        current = role_allocations.get(role, 0.0)
+        new_value = current - share
+        if new_value <= EPSILON:
+            role_allocations.pop(role, None)
+            if not role_allocations:
+                cell_allocations.pop(project_id, None)
+                if not cell_allocations:
+                    ledger.allocations.pop(key, None)
+        else:
+            role_allocations[role] = new_value
+        ledger.project_alloc_pct[self._row, self._col] = max(0.0, self.project_alloc_pct - share)
+
+    def restore(
+        self, project_id: str, role: str, role_value: Optional[float], project_alloc_pct: float
+    ) -> None:
+        ledger = self._ledger
+        key = (self._row, self._col)
+        cell_allocations = ledger.allocations.setdefault(key, {})
+        _restore_role_share(cell_allocations, project_id, role, role_value)
+        if not cell_allocations:
+            ledger.allocations.pop(key, None)
+        ledger.project_alloc_pct[self._row, self._col] = project_alloc_pct
+
+    @property
+    def total_pct(self) -> float:
+        ledger = self._ledger
+        return ledger.ktlo_pct.item(self._row, self._col) + ledger.project_alloc_pct.item(self._row, self._col)
+
+
+class _ArrayLedgerRow(Mapping):
+    """Month index → LedgerCell mapping for one person of an ArrayLedger."""
+
+    def __init__(self, ledger: "ArrayLedger", row: int) -> None:
+        self._ledger = ledger
+        self._row = row
+
+    def __getitem__(self, month_idx: int) -> LedgerCell:
+        if not 0 <= month_idx < self._ledger.month_count or not self._ledger.available.item(self._row, month_idx):
+            raise KeyError(month_idx)
+        return LedgerCell(self._ledger, self._row, month_idx)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._ledger.months_for_row(self._row))
+
+    def __len__(self) -> int:
+        return len(self._ledger.months_for_row(self._row))
+
+
+class ArrayLedger(_LedgerBase, Mapping):
+    """Dense person×month ledger backed by NumPy float arrays.
+
+    ``capacity_limit``, ``ktlo_pct`` and ``project_alloc_pct`` are stored as
+    (person_idx, month_idx) arrays; project/role allocations are kept sparsely
+    per touched cell. Reading the ledger through the mapping interface yields
+    LedgerCell views that behave like MonthlyState.
+    """
+
+    def __init__(self, names: Sequence[str], month_count: int) -> None:
+        import numpy as np
+
+        self.month_count = month_count
+        self._row_by_name: Dict[str, int] = {}
+        for name in names:
+            self._row_by_name.setdefault(name, len(self._row_by_name))
+        shape = (len(self._row_by_name), month_count)
+        self.capacity_limit = np.zeros(shape)
+        self.ktlo_pct = np.zeros(shape)
+        self.project_alloc_pct = np.zeros(shape)
+        self.available = np.zeros(shape, dtype=bool)
+        self.allocations: Dict[Tuple[int, int], Dict[str, Dict[str, float]]] = {}
+        self._names: List[str] = []
+        self._months_by_row: Dict[int, List[int]] = {}
+        self._init_indexes()
+
+    def add_person(
+        self,
+        name: str,
+        months: Sequence[int],
+        ktlo_pct: float,
+        capacity_limit: float,
+        roles: Sequence[str] = (),
+    ) -> None:
+        row = self._row_by_name.get(name)
+        if row is None:
+            raise KeyError(f"person '{name}' not registered with ledger")
+        self._unregister_person(name)
+        if row not in self._months_by_row:
+            self._names.append(name)
+        self.available[row, :] = False
+        self.ktlo_pct[row, :] = 0.0
+        self.capacity_limit[row, :] = 0.0
+        self.project_alloc_pct[row, :] = 0.0
+        for key in [key for key in self.allocations if key[0] == row]:
+            del self.allocations[key]
+        month_list = list(months)
+        self.available[row, month_list] = True
+        self.ktlo_pct[row, month_list] = ktlo_pct
+        self.capacity_limit[row, month_list] = capacity_limit
+        self._months_by_row[row] = month_list
+        self._register_person(name, roles, month_list)
+
+    def months_for_row(self, row: int) -> List[int]:
+        return self._months_by_row.get(row, [])
+
+    def cell(self, name: str, month_idx: int) -> Optional[LedgerCell]:
+        row = self._row_by_name.get(name)
+        if row is None or not self.available.item(row, month_idx):
+            return None
+        return LedgerCell(self, row, month_idx)
+
+    def __getitem__(self, name: str) -> _ArrayLedgerRow:
+        row = self._row_by_name.get(name)
+        if row is None or row not in self._months_by_row:
+            raise KeyError(name)
+        return _ArrayLedgerRow(self, row)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+CapacityLedger = Union[DictLedger, ArrayLedger]
+
+
+def create_ledger(backend: str, names: Sequence[str], month_count: int) -> CapacityLedger:
+    """Instantiate the person×month ledger for the configured backend."""
+    if backend == "dict":
+        return DictLedger(names, month_count)
+    if backend == "numpy":
+        return ArrayLedger(names, month_count)
+    raise ValueError(f"unsupported ledger backend '{backend}'")
@@ -7,11 +7,13 @@ from dataclasses import replace
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
-import pandas as pd
-
 from . import engine
 from .engine import UnschedulableProjectError
-from .io_utils import ensure_directory, load_config, load_people, load_projects, write_csv
+from .input_cache import CACHE_DIRNAME, InputCache, load_inputs
+from .io_utils import OUTPUT_FORMATS, OUTPUT_SUFFIXES, check_output_format, ensure_directory, write_table
+from .ledger import LEDGER_BACKENDS
+from .models import DIAGNOSTICS_LEVELS
+from .replan import DEFAULT_CHECKPOINT_EVERY, ReplanCheckpoints
 
 
 def _parse_args() -> argparse.Namespace:
@@ -45,6 +47,39 @@ def _parse_args() -> argparse.Namespace:
         action="store_true",
         help="Plan and print summary without writing output CSV files",
     )
+    parser.add_argument(
+        "--ledger-backend",
+        choices=LEDGER_BACKENDS,
+        help="Override config.ledger_backend (person×month capacity storage for the greedy engine; "
+        "numpy uses less memory but plans slower than dict)",
+    )
+    parser.add_argument(
+        "--diagnostics",
+        choices=DIAGNOSTICS_LEVELS,
+        help="Override config.diagnostics (how much candidate detail to keep for unallocated projects)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse greedy planner checkpoints in <outdir>/.replan and re-plan from the first changed project",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=DEFAULT_CHECKPOINT_EVERY,
+        help=f"Projects between incremental checkpoints (default: {DEFAULT_CHECKPOINT_EVERY})",
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=OUTPUT_FORMATS,
+        default="csv",
+        help="File format of project_timeline and resource_capacity (parquet and arrow need pyarrow; default: csv)",
+    )
+    parser.add_argument(
+        "--no-input-cache",
+        action="store_true",
+        help=f"Parse every input file instead of reusing the parsed-input cache in <project-dir>/{CACHE_DIRNAME}",
+    )
     return parser.parse_args()
 
 
@@ -93,17 +128,17 @@ def _configure_logging(level_name: str) -> None:
     logging.basicConfig(level=level, format="%(levelname)s %(message)s")
 
 
-def _print_dry_run_summary(projects: pd.DataFrame, skipped: List[Dict[str, object]]) -> None:
-    if projects.empty:
+def _print_dry_run_summary(projects: List[Dict[str, object]], skipped: List[Dict[str, object]]) -> None:
+    if not projects:
         print("No projects scheduled.")
     else:
         print("Scheduled projects:")
-        for row in projects.itertuples(index=False):
+        for row in projects:
             arrow = "→"
-            months_label = "month" if row.duration_months == 1 else "months"
+            months_label = "month" if row["duration_months"] == 1 else "months"
             print(
-                f"- {row.id} {row.name}: {row.start_month} {arrow} {row.end_month} "
-                f"({row.duration_months} {months_label})"
+                f"- {row['id']} {row['name']}: {row['start_month']} {arrow} {row['end_month']} "
+                f"({row['duration_months']} {months_label})"
             )
     if skipped:
         print("\nSkipped projects:")
@@ -113,6 +148,13 @@ def _print_dry_run_summary(projects: pd.DataFrame, skipped: List[Dict[str, objec
         print("\nSkipped projects: none")
 
 
+def _print_run_stats(stats: Dict[str, object]) -> None:
+    if not stats:
+        return
+    parts = ", ".join(f"{key}={value}" for key, value in stats.items())
+    print(f"Run statistics: {parts}")
+
+
 def _format_available(detail: Dict[str, object]) -> Optional[str]:
     available = detail.get("available") if isinstance(detail, dict) else None
     if not available:
@@ -268,33 +310,75 @@ def main() -> None:
     except ValueError as exc:
         print(str(exc), file=sys.stderr)
         sys.exit(2)
-
-    projects_df = load_projects(projects_path)
-    people_df = load_people(people_path)
-    cfg = load_config(config_path)
+    if not args.dry_run:
+        try:
+            check_output_format(args.output_format)
+        except ImportError as exc:
+            print(str(exc), file=sys.stderr)
+            sys.exit(2)
+
+    cache = None
+    if not args.no_input_cache:
+        # Without --project-dir the cache sits next to the projects file.
+        portfolio_dir = Path(args.project_dir) if args.project_dir else Path(projects_path).parent
+        cache = InputCache(portfolio_dir / CACHE_DIRNAME)
+    inputs, cache_status = load_inputs(
+        projects_path, people_path, config_path, Path(projects_path).parent / "skills.csv", cache
+    )
+    if cache is not None:
+        print(f"Input cache: {cache_status} ({cache.path})")
+    projects = inputs.projects
+    people = inputs.people
+    skill_catalog = inputs.skill_catalog
+    cfg = inputs.config
     if args.seed is not None:
         cfg = replace(cfg, random_seed=args.seed)
+    if args.ledger_backend is not None:
+        cfg = replace(cfg, ledger_backend=args.ledger_backend)
+    if args.diagnostics is not None:
+        cfg = replace(cfg, diagnostics=args.diagnostics)
     _configure_logging(cfg.logging_level)
+    checkpoints = None
+    if args.incremental:
+        try:
+            checkpoints = ReplanCheckpoints(Path(outdir) / ".replan", every=args.checkpoint_every)
+        except ValueError as exc:
+            print(str(exc), file=sys.stderr)
+            sys.exit(2)
     try:
-        project_timeline_df, resource_capacity_df, hiring_analysis = engine.plan(
-            projects_df, people_df, cfg, strict=args.strict
+        result = engine.plan_records(
+            projects,
+            people,
+            cfg,
+            strict=args.strict,
+            checkpoints=checkpoints,
+            skill_catalog=skill_catalog,
         )
     except UnschedulableProjectError as exc:
         print(str(exc), file=sys.stderr)
         sys.exit(1)
 
-    skipped = resource_capacity_df.attrs.get("skipped_projects", [])
+    skipped = result.skipped_projects
+    run_stats = result.run_stats or {}
+    hiring_analysis = result.hiring_analysis
 
     if args.dry_run:
-        _print_dry_run_summary(project_timeline_df, skipped)
+        _print_dry_run_summary(result.timeline_rows, skipped)
+        _print_run_stats(run_stats)
         return
 
     outdir_path = ensure_directory(outdir)
-    timeline_path = Path(outdir_path) / "project_timeline.csv"
-    capacity_path = Path(outdir_path) / "resource_capacity.csv"
-    write_csv(project_timeline_df, timeline_path)
-    write_csv(resource_capacity_df, capacity_path)
+    suffix = OUTPUT_SUFFIXES[args.output_format]
+    timeline_path = Path(outdir_path) / f"project_timeline{suffix}"
+    capacity_path = Path(outdir_path) / f"resource_capacity{suffix}"
+    write_table(
+        result.timeline_rows, result.timeline_columns, timeline_path, args.output_format, result.month_keys
+    )
+    write_table(
+        result.capacity_rows, result.capacity_columns, capacity_path, args.output_format, result.month_keys
+    )
     _write_skipped_markdown(skipped, outdir_path)
+    _print_run_stats(run_stats)
     print(f"Wrote {timeline_path}")
     print(f"Wrote {capacity_path}")
     print(f"Wrote {outdir_path / 'unallocated_projects.md'}")
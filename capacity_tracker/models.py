@@ -2,13 +2,18 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import date
+from functools import cached_property
 from typing import Dict, Iterable, Optional, Sequence, Tuple
 
+from .curves import CurveTable
+
 
 Role = str
 
 
 ROLE_CONCURRENCY_LIMITS: Dict[Role, float] = {"BA": 1.0, "Planner": 1.0, "Dev": 2.0}
+DIAGNOSTICS_LEVELS: Tuple[str, ...] = ("off", "summary", "full")
+SOLVER_DECOMPOSITION_MODES: Tuple[str, ...] = ("off", "components", "parent_summary")
 
 
 @dataclass(frozen=True)
@@ -86,12 +91,22 @@ class PlanningConfig:
     allocation_mode: str = "strict"  # "strict" or "aggressive"
     solver: str = "greedy"  # "greedy" or "ortools"
     solver_time_limit_seconds: int = 300  # Time limit for OR-Tools solver
+    solver_greedy_hints: bool = False  # Seed OR-Tools with the greedy plan as solution hints
+    solver_concurrent_passes: bool = False  # Run OR-Tools strict and relaxed passes side by side
+    solver_decomposition: str = "off"  # "off", "components" or "parent_summary" independent OR-Tools sub-models
+    ledger_backend: str = "dict"  # "dict" or "numpy" person×month capacity ledger
+    diagnostics: str = "summary"  # "off", "summary" or "full" allocation failure detail
 
     def get_curve_spec(self, key: str) -> object:
         if key not in self.curves:
             raise KeyError(f"curve '{key}' missing in configuration")
         return self.curves[key]
 
+    @cached_property
+    def curve_table(self) -> CurveTable:
+        """Resampled curves for this configuration, built on first use."""
+        return CurveTable(self.curves)
+
     def ktlo_for_role(self, role: Role) -> float:
         return self.ktlo_pct_by_role.get(role, 0.0)
 
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import engine
+from .io_utils import MONTH_FMT, load_config, load_people, load_projects, write_csv
+from .main import _configure_logging, _resolve_io_paths
+from .models import PlanningConfig
+
+DISTRIBUTIONS = ("triangular", "lognormal")
+EFFORT_COLUMNS = (("BA", "effort_ba_pm"), ("Planner", "effort_planner_pm"), ("Dev", "effort_dev_pm"))
+SPREAD_COLUMN = "effort_spread_pct"
+DEFAULT_SPREAD = 0.25
+PERCENTILES = (10, 50, 90)
+
+_worker_inputs: Dict[str, object] = {}
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Sample effort uncertainty and report percentile delivery months and role demand."
+    )
+    parser.add_argument(
+        "--project-dir",
+        help="Project directory containing input/ and output/ subfolders",
+    )
+    parser.add_argument("--projects", help="Path to projects CSV input (overrides project-dir default)")
+    parser.add_argument("--people", help="Path to people CSV input (overrides project-dir default)")
+    parser.add_argument("--config", help="Path to configuration JSON file (overrides project-dir default)")
+    parser.add_argument(
+        "--outdir",
+        default=None,
+        help="Output directory for generated CSV files (default: <project-dir>/output or ./out)",
+    )
+    parser.add_argument("--samples", type=int, default=200, help="Number of effort samples to plan (default: 200)")
+    parser.add_argument(
+        "--distribution",
+        choices=DISTRIBUTIONS,
+        default="triangular",
+        help="Effort multiplier distribution (default: triangular)",
+    )
+    parser.add_argument(
+        "--spread",
+        type=float,
+        default=DEFAULT_SPREAD,
+        help=f"Relative effort spread for projects without {SPREAD_COLUMN} columns (default: {DEFAULT_SPREAD})",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Sampling seed (default: 0)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: one per CPU; 1 plans every sample in-process)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the percentile summary without writing output CSV files",
+    )
+    return parser.parse_args()
+
+
+def effort_spreads(projects_df: pd.DataFrame, default_spread: float) -> np.ndarray:
+    """Projects × roles relative spread.
+
+    ``effort_spread_pct_<role>`` overrides ``effort_spread_pct``, which overrides
+    ``default_spread``; blanks fall through to the next level.
+    """
+    spreads = np.full((len(projects_df), len(EFFORT_COLUMNS)), float(default_spread))
+    general = projects_df.get(SPREAD_COLUMN)
+    for role_idx, (role, _) in enumerate(EFFORT_COLUMNS):
+        for column in (general, projects_df.get(f"{SPREAD_COLUMN}_{role.lower()}")):
+            if column is None:
+                continue
+            try:
+                values = pd.to_numeric(column).to_numpy(dtype=float)
+            except ValueError as exc:
+                raise ValueError(f"invalid numeric value in column '{column.name}'") from exc
+            present = ~np.isnan(values)
+            spreads[present, role_idx] = values[present]
+    if (spreads < 0).any():
+        raise ValueError("effort spreads must be non-negative")
+    return spreads
+
+
+def sample_multipliers(
+    spreads: np.ndarray, samples: int, distribution: str, rng: np.random.Generator
+) -> np.ndarray:
+    """Samples × projects × roles effort multipliers centred on the point estimate.
+
+    ``triangular`` has mode 1 and bounds ``1 ± spread`` (floored at zero);
+    ``lognormal`` has median 1 and log-space standard deviation ``spread``.
+    """
+    shape = (samples,) + spreads.shape
+    if distribution == "triangular":
+        lower = np.minimum(spreads, 1.0)
+        upper = spreads
+        u = rng.random(shape)
+        # Inverse CDF of a triangle with mode 1, which stays defined for zero spread.
+        split = lower / np.maximum(lower + upper, np.finfo(float).tiny)
+        below = 1.0 - lower + np.sqrt(u * (lower + upper) * lower)
+        above = 1.0 + upper - np.sqrt((1.0 - u) * (lower + upper) * upper)
+        return np.where(u < split, below, above)
+    if distribution == "lognormal":
+        return np.exp(spreads * rng.standard_normal(shape))
+    raise ValueError(f"distribution must be one of: {', '.join(DISTRIBUTIONS)}")
+
+
+def _init_worker(
+    projects_df: pd.DataFrame, people_df: pd.DataFrame, cfg: PlanningConfig, month_keys: List[str]
+) -> None:
+    _worker_inputs["projects"] = projects_df
+    _worker_inputs["people"] = people_df
+    _worker_inputs["cfg"] = cfg
+    _worker_inputs["month_index"] = {label: idx for idx, label in enumerate(month_keys)}
+    # Curve peaks depend only on the configuration, so every sample in this worker shares them.
+    _worker_inputs["peak_shares"] = engine.PeakShareTable(cfg)
+
+
+def _plan_sample(multipliers: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Plan one sample; return per-project start/end month indices (-1 if skipped) and roles × months load."""
+    base_df: pd.DataFrame = _worker_inputs["projects"]  # type: ignore[assignment]
+    month_index: Dict[str, int] = _worker_inputs["month_index"]  # type: ignore[assignment]
+    sample_df = base_df.copy()
+    for role_idx, (_, column) in enumerate(EFFORT_COLUMNS):
+        sample_df[column] = base_df[column].to_numpy() * multipliers[:, role_idx]
+    timeline_df, capacity_df, _ = engine.plan(
+        sample_df,
+        _worker_inputs["people"],
+        _worker_inputs["cfg"],
+        peak_shares=_worker_inputs["peak_shares"],
+    )
+    row_by_id = {project_id: row for row, project_id in enumerate(base_df["id"].astype(str))}
+    starts = np.full(len(base_df), -1, dtype=np.int32)
+    ends = np.full(len(base_df), -1, dtype=np.int32)
+    for project_id, start_month, end_month in zip(
+        timeline_df["id"], timeline_df["start_month"], timeline_df["end_month"]
+    ):
+        row = row_by_id[str(project_id)]
+        starts[row] = month_index[start_month]
+        ends[row] = month_index[end_month]
+    # pandas deep-copies attrs on every column access; the skip details are not needed here.
+    capacity_df.attrs = {}
+    role_index = {role: role_idx for role_idx, (role, _) in enumerate(EFFORT_COLUMNS)}
+    load = np.zeros((len(EFFORT_COLUMNS), len(month_index)))
+    for role, month_label, share in zip(
+        capacity_df["role"], capacity_df["month"], capacity_df["project_alloc_pct"]
+    ):
+        role_idx = role_index.get(role)
+        if role_idx is not None:
+            load[role_idx, month_index[month_label]] += share
+    return starts, ends, load
+
+
+def run_samples(
+    projects_df: pd.DataFrame,
+    people_df: pd.DataFrame,
+    cfg: PlanningConfig,
+    multipliers: np.ndarray,
+    month_keys: List[str],
+    workers: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Plan every sample; stack to samples × projects starts/ends and samples × roles × months load."""
+    initargs = (projects_df, people_df, cfg, month_keys)
+    if workers == 1 or len(multipliers) <= 1:
+        _init_worker(*initargs)
+        results = [_plan_sample(sample) for sample in multipliers]
+    else:
+        workers = workers or os.cpu_count() or 1
+        chunksize = max(1, len(multipliers) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+            results = list(pool.map(_plan_sample, multipliers, chunksize=chunksize))
+    starts = np.stack([result[0] for result in results])
+    ends = np.stack([result[1] for result in results])
+    load = np.stack([result[2] for result in results])
+    return starts, ends, load
+
+
+def _month_percentiles(indices: np.ndarray, month_keys: Sequence[str]) -> List[List[str]]:
+    """Per-project percentile month labels; skipped samples count as later than any month."""
+    horizon = len(month_keys)
+    ranked = np.where(indices < 0, horizon, indices)
+    labels: List[List[str]] = []
+    for pct in PERCENTILES:
+        values = np.quantile(ranked, pct / 100.0, axis=0, method="inverted_cdf")
+        labels.append([month_keys[value] if value < horizon else "unscheduled" for value in values])
+    return labels
+
+
+def summarize_projects(
+    projects_df: pd.DataFrame, starts: np.ndarray, ends: np.ndarray, month_keys: Sequence[str]
+) -> pd.DataFrame:
+    start_labels = _month_percentiles(starts, month_keys)
+    end_labels = _month_percentiles(ends, month_keys)
+    summary = pd.DataFrame(
+        {
+            "id": projects_df["id"].astype(str),
+            "name": projects_df["name"].astype(str),
+            "scheduled_pct": np.round((starts >= 0).mean(axis=0) * 100.0, 1),
+        }
+    )
+    for pct, labels in zip(PERCENTILES, start_labels):
+        summary[f"start_p{pct}"] = labels
+    for pct, labels in zip(PERCENTILES, end_labels):
+        summary[f"end_p{pct}"] = labels
+    return summary
+
+
+def summarize_demand(load: np.ndarray, month_keys: Sequence[str]) -> pd.DataFrame:
+    """Fan chart rows: percentile bands of allocated person-months per role and month."""
+    bands = np.percentile(load, PERCENTILES, axis=0)
+    rows = []
+    for role_idx, (role, _) in enumerate(EFFORT_COLUMNS):
+        for month_idx, month_label in enumerate(month_keys):
+            row: Dict[str, object] = {"role": role, "month": month_label}
+            for band_idx, pct in enumerate(PERCENTILES):
+                row[f"p{pct}_pm"] = round(float(bands[band_idx, role_idx, month_idx]), 4)
+            rows.append(row)
+    return pd.DataFrame(rows, columns=["role", "month"] + [f"p{pct}_pm" for pct in PERCENTILES])
+
+
+def main() -> None:
+    args = _parse_args()
+    if args.samples <= 0:
+        print("--samples must be positive", file=sys.stderr)
+        sys.exit(2)
+    try:
+        projects_path, people_path, config_path, outdir = _resolve_io_paths(args)
+    except ValueError as exc:
+        print(str(exc), file=sys.stderr)
+        sys.exit(2)
+
+    projects_df = load_projects(projects_path)
+    people_df = load_people(people_path)
+    # Failure details are never reported per sample, so skip building them.
+    cfg = replace(load_config(config_path), diagnostics="off")
+    _configure_logging(cfg.logging_level)
+    try:
+        spreads = effort_spreads(projects_df, args.spread)
+    except ValueError as exc:
+        print(str(exc), file=sys.stderr)
+        sys.exit(2)
+    multipliers = sample_multipliers(spreads, args.samples, args.distribution, np.random.default_rng(args.seed))
+    month_keys = [month.strftime(MONTH_FMT) for month in engine._build_month_sequence(cfg)]
+    starts, ends, load = run_samples(projects_df, people_df, cfg, multipliers, month_keys, workers=args.workers)
+
+    projects_summary = summarize_projects(projects_df, starts, ends, month_keys)
+    demand_summary = summarize_demand(load, month_keys)
+    print(f"Planned {args.samples} {args.distribution} effort samples")
+    print(projects_summary.to_string(index=False))
+    if args.dry_run:
+        return
+    projects_path_out = Path(outdir) / "montecarlo_projects.csv"
+    demand_path_out = Path(outdir) / "montecarlo_demand.csv"
+    write_csv(projects_summary, projects_path_out)
+    write_csv(demand_summary, demand_path_out)
+    print(f"Wrote {projects_path_out}")
+    print(f"Wrote {demand_path_out}")
+
+
+if __name__ == "__main__":
+    main()
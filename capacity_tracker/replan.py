@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import pickle
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from .io_utils import read_pickle, write_pickle
+
+LOGGER = logging.getLogger(__name__)
+
+# Bump when the planner state captured in a checkpoint changes shape.
+CHECKPOINT_VERSION = 1
+MANIFEST_FILENAME = "manifest.pkl"
+DEFAULT_CHECKPOINT_EVERY = 25
+
+
+def fingerprint(value: object) -> str:
+    """Stable digest of a planning input (dataclasses, dicts and tuples of plain values)."""
+    return hashlib.sha256(repr(value).encode("utf-8")).hexdigest()
+
+
+class ReplanCheckpoints:
+    """Greedy planner state saved at project boundaries for incremental re-plans.
+
+    ``plan()`` visits projects in a deterministic order, so the ledger after
+    the first *k* projects depends only on those projects and the run inputs
+    (configuration, roster, horizon). A re-plan restores the latest snapshot
+    that precedes the first project whose fingerprint changed and continues
+    from there; the result is identical to planning from scratch.
+
+    Each snapshot is its own file next to a manifest of the run and project
+    fingerprints, so resuming reads only the snapshot it needs.
+    """
+
+    def __init__(self, directory: str | Path, every: int = DEFAULT_CHECKPOINT_EVERY) -> None:
+        if every <= 0:
+            raise ValueError("checkpoint interval must be positive")
+        self.directory = Path(directory)
+        self.every = every
+        self._run_key: Optional[str] = None
+        self._project_keys: List[str] = []
+        self._boundaries: Set[int] = set()
+        self._resumed_at = 0
+
+    def _snapshot_path(self, boundary: int) -> Path:
+        return self.directory / f"checkpoint-{boundary:05d}.pkl"
+
+    def _load_manifest(self) -> Optional[Dict[str, object]]:
+        path = self.directory / MANIFEST_FILENAME
+        if not path.exists():
+            return None
+        try:
+            manifest = read_pickle(path)
+        except (OSError, pickle.UnpicklingError, EOFError) as exc:
+            LOGGER.warning("Ignoring unreadable re-plan manifest at %s: %s", path, exc)
+            return None
+        if not isinstance(manifest, dict) or manifest.get("version") != CHECKPOINT_VERSION:
+            return None
+        return manifest
+
+    def resume(self, run_key: str, project_keys: Sequence[str]) -> Optional[Tuple[int, Dict[str, object]]]:
+        """Return ``(boundary, state)`` to continue from, or ``None`` to plan from the start."""
+        self._run_key = run_key
+        self._project_keys = list(project_keys)
+        self._boundaries = set()
+        self._resumed_at = 0
+        manifest = self._load_manifest()
+        # Snapshots are about to be overwritten; until save() rewrites the manifest a
+        # crashed run must not leave it pointing at them.
+        (self.directory / MANIFEST_FILENAME).unlink(missing_ok=True)
+        if manifest is None or manifest.get("run_key") != run_key:
+            return None
+        unchanged = 0
+        for old, new in zip(manifest.get("project_keys", []), self._project_keys):
+            if old != new:
+                break
+            unchanged += 1
+        usable = sorted(
+            (boundary for boundary in manifest.get("boundaries", []) if 0 < boundary <= unchanged),
+            reverse=True,
+        )
+        for boundary in usable:
+            try:
+                state = read_pickle(self._snapshot_path(boundary))
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as exc:
+                LOGGER.warning("Ignoring unreadable re-plan checkpoint %s: %s", boundary, exc)
+                continue
+            self._boundaries = {key for key in manifest["boundaries"] if key <= boundary}
+            self._resumed_at = boundary
+            return boundary, state
+        return None
+
+    def due(self, boundary: int) -> bool:
+        """Whether a snapshot should be taken before project ``boundary`` (or at the end)."""
+        if boundary <= self._resumed_at:
+            return False
+        return boundary % self.every == 0 or boundary == len(self._project_keys)
+
+    def record(self, boundary: int, state: Dict[str, object]) -> None:
+        """Snapshot planner ``state`` as it stands after the first ``boundary`` projects."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        write_pickle(self._snapshot_path(boundary), state)
+        self._boundaries.add(boundary)
+
+    def save(self) -> None:
+        """Write the manifest for this run and drop snapshots it no longer lists."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for path in self.directory.glob("checkpoint-*.pkl"):
+            try:
+                boundary = int(path.stem.split("-", 1)[1])
+            except ValueError:
+                continue
+            if boundary not in self._boundaries:
+                path.unlink()
+        write_pickle(
+            self.directory / MANIFEST_FILENAME,
+            {
+                "version": CHECKPOINT_VERSION,
+                "run_key": self._run_key,
+                "project_keys": self._project_keys,
+                "boundaries": sorted(self._boundaries),
+            },
+        )
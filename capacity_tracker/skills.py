@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from .models import Person, Project
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Skill ids set in ``mask``, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class SkillRegistry:
+    """Skill names interned to bit positions so skill sets are ``int`` masks.
+
+    Ids follow sorted name order, so the bits of a mask read from the lowest
+    give its names already sorted. Matching is then ``required & held`` and
+    coverage is ``covered |= held & required``; names come back only when
+    results are reported.
+    """
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        self._names: Tuple[str, ...] = tuple(sorted(set(names)))
+        self._ids: Dict[str, int] = {name: idx for idx, name in enumerate(self._names)}
+
+    @classmethod
+    def from_inputs(
+        cls,
+        people: Iterable[Person],
+        projects: Iterable[Project],
+        catalog: Iterable[str] = (),
+    ) -> "SkillRegistry":
+        """Registry covering the ``skills.csv`` catalogue and every skill people hold or projects require."""
+        names = set(catalog)
+        for person in people:
+            names.update(person.skillsets)
+        for project in projects:
+            for skills in project.required_skillsets.values():
+                names.update(skills)
+        return cls(names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def skill_id(self, name: str) -> int:
+        try:
+            return self._ids[name]
+        except KeyError as exc:
+            raise KeyError(f"unknown skill '{name}'") from exc
+
+    def mask(self, names: Iterable[str]) -> int:
+        mask = 0
+        for name in names:
+            mask |= 1 << self.skill_id(name)
+        return mask
+
+    def names(self, mask: int) -> List[str]:
+        """Sorted names of the skills in ``mask``."""
+        return [self._names[skill_id] for skill_id in iter_bits(mask)]
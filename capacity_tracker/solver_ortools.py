@@ -20,21 +20,29 @@ Violations tracked:
 from __future__ import annotations
 
 import math
-from collections import defaultdict
-from dataclasses import dataclass, field
+import multiprocessing
+import os
+import queue
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import time
+from dataclasses import dataclass, field, replace
 from datetime import date
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
 
 from ortools.sat.python import cp_model
 import pandas as pd
 from dateutil.relativedelta import relativedelta
 
-from .models import PlanningConfig, Project, Person
+from .models import SOLVER_DECOMPOSITION_MODES, PlanningConfig, Project, Person
+from .availability import WEEKS_PER_MONTH, PersonAvailability, _first_week_of_month, build_availability
 from .io_utils import MONTH_FMT
+from .skills import SkillRegistry
 
 # Conversion constants
-WEEKS_PER_MONTH = 4.33  # Average weeks per month
 MAX_PLANNING_WEEKS = 104  # 24 months ≈ 104 weeks
+# Concurrent passes: time past the budget allowed for extracting and reporting a result
+CONCURRENT_GRACE_SECONDS = 30
 
 
 @dataclass
@@ -63,6 +71,50 @@ class SolverResult:
     recommendations: Dict[str, object]
 
 
+@dataclass
+class GreedySeed:
+    """Greedy engine placements, used as CP-SAT solution hints."""
+    start_months: Dict[str, int]  # project_id -> start month index
+    assigned_people: Dict[Tuple[str, str], Set[str]]  # (project_id, role) -> people
+
+
+def greedy_seed(
+    projects: List[Project],
+    people: List[Person],
+    config: PlanningConfig,
+    skill_catalog: Sequence[str] = (),
+) -> GreedySeed:
+    """Plan with the greedy engine and keep each scheduled project's start month and people."""
+    from .engine import plan_records
+
+    result = plan_records(projects, people, replace(config, solver="greedy"), skill_catalog=skill_catalog)
+    month_index = {label: idx for idx, label in enumerate(result.month_keys)}
+    start_months: Dict[str, int] = {}
+    assigned_people: Dict[Tuple[str, str], Set[str]] = {}
+    for row in result.timeline_rows:
+        project_id = str(row["id"])
+        start_months[project_id] = month_index[row["start_month"]]
+        for role, column in (("BA", "ba_persons"), ("Planner", "planner_persons"), ("Dev", "dev_persons")):
+            names = {name for name in str(row[column]).split(";") if name}
+            if names:
+                assigned_people[(project_id, role)] = names
+    return GreedySeed(start_months=start_months, assigned_people=assigned_people)
+
+
+class _SolutionTimer(cp_model.CpSolverSolutionCallback):
+    """Records when the first solution was found and its objective."""
+
+    def __init__(self):
+        super().__init__()
+        self.first_solution_seconds: Optional[float] = None
+        self.first_objective: Optional[float] = None
+
+    def on_solution_callback(self):
+        if self.first_solution_seconds is None:
+            self.first_solution_seconds = self.wall_time
+            self.first_objective = self.objective_value
+
+
 class CapacityPlannerModel:
     """OR-Tools CP-SAT model for capacity planning with weekly time periods."""
 
@@ -72,11 +124,13 @@ class CapacityPlannerModel:
         people: List[Person],
         config: PlanningConfig,
         month_starts: List[date],
+        skills: Optional[SkillRegistry] = None,
     ):
         self.projects = projects
         self.people = people
         self.config = config
         self.month_starts = month_starts
+        self.skills = skills if skills is not None else SkillRegistry.from_inputs(people, projects)
 
         # Use weekly periods instead of monthly for better granularity
         # Limit to 104 weeks (24 months) for tractability
@@ -86,12 +140,15 @@ class CapacityPlannerModel:
         # Build person metadata
         self.person_by_name = {p.name: p for p in people}
         self.person_roles = {p.name: set(p.roles) for p in people}
-        self.person_skills = {p.name: set(p.skillsets) for p in people}
+        self.person_skills = {p.name: self.skills.mask(p.skillsets) for p in people}
         self.person_availability = self._build_availability_map()
 
         # Model and variables
         self.model = cp_model.CpModel()
         self.task_vars = {}  # (project_id, role, person) -> task variables
+        # task_vars keys by project and by (person, role), in creation order
+        self.tasks_by_project: Dict[str, List[Tuple[str, str, str]]] = defaultdict(list)
+        self.tasks_by_person_role: Dict[Tuple[str, str], List[Tuple[str, str, str]]] = defaultdict(list)
         self.assignment_vars = {}  # (project_id, role, person) -> BoolVar
         self.project_start_vars = {}  # project_id -> IntVar
         self.project_end_vars = {}  # project_id -> IntVar
@@ -100,40 +157,19 @@ class CapacityPlannerModel:
         self.over_allocation_vars = {}  # (person, month) -> IntVar (excess %)
         self.skill_mismatch_vars = {}  # (project_id, role, person) -> BoolVar
 
-    def _build_availability_map(self) -> Dict[str, Set[int]]:
-        """Build map of person -> set of available week indices."""
-        availability = {}
-        for person in self.people:
-            available_weeks = set()
-
-            # Convert availability to weeks
-            planning_start = self.month_starts[0] if self.month_starts else date.today()
-
-            for week_idx in range(self.horizon):
-                # Rough approximation: week_idx / 4.33 ≈ month_idx
-                approx_month_idx = int(week_idx / self.weeks_per_month)
-
-                if approx_month_idx < len(self.month_starts):
-                    week_date = self.month_starts[approx_month_idx]
-
-                    # Check if person is available this week
-                    if person.start_date and week_date < self._first_of_month(person.start_date):
-                        continue
-                    if person.end_date and week_date > self._first_of_month(person.end_date):
-                        continue
-
-                    available_weeks.add(week_idx)
-
-            availability[person.name] = available_weeks
-        return availability
+        # Candidate pruning: role holders considered, and why the rest got no variables
+        self.candidates_considered = 0
+        self.pruned_candidates: Dict[str, int] = {"availability": 0, "skills": 0, "capacity": 0}
+        self.unstaffable_roles: Set[Tuple[str, str]] = set()  # (project_id, role) with every holder pruned
+        self.hinted_vars = 0
 
-    @staticmethod
-    def _first_of_month(d: date) -> date:
-        return date(d.year, d.month, 1)
+    def _build_availability_map(self) -> Dict[str, PersonAvailability]:
+        """Map of person -> available month and week ranges within the horizon."""
+        return build_availability(self.people, self.month_starts, self.horizon, self.weeks_per_month)
 
     def build_strict_model(self):
         """Build model with strict constraints (no violations allowed)."""
-        self._create_task_variables()
+        self._create_task_variables(strict=True)
         self._add_assignment_constraints()
         self._add_capacity_constraints(allow_violations=False)
         self._add_skill_constraints(allow_violations=False)
@@ -142,18 +178,75 @@ class CapacityPlannerModel:
 
     def build_relaxed_model(self):
         """Build model allowing violations (with penalties)."""
-        self._create_task_variables()
+        self._create_task_variables(strict=False)
         self._add_assignment_constraints()
         self._add_soft_capacity_constraints()  # Add soft capacity limits (penalized but not hard)
         # Skip skill constraints in relaxed mode - just track violations post-hoc
         self._add_precedence_constraints()
         self._set_objective_with_penalties()
 
-    def _create_task_variables(self):
-        """Create decision variables for task assignments."""
-        for project in self.projects:
-            project_efforts = project.role_efforts()
+    def _prune_reason(
+        self, person: Person, role: str, effort_pw: float, required_skills: int, strict: bool
+    ) -> Optional[str]:
+        """Why ``person`` can never take this project-role, or None if they are a candidate."""
+        available_weeks = len(self.person_availability[person.name].week_indices())
+        if available_weeks == 0:
+            return "availability"
+        if strict and required_skills and not required_skills & self.person_skills[person.name]:
+            return "skills"
+        capacity_pw = available_weeks * (1.0 - self.config.ktlo_pct_by_role.get(role, 0.0))
+        if effort_pw > capacity_pw + 1e-9:
+            return "capacity"
+        return None
+
+    def _candidates_for(
+        self, project: Project, role: str, effort_pw: float, required_skills: int, strict: bool
+    ) -> List[Person]:
+        """Role holders who could take this project-role; see ``_create_task_variables``."""
+        holders = [person for person in self.people if role in person.roles]
+        candidates = []
+        reasons = []
+        for person in holders:
+            reason = self._prune_reason(person, role, effort_pw, required_skills, strict)
+            if reason is None:
+                candidates.append(person)
+            else:
+                reasons.append(reason)
+        self.candidates_considered += len(holders)
+        if holders and not candidates:
+            if not strict:
+                # The relaxed model must still staff the role; keep everyone and let it pick.
+                return holders
+            self.unstaffable_roles.add((project.id, role))
+        for reason in reasons:
+            self.pruned_candidates[reason] += 1
+        return candidates
+
+    def role_candidates(
+        self, project: Project, strict: bool
+    ) -> Iterator[Tuple[str, float, int, List[Person]]]:
+        """``(role, effort_pw, required_skills, candidates)`` for each role the project needs."""
+        for role, effort_pm in project.role_efforts().items():
+            if effort_pm < 0.01:
+                continue
+
+            # Convert person-months to person-weeks
+            effort_pw = effort_pm * self.weeks_per_month
+            required_skills = self.skills.mask(project.skillsets_for_role(role))
+            yield role, effort_pw, required_skills, self._candidates_for(
+                project, role, effort_pw, required_skills, strict
+            )
+
+    def _create_task_variables(self, strict: bool = True):
+        """Create decision variables for task assignments.
 
+        Role holders who can never take a project-role get no variables:
+        nobody without availability in the horizon, nobody whose available
+        weeks (net of KTLO) cannot cover the effort, and, in strict mode,
+        nobody lacking every required skill (the constraint would force them
+        to 0 anyway).
+        """
+        for project in self.projects:
             # Project-level start/end time (in weeks)
             self.project_start_vars[project.id] = self.model.NewIntVar(
                 0, self.horizon - 1, f'project_start_{project.id}'
@@ -162,25 +255,13 @@ class CapacityPlannerModel:
                 0, self.horizon, f'project_end_{project.id}'
             )
 
-            for role, effort_pm in project_efforts.items():
-                if effort_pm < 0.01:
-                    continue
-
-                # Convert person-months to person-weeks
-                effort_pw = effort_pm * self.weeks_per_month
-
+            for role, effort_pw, required_skills, candidates in self.role_candidates(project, strict):
                 # Calculate minimum duration in weeks
                 # Assuming max 1.0 person (100% capacity) per week
                 min_duration_weeks = max(1, math.ceil(effort_pw))
                 max_duration_weeks = min(self.horizon, int(min_duration_weeks * 2))  # Allow up to 2x spreading
 
-                required_skills = set(project.skillsets_for_role(role))
-
-                for person in self.people:
-                    # Check if person has this role
-                    if role not in person.roles:
-                        continue
-
+                for person in candidates:
                     person_name = person.name
 
                     # Assignment boolean: Is this person assigned to this project-role?
@@ -210,7 +291,7 @@ class CapacityPlannerModel:
                         f'interval_{project.id}_{role}_{person_name}'
                     )
 
-                    self.task_vars[(project.id, role, person_name)] = {
+                    self._register_task((project.id, role, person_name), {
                         'assignment': assignment_var,
                         'start': start_var,
                         'duration': duration_var,
@@ -220,7 +301,55 @@ class CapacityPlannerModel:
                         'min_duration_weeks': min_duration_weeks,
                         'max_duration_weeks': max_duration_weeks,
                         'required_skills': required_skills,
-                    }
+                    })
+
+    def _register_task(self, key: Tuple[str, str, str], task: Dict[str, object]) -> None:
+        project_id, role, person_name = key
+        self.task_vars[key] = task
+        self.tasks_by_project[project_id].append(key)
+        self.tasks_by_person_role[(person_name, role)].append(key)
+
+    def project_tasks(self, project_id: str) -> List[Tuple[Tuple[str, str, str], Dict[str, object]]]:
+        """``(key, task)`` pairs of one project, by role then person."""
+        return [(key, self.task_vars[key]) for key in self.tasks_by_project.get(project_id, ())]
+
+    def person_role_tasks(self, person_name: str, role: str) -> List[Tuple[Tuple[str, str, str], Dict[str, object]]]:
+        """``(key, task)`` pairs of one person in one role, in project order."""
+        return [(key, self.task_vars[key]) for key in self.tasks_by_person_role.get((person_name, role), ())]
+
+    def add_greedy_hints(self, seed: GreedySeed) -> int:
+        """Hint the greedy placements: assignments, task timing and project start/end.
+
+        Each hinted task starts in the first week of the greedy start month
+        (pulled back to fit the horizon) and runs its minimum duration.
+        Returns the number of hinted variables.
+        """
+        for project in self.projects:
+            start_month = seed.start_months.get(project.id)
+            if start_month is None:
+                continue
+            start_week = min(_first_week_of_month(start_month, self.weeks_per_month), self.horizon - 1)
+            starts = []
+            ends = []
+            for (_, role, person_name), task in self.project_tasks(project.id):
+                if person_name not in seed.assigned_people.get((project.id, role), ()):
+                    self.model.AddHint(task['assignment'], 0)
+                    self.hinted_vars += 1
+                    continue
+                duration = task['min_duration_weeks']
+                task_start = max(0, min(start_week, self.horizon - duration))
+                self.model.AddHint(task['assignment'], 1)
+                self.model.AddHint(task['start'], task_start)
+                self.model.AddHint(task['duration'], duration)
+                self.model.AddHint(task['end'], task_start + duration)
+                self.hinted_vars += 4
+                starts.append(task_start)
+                ends.append(task_start + duration)
+            if starts:
+                self.model.AddHint(self.project_start_vars[project.id], min(starts))
+                self.model.AddHint(self.project_end_vars[project.id], max(ends))
+                self.hinted_vars += 2
+        return self.hinted_vars
 
     def _add_assignment_constraints(self):
         """Ensure each project-role is assigned to at least one person."""
@@ -230,16 +359,17 @@ class CapacityPlannerModel:
                     continue
 
                 # Collect all possible assignments for this project-role
-                candidates = []
-                for person_name in self.person_by_name:
-                    key = (project.id, role, person_name)
-                    if key in self.assignment_vars:
-                        candidates.append(self.assignment_vars[key])
+                candidates = [
+                    task['assignment'] for key, task in self.project_tasks(project.id) if key[1] == role
+                ]
 
                 if candidates:
                     # At least one person must be assigned
                     # (Could be multiple for pair programming, etc.)
                     self.model.Add(sum(candidates) >= 1)
+                elif (project.id, role) in self.unstaffable_roles:
+                    # Every holder was pruned, so strict mode cannot staff this role
+                    self.model.AddBoolOr([])
 
     def _add_capacity_constraints(self, allow_violations: bool):
         """Add constraints to prevent over-allocation of people."""
@@ -257,12 +387,7 @@ class CapacityPlannerModel:
                 intervals = []
                 demands = []
 
-                for project in self.projects:
-                    key = (project.id, role, person_name)
-                    if key not in self.task_vars:
-                        continue
-
-                    task = self.task_vars[key]
+                for _, task in self.person_role_tasks(person_name, role):
                     intervals.append(task['interval'])
 
                     # Demand is roughly: effort / duration (as a percentage)
@@ -288,9 +413,7 @@ class CapacityPlannerModel:
 
                     # Simple constraint: sum of assignments <= max_concurrent
                     assignment_sum = sum(
-                        self.task_vars[(p.id, role, person_name)]['assignment']
-                        for p in self.projects
-                        if (p.id, role, person_name) in self.task_vars
+                        task['assignment'] for _, task in self.person_role_tasks(person_name, role)
                     )
                     self.model.Add(assignment_sum <= max_concurrent)
 
@@ -312,12 +435,7 @@ class CapacityPlannerModel:
                 soft_limit = strict_limit * 2  # Allow some over-allocation but not extreme
 
                 # Collect all assignments for this person-role
-                assignments = []
-                for project in self.projects:
-                    key = (project.id, role, person_name)
-                    if key not in self.task_vars:
-                        continue
-                    assignments.append(self.task_vars[key]['assignment'])
+                assignments = [task['assignment'] for _, task in self.person_role_tasks(person_name, role)]
 
                 if not assignments:
                     continue
@@ -345,8 +463,7 @@ class CapacityPlannerModel:
             if not required_skills:
                 continue
 
-            person_skills = self.person_skills.get(person_name, set())
-            has_required_skills = bool(required_skills & person_skills)
+            has_required_skills = bool(required_skills & self.person_skills.get(person_name, 0))
 
             if allow_violations:
                 # Track skill mismatches
@@ -368,10 +485,7 @@ class CapacityPlannerModel:
         # For now, just ensure project start/end align with task start/end
 
         for project in self.projects:
-            project_tasks = [
-                task for key, task in self.task_vars.items()
-                if key[0] == project.id
-            ]
+            project_tasks = [task for _, task in self.project_tasks(project.id)]
 
             if not project_tasks:
                 continue
@@ -439,17 +553,36 @@ class CapacityPlannerModel:
 
         self.model.Minimize(sum(objective_terms))
 
-    def solve(self, time_limit_seconds: int = 300) -> Optional[cp_model.CpSolver]:
+    def solve(
+        self, time_limit_seconds: float = 300, num_workers: Optional[int] = None
+    ) -> Optional[cp_model.CpSolver]:
         """Solve the model and return solver if successful."""
         solver = cp_model.CpSolver()
         solver.parameters.max_time_in_seconds = time_limit_seconds
+        if num_workers is not None:
+            solver.parameters.num_workers = num_workers
         solver.parameters.log_search_progress = True  # Enable logging
 
+        pruned = sum(self.pruned_candidates.values())
+        print(
+            f"    Candidate assignments: {self.candidates_considered} before pruning, "
+            f"{self.candidates_considered - pruned} after "
+            f"(pruned {pruned}: "
+            + ", ".join(f"{reason} {count}" for reason, count in self.pruned_candidates.items())
+            + ")"
+        )
+        if self.unstaffable_roles:
+            print(f"    Project roles no candidate can take: {len(self.unstaffable_roles)}")
         print(f"    Model has {len(self.task_vars)} task variables")
         print(f"    Model has {len(self.assignment_vars)} assignment variables")
+        if self.hinted_vars:
+            print(f"    Solution hints: {self.hinted_vars} variables from the greedy plan")
+        else:
+            print(f"    Solution hints: none")
         print(f"    Solving...")
 
-        status = solver.Solve(self.model)
+        timer = _SolutionTimer()
+        status = solver.Solve(self.model, timer)
 
         status_names = {
             cp_model.OPTIMAL: "OPTIMAL",
@@ -461,6 +594,18 @@ class CapacityPlannerModel:
 
         print(f"    Solver status: {status_names.get(status, 'UNKNOWN')}")
         print(f"    Wall time: {solver.WallTime():.2f}s")
+        if timer.first_solution_seconds is not None:
+            print(
+                f"    Time to first solution: {timer.first_solution_seconds:.2f}s "
+                f"(objective {timer.first_objective:.0f})"
+            )
+        else:
+            print(f"    Time to first solution: none found")
+        if status in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
+            print(
+                f"    Final objective: {solver.ObjectiveValue():.0f} "
+                f"(best bound {solver.BestObjectiveBound():.0f})"
+            )
 
         if status in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
             print(f"    ✓ Found solution!")
@@ -511,8 +656,8 @@ class CapacityPlannerModel:
         for (project_id, role, person_name), mismatch_var in self.skill_mismatch_vars.items():
             if solver.Value(mismatch_var):
                 task = self.task_vars[(project_id, role, person_name)]
-                required_skills = list(task['required_skills'])
-                actual_skills = list(self.person_skills.get(person_name, set()))
+                required_skills = self.skills.names(task['required_skills'])
+                actual_skills = self.skills.names(self.person_skills.get(person_name, 0))
 
                 violations.append(Violation(
                     violation_type="skill_mismatch",
@@ -599,8 +744,8 @@ class CapacityPlannerModel:
             if not required_skills:
                 continue
 
-            person_skills = self.person_skills.get(person_name, set())
-            missing_skills = required_skills - person_skills
+            person_skills = self.person_skills.get(person_name, 0)
+            missing_skills = required_skills & ~person_skills
 
             if missing_skills:
                 violations.append(Violation(
@@ -608,11 +753,11 @@ class CapacityPlannerModel:
                     person=person_name,
                     project_id=proj_id,
                     role=role,
-                    severity=len(missing_skills) / max(1, len(required_skills)),
-                    required_skills=list(required_skills),
-                    actual_skills=list(person_skills),
+                    severity=missing_skills.bit_count() / max(1, required_skills.bit_count()),
+                    required_skills=self.skills.names(required_skills),
+                    actual_skills=self.skills.names(person_skills),
                     description=f"{person_name} assigned to {proj_id} ({role}) "
-                                f"but missing skills: {', '.join(sorted(missing_skills))}"
+                                f"but missing skills: {', '.join(self.skills.names(missing_skills))}"
                 ))
 
         return violations
@@ -622,20 +767,58 @@ def solve_with_ortools(
     projects_df: pd.DataFrame,
     people_df: pd.DataFrame,
     config: PlanningConfig,
+    skill_catalog: Sequence[str] = (),
+    greedy_hints: Optional[bool] = None,
+    concurrent_passes: Optional[bool] = None,
+    decomposition: Optional[str] = None,
 ) -> SolverResult:
     """
     Main entry point for OR-Tools solver with multi-pass optimization.
 
     Pass 1: Try strict constraints
     Pass 2: If failed, allow violations but track them
+
+    With ``greedy_hints`` (default: ``config.solver_greedy_hints``) the greedy
+    engine plans first and both passes start from its schedule as hints.
+    With ``concurrent_passes`` (default: ``config.solver_concurrent_passes``)
+    both passes run at once in separate processes within a single
+    ``solver_time_limit_seconds`` budget instead of one after the other.
+    With ``decomposition`` (default: ``config.solver_decomposition``) each
+    pass solves the independent sub-portfolios found by
+    ``decompose_portfolio`` as separate models and merges the results.
+    Decomposition takes precedence: with both on, the passes run one after
+    the other and only the sub-portfolios run in parallel.
     """
-    from .engine import _projects_from_df, _people_from_df, _build_month_sequence
-    from .recommendations import RecommendationEngine
+    from .engine import _projects_from_df, _people_from_df
+
+    return solve_portfolio(
+        _projects_from_df(projects_df),
+        _people_from_df(people_df),
+        config,
+        skill_catalog,
+        greedy_hints,
+        concurrent_passes,
+        decomposition,
+    )
 
-    # Parse input data
-    projects = _projects_from_df(projects_df)
-    people = _people_from_df(people_df)
+
+def solve_portfolio(
+    projects: List[Project],
+    people: List[Person],
+    config: PlanningConfig,
+    skill_catalog: Sequence[str] = (),
+    greedy_hints: Optional[bool] = None,
+    concurrent_passes: Optional[bool] = None,
+    decomposition: Optional[str] = None,
+) -> SolverResult:
+    """``solve_with_ortools`` for already-parsed projects and active people."""
+    from .engine import _build_month_sequence
+
+    decomposition = config.solver_decomposition if decomposition is None else decomposition
+    if decomposition not in SOLVER_DECOMPOSITION_MODES:
+        raise ValueError(f"solver_decomposition must be one of: {', '.join(SOLVER_DECOMPOSITION_MODES)}")
     month_starts = _build_month_sequence(config)
+    skills = SkillRegistry.from_inputs(people, projects, skill_catalog)
 
     if not projects:
         return SolverResult(
@@ -668,36 +851,37 @@ def solve_with_ortools(
     print(f"Time Limit: {config.solver_time_limit_seconds}s")
     print()
 
-    # Pass 1: Try strict constraints
-    print("PASS 1: Attempting strict constraint satisfaction...")
-    print("-" * 60)
+    seed: Optional[GreedySeed] = None
+    if config.solver_greedy_hints if greedy_hints is None else greedy_hints:
+        seed_started = time.perf_counter()
+        seed = greedy_seed(projects, people, config, skill_catalog)
+        print(
+            f"Greedy seed: {len(seed.start_months)} of {len(projects)} projects placed "
+            f"in {time.perf_counter() - seed_started:.2f}s"
+        )
+        print()
 
-    model_strict = CapacityPlannerModel(projects, people, config, month_starts)
-    model_strict.build_strict_model()
-    solver_strict = model_strict.solve(time_limit_seconds=config.solver_time_limit_seconds)
+    if decomposition != "off":
+        return _solve_decomposed(
+            projects, people, config, month_starts, skills, seed, decomposition == "parent_summary"
+        )
 
-    if solver_strict:
-        print("✓ SUCCESS: Found feasible solution with strict constraints!")
+    if config.solver_concurrent_passes if concurrent_passes is None else concurrent_passes:
+        if (os.cpu_count() or 1) > 1:
+            return _solve_passes_concurrently(projects, people, config, month_starts, skills, seed)
+        # Two passes sharing one CPU would each get half the budget's search.
+        print("Concurrent passes need more than one CPU; solving sequentially")
         print()
 
-        scheduled, unscheduled = _extract_solution(
-            solver_strict, model_strict, projects, people, month_starts
-        )
+    # Pass 1: Try strict constraints
+    print("PASS 1: Attempting strict constraint satisfaction...")
+    print("-" * 60)
 
-        return SolverResult(
-            success=True,
-            solution_type="strict",
-            scheduled_projects=scheduled,
-            unscheduled_projects=unscheduled,
-            violations=[],
-            resource_timeline=_build_resource_timeline(solver_strict, model_strict, people, month_starts),
-            recommendations={
-                "status": "All projects scheduled within constraints",
-                "hiring": [],
-                "training": [],
-                "summary": {"mode": "strict", "violations": 0}
-            },
-        )
+    result = _run_strict_pass(
+        projects, people, config, month_starts, skills, seed, config.solver_time_limit_seconds
+    )
+    if result is not None:
+        return result
 
     print("✗ FAILED: No feasible solution with strict constraints")
     print()
@@ -706,48 +890,140 @@ def solve_with_ortools(
     print("PASS 2: Attempting relaxed optimization (allowing violations)...")
     print("-" * 60)
 
-    model_relaxed = CapacityPlannerModel(projects, people, config, month_starts)
-    model_relaxed.build_relaxed_model()
-    solver_relaxed = model_relaxed.solve(time_limit_seconds=config.solver_time_limit_seconds)
+    result = _run_relaxed_pass(
+        projects, people, config, month_starts, skills, seed, config.solver_time_limit_seconds
+    )
+    if result is not None:
+        return result
 
-    if solver_relaxed:
-        print("✓ SUCCESS: Found solution with violations")
-        print()
+    print("✗ FAILED: No solution found even with relaxed constraints")
+    print()
 
-        violations = model_relaxed.extract_violations(solver_relaxed)
-        print(f"Violations detected: {len(violations)}")
-        for v in violations[:5]:  # Show first 5
-            print(f"  - {v.description}")
-        if len(violations) > 5:
-            print(f"  ... and {len(violations) - 5} more")
-        print()
+    return _failed_result(projects)
 
-        scheduled, unscheduled = _extract_solution(
-            solver_relaxed, model_relaxed, projects, people, month_starts
-        )
 
-        # Generate recommendations
-        rec_engine = RecommendationEngine(violations, scheduled, people, month_starts)
-        recommendations = rec_engine.analyze()
+def _run_strict_pass(
+    projects: List[Project],
+    people: List[Person],
+    config: PlanningConfig,
+    month_starts: List[date],
+    skills: SkillRegistry,
+    seed: Optional[GreedySeed],
+    time_limit_seconds: float,
+    num_workers: Optional[int] = None,
+    deadline: Optional[float] = None,
+) -> Optional[SolverResult]:
+    """Build and solve the strict model; None unless it finds a feasible schedule.
+
+    With a ``deadline`` (``time.time()`` value) the solve also stops there,
+    so model building counts against the same wall-clock budget.
+    """
+    model_strict = CapacityPlannerModel(projects, people, config, month_starts, skills)
+    model_strict.build_strict_model()
+    if seed is not None:
+        model_strict.add_greedy_hints(seed)
+    solver_strict = model_strict.solve(
+        time_limit_seconds=_time_left(time_limit_seconds, deadline), num_workers=num_workers
+    )
 
-        print(f"Recommendations generated:")
-        print(f"  - Hiring: {len(recommendations['hiring'])}")
-        print(f"  - Training: {len(recommendations['training'])}")
-        print()
+    if not solver_strict:
+        return None
 
-        return SolverResult(
-            success=True,
-            solution_type="relaxed",
-            scheduled_projects=scheduled,
-            unscheduled_projects=unscheduled,
-            violations=violations,
-            resource_timeline=_build_resource_timeline(solver_relaxed, model_relaxed, people, month_starts),
-            recommendations=recommendations,
-        )
+    print("✓ SUCCESS: Found feasible solution with strict constraints!")
+    print()
 
-    print("✗ FAILED: No solution found even with relaxed constraints")
+    scheduled, unscheduled = _extract_solution(
+        solver_strict, model_strict, projects, people, month_starts
+    )
+
+    return SolverResult(
+        success=True,
+        solution_type="strict",
+        scheduled_projects=scheduled,
+        unscheduled_projects=unscheduled,
+        violations=[],
+        resource_timeline=_build_resource_timeline(solver_strict, model_strict, people, month_starts),
+        recommendations=_strict_recommendations(),
+    )
+
+
+def _strict_recommendations() -> Dict[str, object]:
+    return {
+        "status": "All projects scheduled within constraints",
+        "hiring": [],
+        "training": [],
+        "summary": {"mode": "strict", "violations": 0}
+    }
+
+
+def _run_relaxed_pass(
+    projects: List[Project],
+    people: List[Person],
+    config: PlanningConfig,
+    month_starts: List[date],
+    skills: SkillRegistry,
+    seed: Optional[GreedySeed],
+    time_limit_seconds: float,
+    num_workers: Optional[int] = None,
+    deadline: Optional[float] = None,
+) -> Optional[SolverResult]:
+    """Build and solve the relaxed model; None if it finds no schedule at all; see ``_run_strict_pass``."""
+    from .recommendations import RecommendationEngine
+
+    model_relaxed = CapacityPlannerModel(projects, people, config, month_starts, skills)
+    model_relaxed.build_relaxed_model()
+    if seed is not None:
+        model_relaxed.add_greedy_hints(seed)
+    solver_relaxed = model_relaxed.solve(
+        time_limit_seconds=_time_left(time_limit_seconds, deadline), num_workers=num_workers
+    )
+
+    if not solver_relaxed:
+        return None
+
+    print("✓ SUCCESS: Found solution with violations")
+    print()
+
+    violations = model_relaxed.extract_violations(solver_relaxed)
+    print(f"Violations detected: {len(violations)}")
+    for v in violations[:5]:  # Show first 5
+        print(f"  - {v.description}")
+    if len(violations) > 5:
+        print(f"  ... and {len(violations) - 5} more")
+    print()
+
+    scheduled, unscheduled = _extract_solution(
+        solver_relaxed, model_relaxed, projects, people, month_starts
+    )
+
+    # Generate recommendations
+    rec_engine = RecommendationEngine(violations, scheduled, people, month_starts)
+    recommendations = rec_engine.analyze()
+
+    print(f"Recommendations generated:")
+    print(f"  - Hiring: {len(recommendations['hiring'])}")
+    print(f"  - Training: {len(recommendations['training'])}")
     print()
 
+    return SolverResult(
+        success=True,
+        solution_type="relaxed",
+        scheduled_projects=scheduled,
+        unscheduled_projects=unscheduled,
+        violations=violations,
+        resource_timeline=_build_resource_timeline(solver_relaxed, model_relaxed, people, month_starts),
+        recommendations=recommendations,
+    )
+
+
+def _time_left(time_limit_seconds: float, deadline: Optional[float]) -> float:
+    """``time_limit_seconds``, cut to what is left before ``deadline`` (at least a second)."""
+    if deadline is None:
+        return time_limit_seconds
+    return min(time_limit_seconds, max(1.0, deadline - time.time()))
+
+
+def _failed_result(projects: List[Project]) -> SolverResult:
     return SolverResult(
         success=False,
         solution_type="failed",
@@ -763,6 +1039,425 @@ def solve_with_ortools(
     )
 
 
+_PASS_RUNNERS = {"strict": _run_strict_pass, "relaxed": _run_relaxed_pass}
+
+
+def _pass_worker(
+    kind: str,
+    pass_args: Tuple[object, ...],
+    deadline: float,
+    num_workers: int,
+    results: "multiprocessing.Queue",
+) -> None:
+    """Process entry point: run one pass within what is left of the shared budget and report it."""
+    config = pass_args[2]
+    results.put((
+        kind,
+        _PASS_RUNNERS[kind](*pass_args, config.solver_time_limit_seconds, num_workers, deadline),
+    ))
+
+
+def _solve_passes_concurrently(
+    projects: List[Project],
+    people: List[Person],
+    config: PlanningConfig,
+    month_starts: List[date],
+    skills: SkillRegistry,
+    seed: Optional[GreedySeed],
+) -> SolverResult:
+    """Solve the strict and relaxed models in two processes under one wall-clock budget.
+
+    A feasible strict result wins as soon as it arrives and the relaxed pass
+    is cancelled; otherwise the relaxed result is used once the strict pass
+    has given up. Each pass gets half of the CPUs.
+    """
+    started = time.time()
+    deadline = started + config.solver_time_limit_seconds
+    num_workers = max(1, (os.cpu_count() or 2) // 2)
+    context = multiprocessing.get_context()
+    results = context.Queue()
+    pass_args = (projects, people, config, month_starts, skills, seed)
+    processes = {
+        kind: context.Process(
+            target=_pass_worker, args=(kind, pass_args, deadline, num_workers, results), daemon=True
+        )
+        for kind in _PASS_RUNNERS
+    }
+
+    print("PASS 1 + 2: Solving strict and relaxed models concurrently...")
+    print("-" * 60)
+    for process in processes.values():
+        process.start()
+
+    outcomes: Dict[str, Optional[SolverResult]] = {}
+    try:
+        while outcomes.get("strict") is None and len(outcomes) < len(processes):
+            remaining = deadline + CONCURRENT_GRACE_SECONDS - time.time()
+            if remaining <= 0:
+                break
+            try:
+                kind, result = results.get(timeout=min(remaining, 1.0))
+            except queue.Empty:
+                exited = [
+                    kind for kind, process in processes.items()
+                    if kind not in outcomes and not process.is_alive()
+                ]
+                # A pass may have reported just before exiting; collect that first.
+                while True:
+                    try:
+                        kind, result = results.get_nowait()
+                    except queue.Empty:
+                        break
+                    outcomes[kind] = result
+                # A pass that exited without reporting found nothing.
+                for kind in exited:
+                    outcomes.setdefault(kind, None)
+                continue
+            outcomes[kind] = result
+    finally:
+        for kind, process in processes.items():
+            if process.is_alive():
+                process.terminate()
+                if kind not in outcomes:
+                    print(f"    Cancelled the {kind} pass")
+            process.join()
+
+    elapsed = time.time() - started
+    strict_result = outcomes.get("strict")
+    if strict_result is not None:
+        print(f"✓ Decided by the strict pass after {elapsed:.2f}s")
+        print()
+        return strict_result
+    relaxed_result = outcomes.get("relaxed")
+    if relaxed_result is not None:
+        print(f"✓ Decided by the relaxed pass after {elapsed:.2f}s (no feasible strict solution)")
+        print()
+        return relaxed_result
+
+    print("✗ FAILED: No solution found by either pass")
+    print()
+
+    return _failed_result(projects)
+
+
+@dataclass
+class PortfolioComponent:
+    """Projects and the people who can staff them, solved as a model of their own."""
+    projects: List[Project]
+    people: List[Person]
+    label: str = ""  # parent_summary of a fallback group
+    # (project_id, role) with role holders elsewhere in the portfolio but no candidate here
+    unstaffable_roles: Set[Tuple[str, str]] = field(default_factory=set)
+
+
+def decompose_portfolio(
+    projects: List[Project],
+    people: List[Person],
+    config: PlanningConfig,
+    month_starts: List[date],
+    skills: SkillRegistry,
+    *,
+    strict: bool,
+    split_by_parent_summary: bool = False,
+) -> List[PortfolioComponent]:
+    """Connected components of the project–person candidate graph, in project order.
+
+    A person is linked to a project when ``CapacityPlannerModel`` would give
+    them variables for one of its roles in this pass: they hold the role,
+    are available within the horizon, have the capacity and, in strict mode,
+    a required skill. Every constraint and objective term is per project or
+    per person, so components share nothing and solving them apart gives the
+    same optimum. People who are nobody's candidate join the first component,
+    which keeps their rows in the resource timeline.
+
+    With ``split_by_parent_summary`` a portfolio that stays connected is
+    split by ``parent_summary`` instead. Each person then joins one group
+    (their first preferred parent summary among the groups, else the group
+    where they are a candidate for most project roles), so this split is a
+    heuristic: projects lose the candidates that went to other groups.
+    """
+    probe = CapacityPlannerModel(projects, people, config, month_starts, skills)
+    candidates_by_role: Dict[Tuple[str, str], List[str]] = {}
+    candidate_projects: Dict[str, List[str]] = defaultdict(list)  # person -> project ids, one per role
+    for project in projects:
+        for role, _, _, candidates in probe.role_candidates(project, strict):
+            candidates_by_role[(project.id, role)] = [person.name for person in candidates]
+            for person in candidates:
+                candidate_projects[person.name].append(project.id)
+
+    roots = {project.id: project.id for project in projects}
+
+    def find(project_id: str) -> str:
+        while roots[project_id] != project_id:
+            roots[project_id] = roots[roots[project_id]]
+            project_id = roots[project_id]
+        return project_id
+
+    for project_ids in candidate_projects.values():
+        for project_id in project_ids[1:]:
+            roots[find(project_id)] = find(project_ids[0])
+
+    by_root: Dict[str, PortfolioComponent] = {}
+    for project in projects:
+        by_root.setdefault(find(project.id), PortfolioComponent([], [])).projects.append(project)
+    components = list(by_root.values())
+    for person in people:
+        project_ids = candidate_projects.get(person.name)
+        (by_root[find(project_ids[0])] if project_ids else components[0]).people.append(person)
+
+    if split_by_parent_summary and len(components) == 1:
+        groups = _split_by_parent_summary(projects, people, candidate_projects)
+        missing = sum(len(_roles_without_candidates(group, candidates_by_role)) for group in groups)
+        if missing:
+            print(
+                f"    parent_summary split would leave {missing} project roles without a candidate; "
+                f"keeping one model"
+            )
+        else:
+            components = groups
+
+    for component in components:
+        component.unstaffable_roles = _roles_without_candidates(component, candidates_by_role)
+        component.unstaffable_roles.update(
+            (project.id, role) for project in component.projects for role in project.role_efforts()
+            if (project.id, role) in probe.unstaffable_roles
+        )
+    return components
+
+
+def _roles_without_candidates(
+    component: PortfolioComponent, candidates_by_role: Dict[Tuple[str, str], List[str]]
+) -> Set[Tuple[str, str]]:
+    """Project roles with candidates in the portfolio but none among the component's people."""
+    names = {person.name for person in component.people}
+    return {
+        (project.id, role)
+        for project in component.projects
+        for role in project.role_efforts()
+        if candidates_by_role.get((project.id, role)) and not names.intersection(candidates_by_role[(project.id, role)])
+    }
+
+
+def _split_by_parent_summary(
+    projects: List[Project],
+    people: List[Person],
+    candidate_projects: Dict[str, List[str]],
+) -> List[PortfolioComponent]:
+    groups: Dict[str, PortfolioComponent] = {}
+    for project in projects:
+        groups.setdefault(
+            project.parent_summary, PortfolioComponent([], [], label=project.parent_summary)
+        ).projects.append(project)
+    group_of = {project.id: project.parent_summary for project in projects}
+    demand: Dict[str, Counter] = defaultdict(Counter)  # group -> role -> person-months
+    for project in projects:
+        demand[project.parent_summary].update(project.role_efforts())
+    placed: Dict[str, Counter] = defaultdict(Counter)  # group -> role -> holders so far
+    for person in people:
+        group = next((name for name in person.preferred_parent_summaries if name in groups), None)
+        if group is None:
+            counts = Counter(group_of[project_id] for project_id in candidate_projects.get(person.name, ()))
+            # In the relaxed pass every holder is a candidate everywhere, so balance
+            # by the demand each group still has per holder of the person's roles.
+            group = max(
+                [name for name in groups if counts[name]] or list(groups),
+                key=lambda name: max(
+                    (demand[name][role] / (1 + placed[name][role]) for role in person.roles), default=0.0
+                ),
+            )
+        groups[group].people.append(person)
+        placed[group].update(person.roles)
+    return list(groups.values())
+
+
+def _solve_decomposed(
+    projects: List[Project],
+    people: List[Person],
+    config: PlanningConfig,
+    month_starts: List[date],
+    skills: SkillRegistry,
+    seed: Optional[GreedySeed],
+    split_by_parent_summary: bool,
+) -> SolverResult:
+    """Both passes over independent sub-portfolios, merged into one result."""
+    # Pass 1: Try strict constraints
+    components = decompose_portfolio(
+        projects, people, config, month_starts, skills,
+        strict=True, split_by_parent_summary=split_by_parent_summary,
+    )
+    print("PASS 1: Attempting strict constraint satisfaction (decomposed)...")
+    print("-" * 60)
+    _print_components(components)
+
+    unstaffable = sum(len(component.unstaffable_roles) for component in components)
+    if unstaffable:
+        print(f"✗ FAILED: {unstaffable} project roles have no candidate in their component")
+        print()
+    else:
+        results = _solve_components("strict", components, config, month_starts, skills, seed)
+        if all(result is not None for result in results):
+            print("✓ SUCCESS: Found feasible solution with strict constraints in every component!")
+            print()
+            return _merge_results("strict", components, results, projects, people, month_starts)
+        print("✗ FAILED: No feasible solution with strict constraints")
+        print()
+
+    # Pass 2: Try relaxed constraints
+    components = decompose_portfolio(
+        projects, people, config, month_starts, skills,
+        strict=False, split_by_parent_summary=split_by_parent_summary,
+    )
+    print("PASS 2: Attempting relaxed optimization (decomposed, allowing violations)...")
+    print("-" * 60)
+    _print_components(components)
+
+    if any(component.unstaffable_roles for component in components):
+        # A role with holders outside its component would go unstaffed without a violation.
+        components = [PortfolioComponent(list(projects), list(people))]
+    results = _solve_components("relaxed", components, config, month_starts, skills, seed)
+    if any(result is not None for result in results):
+        return _merge_results("relaxed", components, results, projects, people, month_starts)
+
+    print("✗ FAILED: No solution found even with relaxed constraints")
+    print()
+
+    return _failed_result(projects)
+
+
+def _print_components(components: List[PortfolioComponent]) -> None:
+    sizes = sorted((len(component.projects) for component in components), reverse=True)
+    print(f"    Sub-portfolios: {len(components)} (largest {sizes[0]} projects)")
+    unstaffable = sum(len(component.unstaffable_roles) for component in components)
+    if unstaffable:
+        print(f"    Project roles without a candidate in their sub-portfolio: {unstaffable}")
+
+
+def _solve_components(
+    kind: str,
+    components: List[PortfolioComponent],
+    config: PlanningConfig,
+    month_starts: List[date],
+    skills: SkillRegistry,
+    seed: Optional[GreedySeed],
+) -> List[Optional[SolverResult]]:
+    """Solve one pass over every component, in a process pool when there are CPUs to spare.
+
+    The time limit is shared out by project count, scaled by the number of
+    components solving at once, and every component also stops at the
+    pass deadline, one time limit after the pass started. After the first
+    failure, which already makes the pass fail, a strict pass cancels the
+    components that have not started; those running go on until they
+    finish or reach the deadline.
+    """
+    cpus = os.cpu_count() or 1
+    workers = min(len(components), cpus)
+    budget = config.solver_time_limit_seconds
+    deadline = time.time() + budget
+    total_projects = sum(len(component.projects) for component in components)
+    jobs = [
+        (
+            kind,
+            index,
+            len(components),
+            component,
+            config,
+            month_starts,
+            skills,
+            seed,
+            min(budget, max(1.0, budget * workers * len(component.projects) / total_projects)),
+            max(1, cpus // workers) if workers > 1 else None,
+            deadline,
+        )
+        for index, component in enumerate(components)
+    ]
+    results: List[Optional[SolverResult]] = [None] * len(jobs)
+    if workers == 1:
+        for index, job in enumerate(jobs):
+            results[index] = _solve_component(job)
+            if kind == "strict" and results[index] is None:
+                break
+        return results
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_solve_component, job): index for index, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+            if kind == "strict" and results[futures[future]] is None:
+                for pending in futures:
+                    pending.cancel()
+                break
+    return results
+
+
+def _solve_component(job: Tuple[object, ...]) -> Optional[SolverResult]:
+    kind, index, count, component, config, month_starts, skills, seed, time_limit, num_workers, deadline = job
+    label = f" [{component.label}]" if component.label else ""
+    print(
+        f"  Sub-portfolio {index + 1}/{count}{label}: "
+        f"{len(component.projects)} projects, {len(component.people)} people, "
+        f"up to {_time_left(time_limit, deadline):.0f}s"
+    )
+    return _PASS_RUNNERS[kind](
+        component.projects, component.people, config, month_starts, skills, seed, time_limit, num_workers, deadline
+    )
+
+
+def _merge_results(
+    solution_type: str,
+    components: List[PortfolioComponent],
+    results: List[Optional[SolverResult]],
+    projects: List[Project],
+    people: List[Person],
+    month_starts: List[date],
+) -> SolverResult:
+    """One ``SolverResult`` in the order the monolithic model reports: projects, then people."""
+    from .recommendations import RecommendationEngine
+
+    scheduled: List[Dict] = []
+    unscheduled: List[Dict] = []
+    violations: List[Violation] = []
+    timelines = []
+    for component, result in zip(components, results):
+        if result is None:
+            unscheduled.extend(_failed_result(component.projects).unscheduled_projects)
+            continue
+        scheduled.extend(result.scheduled_projects)
+        unscheduled.extend(result.unscheduled_projects)
+        violations.extend(result.violations)
+        if not result.resource_timeline.empty:
+            timelines.append(result.resource_timeline)
+
+    project_order = {project.id: idx for idx, project in enumerate(projects)}
+    scheduled.sort(key=lambda row: project_order[row["id"]])
+    unscheduled.sort(key=lambda row: project_order[row["id"]])
+    resource_timeline = pd.DataFrame()
+    if timelines:
+        person_order = {person.name: idx for idx, person in enumerate(people)}
+        # Rows of one person come from one component, so a stable sort restores roster order.
+        resource_timeline = pd.concat(timelines, ignore_index=True).sort_values(
+            "person", key=lambda names: names.map(person_order), kind="stable", ignore_index=True
+        )
+
+    if solution_type == "strict":
+        recommendations = _strict_recommendations()
+    else:
+        print(f"Violations detected across sub-portfolios: {len(violations)}")
+        recommendations = RecommendationEngine(violations, scheduled, people, month_starts).analyze()
+        print(f"Recommendations generated:")
+        print(f"  - Hiring: {len(recommendations['hiring'])}")
+        print(f"  - Training: {len(recommendations['training'])}")
+        print()
+
+    return SolverResult(
+        success=True,
+        solution_type=solution_type,
+        scheduled_projects=scheduled,
+        unscheduled_projects=unscheduled,
+        violations=violations,
+        resource_timeline=resource_timeline,
+        recommendations=recommendations,
+    )
+
+
 def _extract_solution(
     solver: cp_model.CpSolver,
     model: CapacityPlannerModel,
@@ -779,12 +1474,10 @@ def _extract_solution(
         project_assigned = False
         assigned_people = defaultdict(set)
 
-        for key, task in model.task_vars.items():
-            proj_id, role, person_name = key
-            if proj_id == project.id:
-                if solver.Value(task['assignment']):
-                    project_assigned = True
-                    assigned_people[role].add(person_name)
+        for (_, role, person_name), task in model.project_tasks(project.id):
+            if solver.Value(task['assignment']):
+                project_assigned = True
+                assigned_people[role].add(person_name)
 
         if project_assigned:
             start_month_idx = solver.Value(model.project_start_vars[project.id])
@@ -818,47 +1511,45 @@ def _build_resource_timeline(
     rows = []
 
     for person in people:
+        # Assigned tasks of each role as (start, end, monthly pct), read from the solver once
+        assigned_by_role: Dict[str, List[Tuple[int, int, float]]] = {}
+        for role in person.roles:
+            assigned = []
+            for _, task in model.person_role_tasks(person.name, role):
+                if not solver.Value(task['assignment']):
+                    continue
+                # Simplified: assume uniform distribution
+                duration = solver.Value(task['duration'])
+                effort_pw = task['effort_pw']
+                # Convert back to person-months for display
+                effort_pm = effort_pw / WEEKS_PER_MONTH
+                assigned.append((
+                    solver.Value(task['start']),
+                    solver.Value(task['end']),
+                    effort_pm / max(1, duration),
+                ))
+            assigned_by_role[role] = assigned
+
         for month_idx, month_start in enumerate(month_starts):
             month_str = month_start.strftime(MONTH_FMT)
 
             for role in person.roles:
                 # Find all tasks assigned to this person in this month
-                allocations = []
+                project_count = 0
                 total_pct = 0.0
 
-                for key, task in model.task_vars.items():
-                    proj_id, task_role, person_name = key
-
-                    if person_name != person.name or task_role != role:
-                        continue
-
-                    if not solver.Value(task['assignment']):
-                        continue
-
-                    task_start = solver.Value(task['start'])
-                    task_end = solver.Value(task['end'])
-
+                for task_start, task_end, pct_per_month in assigned_by_role[role]:
                     if task_start <= month_idx < task_end:
-                        # Simplified: assume uniform distribution
-                        duration = solver.Value(task['duration'])
-                        effort_pw = task['effort_pw']
-                        # Convert back to person-months for display
-                        effort_pm = effort_pw / WEEKS_PER_MONTH
-                        pct_per_month = effort_pm / max(1, duration)
-
-                        allocations.append({
-                            "project_id": proj_id,
-                            "allocation_pct": pct_per_month,
-                        })
+                        project_count += 1
                         total_pct += pct_per_month
 
-                if allocations or month_idx < 6:  # Show first 6 months even if empty
+                if project_count or month_idx < 6:  # Show first 6 months even if empty
                     rows.append({
                         "person": person.name,
                         "role": role,
                         "month": month_str,
                         "total_allocation_pct": round(total_pct, 3),
-                        "project_count": len(allocations),
+                        "project_count": project_count,
                     })
 
     return pd.DataFrame(rows)
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import argparse
+import copy
+import itertools
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from . import engine
+from .io_utils import load_people, load_projects, parse_config, write_csv
+from .main import _configure_logging, _resolve_io_paths
+from .models import PlanningConfig
+
+# Config keys whose values are per-role objects; overrides update them key by key.
+MERGED_KEYS = ("ktlo_pct_by_role", "max_concurrent_per_role", "curves")
+
+_shared_inputs: Dict[str, pd.DataFrame] = {}
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Plan one portfolio under several configuration variants and compare the results."
+    )
+    parser.add_argument(
+        "--project-dir",
+        help="Project directory containing input/ and output/ subfolders",
+    )
+    parser.add_argument("--projects", help="Path to projects CSV input (overrides project-dir default)")
+    parser.add_argument("--people", help="Path to people CSV input (overrides project-dir default)")
+    parser.add_argument("--config", help="Path to the base configuration JSON file (overrides project-dir default)")
+    parser.add_argument(
+        "--outdir",
+        default=None,
+        help="Output directory for the comparison CSV (default: <project-dir>/output or ./out)",
+    )
+    parser.add_argument(
+        "--variants",
+        required=True,
+        help="JSON file with a 'grid' of override lists and/or a list of 'variants' to compare",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: one per CPU; 1 plans every variant in-process)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the comparison table without writing scenario_sweep.csv",
+    )
+    return parser.parse_args()
+
+
+def _format_value(value: object) -> str:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, separators=(",", ":"))
+    return str(value)
+
+
+def expand_variants(spec: Dict[str, object]) -> List[Tuple[str, Dict[str, object]]]:
+    """Turn a sweep specification into named override sets, base configuration first.
+
+    ``grid`` maps config keys to lists of values and contributes their cartesian
+    product; ``variants`` lists explicit override objects with an optional ``name``.
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("sweep specification must be an object")
+    variants: List[Tuple[str, Dict[str, object]]] = [("base", {})]
+    grid = spec.get("grid") or {}
+    if not isinstance(grid, dict):
+        raise ValueError("grid must be an object mapping config keys to lists of values")
+    for key, values in grid.items():
+        if not isinstance(values, list) or not values:
+            raise ValueError(f"grid[{key}] must be a non-empty list")
+    keys = list(grid)
+    if keys:
+        for combo in itertools.product(*(grid[key] for key in keys)):
+            overrides = dict(zip(keys, combo))
+            name = "; ".join(f"{key}={_format_value(value)}" for key, value in overrides.items())
+            variants.append((name, overrides))
+    listed = spec.get("variants") or []
+    if not isinstance(listed, list):
+        raise ValueError("variants must be a list of override objects")
+    for idx, entry in enumerate(listed, start=1):
+        if not isinstance(entry, dict):
+            raise ValueError(f"variants[{idx - 1}] must be an object")
+        overrides = {key: value for key, value in entry.items() if key != "name"}
+        name = str(entry.get("name") or f"variant {idx}")
+        variants.append((name, overrides))
+    names = [name for name, _ in variants]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"duplicate variant names: {', '.join(duplicates)}")
+    return variants
+
+
+def apply_overrides(base_data: Dict[str, object], overrides: Dict[str, object]) -> PlanningConfig:
+    """Validate ``base_data`` with ``overrides`` applied, merging per-role objects."""
+    data = copy.deepcopy(base_data)
+    for key, value in overrides.items():
+        if key in MERGED_KEYS and isinstance(value, dict) and isinstance(data.get(key), dict):
+            data[key].update(value)
+        else:
+            data[key] = copy.deepcopy(value)
+    return parse_config(data)
+
+
+def summarize_plan(
+    variant: str,
+    project_timeline_df: pd.DataFrame,
+    resource_capacity_df: pd.DataFrame,
+) -> Dict[str, object]:
+    """One comparison row: scheduled/skipped counts, plan end and average load."""
+    skipped = resource_capacity_df.attrs.get("skipped_projects", [])
+    end_months = project_timeline_df["end_month"] if "end_month" in project_timeline_df else pd.Series(dtype=str)
+    utilisation: Optional[float] = None
+    if {"project_name", "total_pct"}.issubset(resource_capacity_df.columns):
+        # KTLO rows carry each person-month's total load exactly once.
+        person_months = resource_capacity_df[resource_capacity_df["project_name"] == "KTLO"]
+        if not person_months.empty:
+            utilisation = round(float(person_months["total_pct"].mean()) * 100.0, 1)
+    return {
+        "variant": variant,
+        "scheduled": len(project_timeline_df),
+        "skipped": len(skipped),
+        "first_start": project_timeline_df["start_month"].min() if len(project_timeline_df) else "",
+        "last_end": end_months.max() if len(end_months) else "",
+        "avg_utilisation_pct": utilisation,
+    }
+
+
+def _init_worker(projects_df: pd.DataFrame, people_df: pd.DataFrame) -> None:
+    _shared_inputs["projects"] = projects_df
+    _shared_inputs["people"] = people_df
+
+
+def _plan_variant(job: Tuple[str, PlanningConfig]) -> Dict[str, object]:
+    variant, cfg = job
+    project_timeline_df, resource_capacity_df, _ = engine.plan(
+        _shared_inputs["projects"], _shared_inputs["people"], cfg
+    )
+    return summarize_plan(variant, project_timeline_df, resource_capacity_df)
+
+
+def run_sweep(
+    projects_df: pd.DataFrame,
+    people_df: pd.DataFrame,
+    configs: Sequence[Tuple[str, PlanningConfig]],
+    workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """Plan every variant against the same parsed inputs and tabulate the results.
+
+    Inputs reach each worker process once through the pool initializer rather
+    than with every task.
+    """
+    if workers == 1 or len(configs) <= 1:
+        _init_worker(projects_df, people_df)
+        rows = [_plan_variant(job) for job in configs]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(projects_df, people_df),
+        ) as pool:
+            rows = list(pool.map(_plan_variant, configs))
+    return pd.DataFrame(
+        rows,
+        columns=["variant", "scheduled", "skipped", "first_start", "last_end", "avg_utilisation_pct"],
+    )
+
+
+def main() -> None:
+    args = _parse_args()
+    try:
+        projects_path, people_path, config_path, outdir = _resolve_io_paths(args)
+        base_data = json.loads(Path(config_path).read_text())
+        spec = json.loads(Path(args.variants).read_text())
+        variants = expand_variants(spec)
+        configs = [(name, apply_overrides(base_data, overrides)) for name, overrides in variants]
+    except (OSError, ValueError) as exc:
+        print(str(exc), file=sys.stderr)
+        sys.exit(2)
+
+    projects_df = load_projects(projects_path)
+    people_df = load_people(people_path)
+    _configure_logging(configs[0][1].logging_level)
+    comparison = run_sweep(projects_df, people_df, configs, workers=args.workers)
+
+    print(comparison.to_string(index=False))
+    if args.dry_run:
+        return
+    sweep_path = Path(outdir) / "scenario_sweep.csv"
+    write_csv(comparison, sweep_path)
+    print(f"Wrote {sweep_path}")
+
+
+if __name__ == "__main__":
+    main()
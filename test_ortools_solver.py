@@ -3,7 +3,13 @@
 Quick test script for OR-Tools solver.
 
 Usage:
-    python test_ortools_solver.py
+    python test_ortools_solver.py [--hints] [--concurrent] [--decompose]
+
+--hints seeds both CP-SAT passes with the greedy plan; compare the
+"Time to first solution" and "Final objective" lines with a run without it.
+--concurrent runs the strict and relaxed passes side by side within the
+single 60s limit.
+--decompose solves projects that share no candidate people as separate models.
 """
 
 import sys
@@ -38,6 +44,9 @@ def main():
     config = replace(config,
         solver="ortools",
         solver_time_limit_seconds=60,  # Quick test, only 60s
+        solver_greedy_hints="--hints" in sys.argv[1:],
+        solver_concurrent_passes="--concurrent" in sys.argv[1:],
+        solver_decomposition="components" if "--decompose" in sys.argv[1:] else "off",
     )
 
     # Run solver
@@ -121,6 +121,7 @@ def create_app() -> Flask:
             "capacity_tracker.main",
             "--project-dir",
             str(project_dir),
+            "--incremental",
         ]
         job = job_store.create_job(project_dir, cmd)
         job_store.start_job(job)
@@ -187,7 +188,11 @@ def create_app() -> Flask:
             # Check output files
             output_dir = portfolio_path / "output"
             if output_dir.exists() and output_dir.is_dir():
-                output_files = ["project_timeline.csv", "resource_capacity.csv", "unallocated_projects.md"]
+                output_files = [
+                    f"{stem}{suffix}"
+                    for stem in ("project_timeline", "resource_capacity")
+                    for suffix in (".csv", ".parquet", ".arrow")
+                ] + ["unallocated_projects.md"]
                 for filename in output_files:
                     file_path = output_dir / filename
                     if file_path.exists() and file_path.is_file():
@@ -222,6 +227,37 @@ def create_app() -> Flask:
         except (ValueError, OSError) as e:
             return jsonify({"error": str(e)}), 400
 
+    @app.get("/api/availability/<portfolio_name>")
+    def get_availability(portfolio_name: str):
+        """Get each person's available month range over the portfolio's planning horizon"""
+        try:
+            portfolio_path = projects_root / portfolio_name
+            portfolio_path = portfolio_path.resolve()
+            _validate_within_root(portfolio_path, projects_root)
+
+            input_dir = portfolio_path / "input"
+            if not (input_dir / "people.json").exists() or not (input_dir / "config.json").exists():
+                return jsonify({"error": "people.json or config.json not found"}), 404
+
+            from capacity_tracker.availability import build_availability
+            from capacity_tracker.engine import _build_month_sequence
+            from capacity_tracker.io_utils import MONTH_FMT, load_config, people_from_rows, read_people_rows
+
+            month_starts = _build_month_sequence(load_config(input_dir / "config.json"))
+            people = people_from_rows(read_people_rows(input_dir / "people.json"))
+            availability = build_availability(people, month_starts)
+
+            # Half-open [first, end) month indices into "months"
+            return jsonify({
+                "months": [month.strftime(MONTH_FMT) for month in month_starts],
+                "people": {
+                    name: [entry.first_month, entry.end_month]
+                    for name, entry in availability.items()
+                },
+            })
+        except (ValueError, OSError) as e:
+            return jsonify({"error": str(e)}), 400
+
     @app.post("/api/people/<portfolio_name>")
     def save_people(portfolio_name: str):
         """Save people.json for a portfolio"""
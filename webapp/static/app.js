@@ -1126,13 +1126,36 @@
 
       const csvText = await response.text();
       const data = parseCSV(csvText);
-      renderAllocationHeatmap(data, container);
+      const availability = await loadAvailability(selectedPortfolio);
+      renderAllocationHeatmap(data, container, availability);
     } catch (err) {
       console.error('Error loading resource allocation:', err);
       container.innerHTML = '<div class="empty-state">Error loading resource allocation data</div>';
     }
   }
 
+  // Load each person's available month range; null if it cannot be computed
+  async function loadAvailability(portfolioName) {
+    try {
+      const response = await fetch(`/api/availability/${portfolioName}`);
+      if (!response.ok) return null;
+      const data = await response.json();
+      const monthIndex = new Map(data.months.map((month, idx) => [month, idx]));
+      return {
+        // People missing from people.json (e.g. removed since the run) count as available
+        isAvailable(person, month) {
+          const range = data.people[person];
+          const idx = monthIndex.get(month);
+          if (!range || idx === undefined) return true;
+          return idx >= range[0] && idx < range[1];
+        }
+      };
+    } catch (err) {
+      console.error('Error loading availability:', err);
+      return null;
+    }
+  }
+
   // Parse CSV text into array of objects
   function parseCSV(text) {
     const lines = text.trim().split('\n');
@@ -1255,7 +1278,9 @@
   let allocationData = [];
   const allocationChanges = new Map(); // Track changes: "person|project|month" -> new value
 
-  function renderAllocationHeatmap(data, container) {
+  function renderAllocationHeatmap(data, container, availability = null) {
+    const isAvailable = (person, month) => !availability || availability.isAvailable(person, month);
+
     if (!data || data.length === 0) {
       container.innerHTML = '<div class="empty-state">No allocation data found</div>';
       return;
@@ -1348,22 +1373,23 @@
     const months = Array.from(monthsSet).sort();
 
     // Second pass: Calculate role-level aggregations correctly
-    // Average allocation across ALL people in the role (including those with 0%)
+    // Average allocation across the people in the role available that month (including those with 0%)
     rolesMap.forEach(roleData => {
-      const totalPeopleInRole = roleData.people.size;
-
-      // For each month, sum allocations and divide by total people
+      // For each month, sum allocations and divide by available people
       months.forEach(month => {
         let totalAlloc = 0;
+        let availablePeople = 0;
 
         roleData.people.forEach(personData => {
+          if (!isAvailable(personData.name, month)) return;
+          availablePeople += 1;
           // Get this person's allocation for this month (0 if not present)
           const personAlloc = personData.months.get(month) || 0;
           totalAlloc += personAlloc;
         });
 
-        // Calculate average across all people in the role
-        const avgAlloc = totalPeopleInRole > 0 ? totalAlloc / totalPeopleInRole : 0;
+        // Calculate average across available people in the role
+        const avgAlloc = availablePeople > 0 ? totalAlloc / availablePeople : 0;
         roleData.months.set(month, avgAlloc);
       });
     });
@@ -1420,10 +1446,14 @@
         html += '</td>';
 
         months.forEach(month => {
-          const totalPct = person.months.get(month) || 0;
-          const colorClass = getAllocationClass(totalPct);
           html += '<td>';
-          html += `<div class="allocation-cell ${colorClass}">${formatPercent(totalPct)}</div>`;
+          if (isAvailable(person.name, month)) {
+            const totalPct = person.months.get(month) || 0;
+            const colorClass = getAllocationClass(totalPct);
+            html += `<div class="allocation-cell ${colorClass}">${formatPercent(totalPct)}</div>`;
+          } else {
+            html += '<div class="allocation-cell alloc-unavailable" title="Not available">n/a</div>';
+          }
           html += '</td>';
         });
 
@@ -1484,6 +1514,9 @@
     html += '<div class="legend-item"><div class="legend-color alloc-80"></div><span>75-85%</span></div>';
     html += '<div class="legend-item"><div class="legend-color alloc-100"></div><span>95-100%</span></div>';
     html += '<div class="legend-item"><div class="legend-color alloc-over"></div><span>&gt;100%</span></div>';
+    if (availability) {
+      html += '<div class="legend-item"><div class="legend-color alloc-unavailable"></div><span>Not available</span></div>';
+    }
     html += '</div>';
 
     // Add edit controls